@@ -0,0 +1,4 @@
+"""Motor compartido de scraping y análisis para todas las loterías del proyecto"""
+
+from .registry import LOTTERIES, get_lottery, json_file
+from .scraper import scrape, scrape_all
@@ -0,0 +1,379 @@
+"""
+Backtest walk-forward de estrategias de juego sobre los sorteos históricos.
+
+Una estrategia es una subclase de Strategy registrada con @register_strategy:
+recibe sus parámetros en el constructor y, para cada sorteo t, devuelve las
+jugadas a partir de History, que solo contiene los sorteos anteriores a t
+(nunca ve el resultado que va a jugar). Cada jugada se paga con la tabla de
+premios del juego (odds.GAMES) según sus aciertos.
+
+Todas las combinaciones de parámetros de todas las estrategias se reparten
+entre varios procesos. La matriz de sorteos (lottery_core.matrix) se copia
+una sola vez a memoria compartida y cada proceso la lee desde ahí sin
+recibir una copia por trabajo. El resultado de cada estrategia incluye su
+curva de ganancias y pérdidas acumuladas, sorteo a sorteo.
+
+Uso:
+    python -m lottery_core.backtest super_kino --strategy hot window=50,100,200,0 --strategy random seed=1,2,3
+    python -m lottery_core.backtest Pega_3_Mas --strategy cold window=30,90 --output curvas.json
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import product
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from .dates import from_ordinal
+from .matrix import load_draw_matrix, one_hot_draws
+from .odds import GAMES
+from .registry import get_lottery, json_file
+from .rolling import RollingFrequency
+
+DEFAULT_WARMUP = 100  # Sorteos iniciales que solo se usan como historial
+
+STRATEGIES = {}  # Nombre -> clase de estrategia
+
+_shared = None  # Matriz de sorteos del proceso de trabajo (ver _init_worker)
+
+
+def register_strategy(cls):
+    """Decorador para registrar una estrategia por su nombre"""
+    STRATEGIES[cls.name] = cls
+    return cls
+
+
+class History:
+    """Sorteos anteriores al que se va a jugar
+
+    Args:
+        draws: Matriz (t, posiciones) de los sorteos vistos, del más antiguo al más reciente
+        ordinals: Ordinal de día de cada sorteo
+        one_hot: Matriz bool (t, max_number + 1) de presencia de cada número
+        numbers: Números jugables (min_number a max_number)
+        rolling: RollingFrequency de todos los sorteos (solo se consultan los anteriores a t)
+    """
+
+    def __init__(self, draws, ordinals, one_hot, numbers, rolling):
+        self.draws = draws
+        self.ordinals = ordinals
+        self.one_hot = one_hot
+        self.numbers = numbers
+        self.rolling = rolling
+
+    def __len__(self):
+        return len(self.draws)
+
+    def counts(self, window=None):
+        """Apariciones de cada número en los últimos window sorteos (None o 0 = todos)"""
+        return self.rolling.counts(len(self), window)
+
+    def draws_since_seen(self):
+        """Sorteos desde la última aparición de cada número (len(self) si nunca salió)"""
+        if not len(self):
+            return np.zeros(self.one_hot.shape[1], dtype=np.intp)
+        seen = self.one_hot[::-1].argmax(axis=0)
+        seen[~self.one_hot.any(axis=0)] = len(self)
+        return seen
+
+
+class Strategy:
+    """Estrategia de juego para el backtest
+
+    Las subclases definen name y tickets(); sus parámetros llegan como
+    argumentos del constructor. tickets() se llama una vez por sorteo, en
+    orden cronológico, así que la estrategia puede guardar estado entre
+    llamadas.
+
+    Args:
+        picks: Números por jugada
+        seed: Semilla para las estrategias con azar
+    """
+
+    name = None
+
+    def __init__(self, picks, seed=None):
+        self.picks = picks
+        self.rng = np.random.default_rng(int(seed) if seed is not None else None)
+
+    def tickets(self, history):
+        """Jugadas para el próximo sorteo: lista (o matriz) de jugadas de picks números"""
+        raise NotImplementedError
+
+    def validate(self, min_number, max_number):
+        """Comprobar los parámetros contra el rango de números de la lotería (ValueError si no sirven)"""
+
+    def top(self, history, scores):
+        """Los picks números jugables con mayor puntuación (a igualdad, el más bajo)"""
+        scores = np.asarray(scores)[history.numbers]
+        order = np.argsort(-scores, kind="stable")[:self.picks]
+        return [history.numbers[order]]
+
+
+@register_strategy
+class RandomTickets(Strategy):
+    """Jugadas aleatorias (referencia para comparar las demás)"""
+
+    name = "random"
+
+    def __init__(self, picks, seed=None, tickets=1):
+        super().__init__(picks, seed)
+        self.count = int(tickets)
+
+    def tickets(self, history):
+        return [self.rng.choice(history.numbers, self.picks, replace=False) for _ in range(self.count)]
+
+
+@register_strategy
+class HotNumbers(Strategy):
+    """Los números que más salieron en los últimos window sorteos (0 = todo el historial visto)"""
+
+    name = "hot"
+
+    def __init__(self, picks, seed=None, window=0):
+        super().__init__(picks, seed)
+        self.window = int(window)
+
+    def tickets(self, history):
+        return self.top(history, history.counts(self.window))
+
+
+@register_strategy
+class ColdNumbers(Strategy):
+    """Los números que menos salieron en los últimos window sorteos (0 = todo el historial visto)"""
+
+    name = "cold"
+
+    def __init__(self, picks, seed=None, window=0):
+        super().__init__(picks, seed)
+        self.window = int(window)
+
+    def tickets(self, history):
+        return self.top(history, -history.counts(self.window))
+
+
+@register_strategy
+class OverdueNumbers(Strategy):
+    """Los números que llevan más sorteos sin salir"""
+
+    name = "overdue"
+
+    def tickets(self, history):
+        return self.top(history, history.draws_since_seen())
+
+
+@register_strategy
+class FixedNumbers(Strategy):
+    """Siempre los mismos números (ej: numbers=5-12-33)"""
+
+    name = "fixed"
+
+    def __init__(self, picks, seed=None, numbers=""):
+        super().__init__(picks, seed)
+        self.numbers = [int(num) for num in str(numbers).split("-") if num]
+        if len(set(self.numbers)) != len(self.numbers) or len(self.numbers) != picks:
+            raise ValueError(f"La estrategia fixed necesita exactamente {picks} números distintos "
+                             f"(ej: numbers={'-'.join(str(num) for num in range(1, picks + 1))}), "
+                             f"recibió '{numbers}'")
+
+    def validate(self, min_number, max_number):
+        outside = [num for num in self.numbers if not min_number <= num <= max_number]
+        if outside:
+            raise ValueError(f"La estrategia fixed solo admite números de {min_number} a {max_number}, "
+                             f"recibió {', '.join(map(str, outside))}")
+
+    def tickets(self, history):
+        return [self.numbers]
+
+
+def parameter_grid(grid):
+    """Todas las combinaciones de {parámetro: [valores]} como lista de dicts"""
+    keys = list(grid)
+    return [dict(zip(keys, values)) for values in product(*(grid[key] for key in keys))]
+
+
+def strategy_label(name, params):
+    """Nombre legible de una estrategia con sus parámetros (ej: hot(window=50))"""
+    args = ", ".join(f"{key}={value}" for key, value in params.items())
+    return f"{name}({args})"
+
+
+def _init_worker(shared):
+    global _shared
+    _shared = _attach(shared)
+
+
+def _attach(shared):
+    """Abrir la memoria compartida y construir las vistas NumPy de los sorteos"""
+    memory = shared_memory.SharedMemory(name=shared["name"])
+    rows, positions = shared["shape"]
+    draws = np.ndarray((rows, positions), dtype=np.uint8, buffer=memory.buf)
+    ordinals = np.ndarray((rows,), dtype=np.int32, buffer=memory.buf, offset=draws.nbytes)
+    one_hot = one_hot_draws(draws, shared["max_number"] + 1)
+    return {
+        **shared,
+        "memory": memory,  # Se conserva para que el buffer siga abierto
+        "draws": draws,
+        "ordinals": ordinals,
+        "one_hot": one_hot,
+        "rolling": RollingFrequency(one_hot, ordinals),
+    }
+
+
+def _run_job(job):
+    """Backtest walk-forward de una estrategia con unos parámetros"""
+    name, params = job
+    draws, ordinals, one_hot = _shared["draws"], _shared["ordinals"], _shared["one_hot"]
+    game = _shared["game"]
+    numbers = np.arange(_shared["min_number"], _shared["max_number"] + 1)
+    prizes = np.zeros(game["picks"] + 1, dtype=np.int64)
+    for matches, prize in game["prize_table"].items():
+        prizes[matches] = prize
+
+    strategy = STRATEGIES[name](game["picks"], **params)
+    start = min(_shared["warmup"], len(draws))
+    invested = np.zeros(len(draws) - start, dtype=np.int64)
+    won = np.zeros(len(draws) - start, dtype=np.int64)
+    hits = np.zeros(game["picks"] + 1, dtype=np.int64)
+
+    for t in range(start, len(draws)):
+        history = History(draws[:t], ordinals[:t], one_hot[:t], numbers, _shared["rolling"])
+        tickets = np.asarray(strategy.tickets(history), dtype=np.intp).reshape(-1, game["picks"])
+        matches = one_hot[t][tickets].sum(axis=1)
+        hits += np.bincount(matches, minlength=game["picks"] + 1)
+        invested[t - start] = len(tickets) * game["cost"]
+        won[t - start] = prizes[matches].sum()
+
+    curve = np.cumsum(won - invested)
+    peak = np.maximum.accumulate(np.concatenate(([0], curve)))[1:]
+    total_invested = int(invested.sum())
+    return {
+        "strategy": name,
+        "params": params,
+        "invested": total_invested,
+        "won": int(won.sum()),
+        "net_result": int(curve[-1]) if len(curve) else 0,
+        "roi_percentage": (int(curve[-1]) / total_invested * 100) if total_invested else 0.0,
+        "max_drawdown": int((peak - curve).max()) if len(curve) else 0,
+        "hits": hits.tolist(),
+        "curve": curve.tolist(),
+    }
+
+
+def run_backtest(lottery, strategies, game=None, warmup=DEFAULT_WARMUP, workers=None):
+    """Backtest walk-forward de varias estrategias y rejillas de parámetros en paralelo
+
+    Args:
+        lottery: Nombre de la lotería en el registro
+        strategies: [(nombre, {parámetro: [valores]})]
+        game: Reglas del juego (picks, cost, prize_table); por defecto GAMES[lottery]
+        warmup: Sorteos iniciales que solo sirven de historial
+        workers: Procesos de trabajo (por defecto os.cpu_count(); 1 = sin procesos)
+
+    Returns:
+        dict: dates (fecha de cada punto de las curvas) y results
+        ({etiqueta: resultado}, con curve = ganancia neta acumulada)
+    """
+    lottery = get_lottery(lottery)
+    game = game or GAMES[lottery["name"]]
+    matrix = load_draw_matrix(json_file(lottery))
+    jobs = [(name, params) for name, grid in strategies for params in parameter_grid(grid)]
+    for name, params in jobs:
+        if name not in STRATEGIES:
+            raise KeyError(f"Estrategia desconocida: '{name}'. Disponibles: {', '.join(STRATEGIES)}")
+        # Parámetros inválidos fallan aquí y no dentro de un proceso de trabajo
+        STRATEGIES[name](game["picks"], **params).validate(lottery["min_number"], lottery["max_number"])
+
+    draws = np.ascontiguousarray(matrix.draws, dtype=np.uint8)
+    ordinals = np.ascontiguousarray(matrix.ordinals, dtype=np.int32)
+    memory = shared_memory.SharedMemory(create=True, size=max(draws.nbytes + ordinals.nbytes, 1))
+    try:
+        np.ndarray(draws.shape, dtype=np.uint8, buffer=memory.buf)[:] = draws
+        np.ndarray(ordinals.shape, dtype=np.int32, buffer=memory.buf, offset=draws.nbytes)[:] = ordinals
+        shared = {
+            "name": memory.name,
+            "shape": draws.shape,
+            "min_number": lottery["min_number"],
+            "max_number": lottery["max_number"],
+            "game": game,
+            "warmup": warmup,
+        }
+
+        workers = workers or os.cpu_count() or 1
+        if workers == 1 or len(jobs) < 2:
+            _init_worker(shared)
+            results = [_run_job(job) for job in jobs]
+        else:
+            with ProcessPoolExecutor(min(workers, len(jobs)), initializer=_init_worker,
+                                     initargs=(shared,)) as executor:
+                results = list(executor.map(_run_job, jobs))
+    finally:
+        global _shared
+        _shared = None  # Suelta las vistas del modo sin procesos antes de cerrar
+        memory.close()
+        memory.unlink()
+
+    return {
+        "lottery": lottery["name"],
+        "game": game,
+        "dates": [from_ordinal(int(ordinal)) for ordinal in ordinals[min(warmup, len(ordinals)):]],
+        "results": {strategy_label(result["strategy"], result["params"]): result for result in results},
+    }
+
+
+def save_curves(backtest, path):
+    """Guardar el backtest (con las curvas de cada estrategia) en un archivo JSON"""
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(backtest, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+def _parse_strategy(values):
+    """["hot", "window=50,100"] -> ("hot", {"window": ["50", "100"]})"""
+    name, *assignments = values
+    grid = {}
+    for assignment in assignments:
+        key, _, options = assignment.partition("=")
+        grid[key] = options.split(",")
+    return name, grid
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Backtest walk-forward de estrategias de juego")
+    parser.add_argument("lottery", help=f"Lotería ({', '.join(GAMES)})")
+    parser.add_argument("--strategy", nargs="+", action="append", metavar="ARG",
+                        help=f"Estrategia y parámetros (ej: hot window=50,100). Disponibles: {', '.join(STRATEGIES)}")
+    parser.add_argument("--warmup", type=int, default=DEFAULT_WARMUP, help="Sorteos iniciales solo de historial")
+    parser.add_argument("--workers", type=int, help="Procesos de trabajo (por defecto uno por núcleo)")
+    parser.add_argument("--output", help="Archivo JSON donde guardar las curvas de ganancias y pérdidas")
+    args = parser.parse_args(sys.argv[1:] if argv is None else argv)
+
+    strategies = [_parse_strategy(values) for values in args.strategy or [["random"], ["hot"], ["cold"], ["overdue"]]]
+    start = time.perf_counter()
+    backtest = run_backtest(args.lottery, strategies, warmup=args.warmup, workers=args.workers)
+    elapsed = time.perf_counter() - start
+
+    dates = backtest["dates"]
+    if dates:
+        print(f"{get_lottery(args.lottery)['display_name']}: {len(dates)} sorteos jugados ({dates[0]} a {dates[-1]})")
+    ranking = sorted(backtest["results"].items(), key=lambda item: -item[1]["net_result"])
+    for label, result in ranking:
+        print(f"  {label:<35} invertido {result['invested']:>12,}  ganado {result['won']:>12,}  "
+              f"neto {result['net_result']:>12,}  ROI {result['roi_percentage']:7.2f}%  "
+              f"caída máx. {result['max_drawdown']:>10,}")
+    print(f"\n{len(ranking)} estrategias en {elapsed:.2f} s")
+
+    if args.output:
+        save_curves(backtest, args.output)
+        print(f"Curvas guardadas en {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
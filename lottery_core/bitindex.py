@@ -0,0 +1,93 @@
+"""
+Índice invertido de sorteos con bitsets (enteros de Python).
+
+Para cada número se guarda un entero cuyo bit i vale 1 si el número salió en
+el sorteo i (el bit 0 es el sorteo más reciente). Saber si varios números
+salieron juntos es un AND de sus bitsets y contar cuántas veces, un
+bit_count(); las fechas se obtienen recorriendo los bits encendidos. Los
+índices se construyen desde la matriz de sorteos (lottery_core.matrix), así
+que se reutilizan mientras el JSON no cambie.
+"""
+
+import os
+
+import numpy as np
+
+from .matrix import load_draw_matrix
+from .registry import LOTTERIES, json_file
+
+_cache = {}  # ruta absoluta -> (DrawMatrix, DrawBitIndex)
+
+
+def iter_bits(bitset):
+    """Posiciones de los bits encendidos, de la más baja a la más alta"""
+    while bitset:
+        lowest = bitset & -bitset
+        yield lowest.bit_length() - 1
+        bitset ^= lowest
+
+
+class DrawBitIndex:
+    """Bitset por número sobre los sorteos de una lotería
+
+    Args:
+        matrix: DrawMatrix de la lotería; el bit i corresponde a su fila
+            len(matrix) - 1 - i (del más reciente al más antiguo)
+    """
+
+    def __init__(self, matrix):
+        self.matrix = matrix
+        self.dates = matrix.dates[::-1]
+        one_hot = matrix.one_hot()[::-1]
+        # Cada columna empaquetada en bytes (bit 0 = primera fila) se convierte en un entero
+        packed = np.packbits(one_hot, axis=0, bitorder="little")
+        self.bits = {number: int.from_bytes(packed[:, number].tobytes(), "little")
+                     for number in range(one_hot.shape[1]) if one_hot[:, number].any()}
+
+    def __len__(self):
+        return len(self.dates)
+
+    def together(self, *numbers):
+        """Bitset de los sorteos en los que salieron todos los números dados"""
+        bitset = (1 << len(self)) - 1
+        for number in numbers:
+            bitset &= self.bits.get(int(number), 0)
+        return bitset
+
+    def count(self, *numbers):
+        """Sorteos en los que salieron juntos todos los números dados"""
+        return self.together(*numbers).bit_count()
+
+    def indices(self, *numbers):
+        """Índices (0 = sorteo más reciente) de los sorteos con todos los números dados"""
+        return list(iter_bits(self.together(*numbers)))
+
+    def matching_dates(self, *numbers):
+        """Fechas (más reciente primero) de los sorteos con todos los números dados"""
+        return [self.dates[index] for index in iter_bits(self.together(*numbers))]
+
+    def numbers(self, index):
+        """Números del sorteo de un índice, en orden de posición ("07")"""
+        return self.matrix.numbers(len(self) - 1 - index)
+
+
+def load_bit_index(json_path):
+    """Índice de bitsets de un lottery_data_<name>.json, reconstruido solo si cambia el JSON"""
+    path = os.path.abspath(json_path)
+    matrix = load_draw_matrix(path)
+    cached = _cache.get(path)
+    if cached and cached[0] is matrix:
+        return cached[1]
+
+    bit_index = DrawBitIndex(matrix)
+    _cache[path] = (matrix, bit_index)
+    return bit_index
+
+
+def load_all_bit_indexes(names=None):
+    """Índices de todas las loterías del registro con JSON: {nombre: DrawBitIndex}"""
+    indexes = {}
+    for name in names or LOTTERIES:
+        if os.path.exists(json_file(name)):
+            indexes[name] = load_bit_index(json_file(name))
+    return indexes
@@ -0,0 +1,42 @@
+"""
+Fechas como ordinales de día.
+
+En el JSON las fechas se guardan como texto "dd-mm-YYYY". Para compararlas,
+restarlas, agruparlas en ventanas u ordenarlas se convierten una sola vez a
+ordinales de día (date.toordinal()): enteros donde un día vale 1. El texto solo
+se vuelve a generar al escribir el JSON o mostrar resultados.
+"""
+
+from datetime import date, datetime
+from functools import lru_cache
+
+DATE_FORMAT = "%d-%m-%Y"  # Formato de fecha del JSON y de las URLs
+
+
+@lru_cache(maxsize=None)
+def to_ordinal(date_str):
+    """Ordinal de día de una fecha dd-mm-YYYY (ValueError si no es válida)
+
+    Las mismas fechas aparecen miles de veces en el historial, así que la
+    conversión se memoriza.
+    """
+    try:
+        day, month, year = date_str.split("-")
+        return date(int(year), int(month), int(day)).toordinal()
+    except (AttributeError, TypeError):
+        raise ValueError(f"Fecha inválida: {date_str!r}")
+
+
+def from_ordinal(ordinal):
+    """Fecha dd-mm-YYYY de un ordinal de día"""
+    return date.fromordinal(ordinal).strftime(DATE_FORMAT)
+
+
+def to_datetime(ordinal):
+    """datetime (a medianoche) de un ordinal de día"""
+    return datetime.fromordinal(ordinal)
+
+
+def today_ordinal():
+    """Ordinal del día actual"""
+    return date.today().toordinal()
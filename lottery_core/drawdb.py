@@ -0,0 +1,255 @@
+"""
+Base de datos SQLite de sorteos (sin servidor, solo la librería estándar).
+
+Guarda una fila por número sorteado, draws(lottery, date, pos, number), con
+índices por (lottery, date) y por (lottery, number), de modo que los análisis
+pueden pedir "todos los sorteos donde salió el 07" sin recorrer el historial
+completo. La escriben el scraper y el actualizador; el registro de sorteos
+(drawlog) sigue siendo la fuente principal y la base se puede reconstruir
+desde él en cualquier momento.
+
+Uso:
+    python -m lottery_core.drawdb sync             # cargar todos los registros en la base
+    python -m lottery_core.drawdb query nacional 07
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import sys
+from datetime import date
+
+from .dates import from_ordinal, to_ordinal
+from .drawlog import read_draws
+from .registry import LOTTERIES, draw_db_file, get_lottery, json_file
+
+# La clave primaria (lottery, date, pos) es también el índice por (lottery, date)
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS draws (
+    lottery TEXT NOT NULL,
+    date TEXT NOT NULL,
+    pos INTEGER NOT NULL,
+    number TEXT NOT NULL,
+    PRIMARY KEY (lottery, date, pos)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_draws_lottery_number ON draws (lottery, number, date);
+"""
+
+
+def to_iso(date_str):
+    """dd-mm-YYYY -> YYYY-mm-dd (así las fechas se ordenan y comparan como texto)"""
+    return date.fromordinal(to_ordinal(date_str)).isoformat()
+
+
+def from_iso(iso_date):
+    """YYYY-mm-dd -> dd-mm-YYYY, el formato que usa el resto del proyecto"""
+    return from_ordinal(date.fromisoformat(iso_date).toordinal())
+
+
+def _rows(name, draws):
+    for date_str, numbers in draws:
+        iso_date = to_iso(date_str)
+        for pos, num in enumerate(numbers, 1):
+            if num is not None:
+                yield name, iso_date, pos, num
+
+
+def _group(rows):
+    """Agrupar filas (date, pos, number) ordenadas en {fecha dd-mm-YYYY: números}"""
+    draws = {}
+    for iso_date, pos, num in rows:
+        numbers = draws.setdefault(from_iso(iso_date), [])
+        numbers.extend([None] * (pos - len(numbers)))
+        numbers[pos - 1] = num
+    return draws
+
+
+class DrawDB:
+    """Acceso a la base de sorteos
+
+    Args:
+        path: Ruta del archivo SQLite (por defecto json_Datos/draws/draws.sqlite3)
+    """
+
+    def __init__(self, path=None):
+        self.path = path or draw_db_file()
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        # Varias loterías se actualizan a la vez (orquestador): esperar el bloqueo en lugar de fallar
+        self.conn = sqlite3.connect(self.path, timeout=30)
+        self.conn.executescript(SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.conn.close()
+
+    def upsert_draws(self, lottery, draws):
+        """Guardar sorteos [(fecha, números)], reemplazando los de las mismas fechas"""
+        name = get_lottery(lottery)["name"]
+        draws = list(draws)
+        with self.conn:
+            self.conn.executemany("DELETE FROM draws WHERE lottery = ? AND date = ?",
+                                  [(name, to_iso(date_str)) for date_str, _ in draws])
+            self.conn.executemany("INSERT INTO draws VALUES (?, ?, ?, ?)", _rows(name, draws))
+
+    def replace_lottery(self, lottery, draws):
+        """Reemplazar todos los sorteos de una lotería por los dados ({fecha: números})"""
+        name = get_lottery(lottery)["name"]
+        with self.conn:
+            self.conn.execute("DELETE FROM draws WHERE lottery = ?", (name,))
+            self.conn.executemany("INSERT INTO draws VALUES (?, ?, ?, ?)", _rows(name, draws.items()))
+
+    def draws(self, lottery, start=None, end=None):
+        """Sorteos de una lotería como {fecha: números}, del más antiguo al más reciente
+
+        start y end (dd-mm-YYYY, incluidos) limitan el rango usando el índice por fecha.
+        """
+        query = "SELECT date, pos, number FROM draws WHERE lottery = ?"
+        params = [get_lottery(lottery)["name"]]
+        if start:
+            query += " AND date >= ?"
+            params.append(to_iso(start))
+        if end:
+            query += " AND date <= ?"
+            params.append(to_iso(end))
+        return _group(self.conn.execute(query + " ORDER BY date, pos", params))
+
+    def draws_with_number(self, lottery, number, position=None):
+        """Sorteos completos en los que salió un número (opcionalmente en una posición)"""
+        name = get_lottery(lottery)["name"]
+        subquery = "SELECT date FROM draws WHERE lottery = ? AND number = ?"
+        params = [name, str(number).zfill(2)]
+        if position is not None:
+            subquery += " AND pos = ?"
+            params.append(position)
+        rows = self.conn.execute(
+            f"SELECT date, pos, number FROM draws WHERE lottery = ? AND date IN ({subquery}) ORDER BY date, pos",
+            [name] + params)
+        return _group(rows)
+
+    def number_dates(self, lottery, number):
+        """Fechas (dd-mm-YYYY) y posiciones en las que salió un número, de la más antigua a la más reciente"""
+        rows = self.conn.execute(
+            "SELECT date, pos FROM draws WHERE lottery = ? AND number = ? ORDER BY date",
+            (get_lottery(lottery)["name"], str(number).zfill(2)))
+        return [(from_iso(iso_date), pos) for iso_date, pos in rows]
+
+    def number_counts(self, lottery):
+        """Veces que salió cada número: {número: apariciones}"""
+        rows = self.conn.execute(
+            "SELECT number, COUNT(*) FROM draws WHERE lottery = ? GROUP BY number",
+            (get_lottery(lottery)["name"],))
+        return dict(rows)
+
+    def latest_date(self, lottery):
+        """Fecha (dd-mm-YYYY) del último sorteo guardado, o None"""
+        row = self.conn.execute("SELECT MAX(date) FROM draws WHERE lottery = ?",
+                                (get_lottery(lottery)["name"],)).fetchone()
+        return from_iso(row[0]) if row and row[0] else None
+
+    def sync_from_log(self, lottery):
+        """Cargar en la base el registro de sorteos completo de una lotería"""
+        draws = read_draws(lottery)
+        self.replace_lottery(lottery, draws)
+        return len(draws)
+
+
+def store_draws(lottery, draws, replace=False):
+    """Escribir sorteos en la base sin interrumpir al scraper/actualizador si falla
+
+    La base es un índice que se puede reconstruir desde el registro de
+    sorteos (python -m lottery_core.drawdb sync), así que un error aquí solo
+    se informa. Si la lotería todavía no está en la base se carga su registro
+    completo (que ya debe incluir los sorteos dados).
+    """
+    try:
+        with DrawDB() as db:
+            if replace:
+                db.replace_lottery(lottery, dict(draws))
+            elif db.latest_date(lottery) is None:
+                db.sync_from_log(lottery)
+            else:
+                db.upsert_draws(lottery, draws)
+    except (sqlite3.Error, OSError) as e:
+        print(f"No se pudo actualizar la base de sorteos: {e}")
+
+
+def lottery_from_json_path(json_path):
+    """Nombre en el registro de la lotería de un lottery_data_<name>.json (None si no se reconoce)"""
+    stem = os.path.splitext(os.path.basename(json_path))[0]
+    stem = stem[len("lottery_data_"):] if stem.startswith("lottery_data_") else stem
+    for name in LOTTERIES:
+        if name.lower() == stem.lower():
+            return name
+    return None
+
+
+def _json_latest_date(data):
+    """Fecha (dd-mm-YYYY) del último sorteo de un JSON según winningNumbers, o None"""
+    try:
+        return data["winningNumbers"][0]["date"].split(" ")[0]
+    except (KeyError, IndexError, TypeError, AttributeError):
+        return None
+
+
+def stored_draws(json_path, data=None):
+    """Sorteos guardados en la base para la lotería de un JSON ({} si no se puede usar la base)
+
+    La base solo sustituye al JSON si este es el archivo de datos de la lotería
+    (json_file, no una copia con el mismo nombre en otra carpeta) y si la base
+    está al día con él: su último sorteo coincide con la fecha de
+    winningNumbers. Si no, se devuelve {} y el análisis usa el propio JSON.
+
+    Args:
+        data: Contenido del JSON si ya está cargado (si no, se lee)
+    """
+    name = lottery_from_json_path(json_path)
+    if name is None or not os.path.exists(draw_db_file()):
+        return {}
+    if os.path.normcase(os.path.realpath(json_path)) != os.path.normcase(os.path.realpath(json_file(name))):
+        return {}
+    if data is None:
+        try:
+            with open(json_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+    latest = _json_latest_date(data)
+    try:
+        with DrawDB() as db:
+            if latest is None or db.latest_date(name) != latest:
+                return {}
+            return db.draws(name)
+    except sqlite3.Error:
+        return {}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Base de datos SQLite de sorteos")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    sync_parser = subparsers.add_parser("sync", help="Cargar los registros de sorteos en la base")
+    sync_parser.add_argument("lotteries", nargs="*", help="Loterías a cargar (por defecto todas)")
+    query_parser = subparsers.add_parser("query", help="Sorteos en los que salió un número")
+    query_parser.add_argument("lottery", help="Lotería")
+    query_parser.add_argument("number", help="Número a buscar")
+    query_parser.add_argument("--position", type=int, help="Solo en esta posición")
+    args = parser.parse_args(sys.argv[1:] if argv is None else argv)
+
+    with DrawDB() as db:
+        if args.command == "sync":
+            for name in args.lotteries or LOTTERIES:
+                print(f"{get_lottery(name)['display_name']}: {db.sync_from_log(name)} sorteos")
+        else:
+            draws = db.draws_with_number(args.lottery, args.number, args.position)
+            for date_str, numbers in draws.items():
+                print(f"{date_str}: {' - '.join(num or '--' for num in numbers)}")
+            print(f"Total: {len(draws)} sorteos")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,299 @@
+"""
+Registro de sorteos: almacenamiento principal de los resultados.
+
+Cada lotería tiene un archivo json_Datos/draws/<name>.jsonl con una línea por
+sorteo ({"date": "dd-mm-YYYY", "numbers": [...]}) en orden de llegada. Solo se
+añade al final: una actualización escribe unos pocos bytes y, si un sorteo se
+vuelve a publicar (loterías con overwrite_existing), la última línea de esa
+fecha es la que vale.
+
+El JSON lottery_data_<name>.json que lee la web es una vista materializada a
+partir de este registro (historial por número, posiciones, lastSeen,
+daysAgo...) y se puede regenerar en cualquier momento con rebuild_json().
+
+Uso:
+    python -m lottery_core.drawlog migrate            # crear los registros desde los JSON actuales
+    python -m lottery_core.drawlog rebuild nacional   # regenerar el JSON desde el registro
+    python -m lottery_core.drawlog compact            # reescribir sin fechas repetidas
+"""
+
+import argparse
+import json
+import os
+import sys
+from collections import defaultdict
+from datetime import datetime
+
+from .dates import to_ordinal
+from .numbers import (add_draw, format_time_period, frequency_rankings_entries, hot_cold_numbers, new_numbers_data,
+                      overdue_numbers_entries, repeated_numbers, winning_numbers_entries)
+from .registry import LOTTERIES, draw_log_file, get_lottery, json_file
+
+TAIL_BLOCK_SIZE = 64 * 1024  # Bytes que se leen de cada vez al recorrer el registro desde el final
+
+
+def _sorted_draws(draws):
+    """Ordenar {fecha: números} del sorteo más antiguo al más reciente"""
+    return dict(sorted(draws.items(), key=lambda item: to_ordinal(item[0])))
+
+
+def _record(date_str, numbers):
+    return json.dumps({"date": date_str, "numbers": numbers}, separators=(",", ":")) + "\n"
+
+
+def read_draws(lottery):
+    """Leer el registro de una lotería como {fecha: números}, del más antiguo al más reciente
+
+    Si una fecha aparece varias veces gana la última línea. Las líneas dañadas
+    (por ejemplo, una escritura cortada) se ignoran.
+    """
+    path = draw_log_file(lottery)
+    draws = {}
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            for line_number, line in enumerate(f, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                    to_ordinal(record["date"])
+                except (ValueError, KeyError, TypeError):
+                    print(f"Línea {line_number} inválida en '{path}', se ignora")
+                    continue
+                draws[record["date"]] = record["numbers"]
+    except FileNotFoundError:
+        return {}
+    return _sorted_draws(draws)
+
+
+def read_recent_draws(lottery, count):
+    """Leer solo los últimos count sorteos del registro, recorriendo el archivo desde el final
+
+    El registro crece por el final con los sorteos nuevos, así que basta con
+    leer bloques desde el final hasta reunir count fechas distintas (la línea
+    más al final de cada fecha es la que vale). El costo depende de count y no
+    del tamaño del historial.
+
+    Returns:
+        dict: {fecha: números}, del más antiguo al más reciente
+    """
+    path = draw_log_file(lottery)
+    draws = {}
+    try:
+        with open(path, 'rb') as f:
+            position = f.seek(0, os.SEEK_END)
+            pending = b""
+            while position > 0 and len(draws) < count:
+                size = min(TAIL_BLOCK_SIZE, position)
+                position -= size
+                f.seek(position)
+                lines = (f.read(size) + pending).split(b"\n")
+                # La primera línea del bloque puede estar cortada: se completa con el bloque anterior
+                pending = lines.pop(0) if position > 0 else b""
+                for line in reversed(lines):
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        record = json.loads(line)
+                        to_ordinal(record["date"])
+                    except (ValueError, KeyError, TypeError):
+                        print(f"Línea inválida en '{path}', se ignora")
+                        continue
+                    draws.setdefault(record["date"], record["numbers"])
+                    if len(draws) >= count:
+                        break
+    except FileNotFoundError:
+        return {}
+    return _sorted_draws(draws)
+
+
+def append_draws(lottery, draws):
+    """Añadir sorteos [(fecha, números)] al final del registro"""
+    if not draws:
+        return
+    path = draw_log_file(lottery)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'a', encoding='utf-8') as f:
+        f.writelines(_record(date_str, numbers) for date_str, numbers in draws)
+
+
+def merge_draws(draws, new_draws):
+    """Añadir sorteos [(fecha, números)] a {fecha: números} manteniendo el orden cronológico
+
+    Si todos los sorteos nuevos son posteriores a los que ya hay (lo normal en
+    una actualización) solo se añaden al final; si no, se vuelve a ordenar.
+    """
+    newest = to_ordinal(next(reversed(draws))) if draws else None
+    in_order = True
+    for date_str, numbers in sorted(new_draws, key=lambda item: to_ordinal(item[0])):
+        if date_str not in draws and newest is not None and to_ordinal(date_str) < newest:
+            in_order = False
+        draws[date_str] = numbers
+    return draws if in_order else _sorted_draws(draws)
+
+
+def write_draws(lottery, draws):
+    """Reescribir el registro completo con los sorteos {fecha: números} dados"""
+    path = draw_log_file(lottery)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.writelines(_record(date_str, numbers) for date_str, numbers in _sorted_draws(draws).items())
+    os.replace(tmp_path, path)
+
+
+def draws_from_numbers(numbers_data, positions):
+    """Reconstruir {fecha: números} a partir del historial por número del JSON"""
+    by_date = defaultdict(dict)
+    for num, data in numbers_data.items():
+        for entry in data.get("history") or []:
+            by_date[entry.get("date")].setdefault(entry.get("position"), num)
+
+    draws = {}
+    for date_str, by_position in by_date.items():
+        try:
+            to_ordinal(date_str)
+        except ValueError:
+            continue
+        draws[date_str] = [by_position.get(pos) for pos in range(1, positions + 1)]
+    return _sorted_draws(draws)
+
+
+def ensure_draw_log(lottery, existing_data=None, recent=None):
+    """Crear el registro desde el JSON actual si todavía no existe
+
+    Args:
+        recent: Devolver solo los últimos recent sorteos (None = todos)
+
+    Returns:
+        dict: Los sorteos del registro ({fecha: números})
+    """
+    lottery = get_lottery(lottery)
+    if os.path.exists(draw_log_file(lottery)):
+        return read_recent_draws(lottery, recent) if recent else read_draws(lottery)
+
+    if existing_data is None:
+        try:
+            with open(json_file(lottery), 'r', encoding='utf-8') as f:
+                existing_data = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return {}
+
+    draws = draws_from_numbers(existing_data.get("numbers", {}), lottery["positions"])
+    write_draws(lottery, draws)
+    print(f"Registro de sorteos creado con {len(draws)} sorteos en '{draw_log_file(lottery)}'")
+    return dict(list(draws.items())[-recent:]) if recent else draws
+
+
+def materialize(lottery, draws, today=None, base=None):
+    """Construir el JSON de la web (vista por número) a partir de los sorteos
+
+    Args:
+        lottery: Nombre de la lotería en el registro (o su configuración)
+        draws: {fecha: números} tal como lo devuelve read_draws
+        today: Fecha de referencia para daysSinceSeen/daysAgo (por defecto ahora)
+        base: JSON anterior del que se conservan los campos que no se derivan
+
+    Returns:
+        dict: Los datos listos para guardar en lottery_data_<name>.json
+    """
+    lottery = get_lottery(lottery)
+    today = today or datetime.now()
+    today_ordinal = today.toordinal()
+    thirty_days_ago = today_ordinal - 30  # Cuentan los sorteos posteriores a este día
+
+    numbers_data = new_numbers_data(lottery)
+    last_30_days_occurrences = defaultdict(list)
+    total_numbers = 0
+
+    # Del más reciente al más antiguo, como el historial que genera el scraper
+    for date_str, drawn_numbers in reversed(list(draws.items())):
+        draw_ordinal = to_ordinal(date_str)
+        total_numbers += add_draw(numbers_data, date_str, drawn_numbers, draw_ordinal, today_ordinal)
+        if draw_ordinal > thirty_days_ago:
+            for num in drawn_numbers:
+                if num in numbers_data and date_str not in last_30_days_occurrences[num]:
+                    last_30_days_occurrences[num].append(date_str)
+
+    output_data = dict(base or {})
+    coldest, hottest = hot_cold_numbers(numbers_data)
+    output_data.update({
+        "lotteryName": lottery["display_name"],
+        "lastUpdated": today.strftime("%d-%m-%Y %H:%M:%S"),
+        "totalProcessed": total_numbers,
+        "numbersWithData": sum(1 for data in numbers_data.values() if data["lastSeen"] is not None),
+        "totalIterations": output_data.get("totalIterations", lottery["total_iterations"]),
+        "daysPerIteration": output_data.get("daysPerIteration", lottery["days_to_go_back"]),
+        "positionsCount": lottery["positions"],
+        "numbers": numbers_data,
+        "repeatedInLast30Days": repeated_numbers(last_30_days_occurrences),
+        "coldestNumbers": coldest,
+        "hottestNumbers": hottest,
+        "winningNumbers": [],
+    })
+
+    if draws:
+        oldest_str, newest_str = next(iter(draws)), next(reversed(list(draws)))
+        analysis_days = to_ordinal(newest_str) - to_ordinal(oldest_str) + 1
+        output_data["analysisPeriod"] = analysis_days
+        output_data["analysisPeriodFormatted"] = format_time_period(analysis_days)
+        output_data["analysisDateRange"] = {"startDate": oldest_str, "endDate": newest_str}
+        output_data["winningNumbers"] = winning_numbers_entries(draws[newest_str], newest_str)
+
+    rankings = frequency_rankings_entries(lottery, draws)
+    if rankings is not None:
+        output_data["frequencyRankings"] = rankings
+    overdue = overdue_numbers_entries(lottery, draws, today)
+    if overdue is not None:
+        output_data["overdueNumbers"] = overdue
+
+    return output_data
+
+
+def rebuild_json(lottery, today=None):
+    """Regenerar lottery_data_<name>.json desde el registro de sorteos"""
+    lottery = get_lottery(lottery)
+    path = json_file(lottery)
+    base = None
+    if os.path.exists(path):
+        with open(path, 'r', encoding='utf-8') as f:
+            base = json.load(f)
+
+    draws = ensure_draw_log(lottery, base)
+    output_data = materialize(lottery, draws, today, base)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(output_data, f, indent=2, ensure_ascii=False)
+    print(f"{lottery['display_name']}: {len(draws)} sorteos -> '{path}'")
+    return output_data
+
+
+def compact(lottery):
+    """Reescribir el registro dejando una sola línea por fecha"""
+    draws = read_draws(lottery)
+    write_draws(lottery, draws)
+    return draws
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Registro de sorteos de las loterías")
+    parser.add_argument("command", choices=["migrate", "rebuild", "compact"],
+                        help="migrate: crear registros desde los JSON; rebuild: regenerar los JSON; "
+                             "compact: quitar fechas repetidas")
+    parser.add_argument("lotteries", nargs="*", help="Loterías a procesar (por defecto todas)")
+    args = parser.parse_args(sys.argv[1:] if argv is None else argv)
+
+    for name in args.lotteries or LOTTERIES:
+        if args.command == "migrate":
+            draws = ensure_draw_log(name)
+            print(f"{get_lottery(name)['display_name']}: {len(draws)} sorteos")
+        elif args.command == "rebuild":
+            rebuild_json(name)
+        else:
+            draws = compact(name)
+            print(f"{get_lottery(name)['display_name']}: {len(draws)} sorteos")
+
+
+if __name__ == "__main__":
+    main()
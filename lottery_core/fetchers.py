@@ -0,0 +1,400 @@
+import random
+import re
+import threading
+import time
+from html.parser import HTMLParser
+from urllib.parse import urlparse
+
+from .registry import get_lottery
+
+# Configuración de la carga de páginas
+WAIT_TIMEOUT = 15  # Tiempo máximo de espera para elementos (segundos)
+READY_POLL_INTERVAL = 0.1  # Cada cuánto se comprueba si la página ya tiene todos los números (segundos)
+EMPTY_PAGE_SETTLE = 2.0  # Tiempo sin fechas ni números tras el que una página se da por vacía (segundos)
+MAX_ATTEMPTS = 3  # Intentos por página antes de rendirse
+
+HTTP_TIMEOUT = 15  # Tiempo máximo de espera de una petición HTTP (segundos)
+HTTP_POOL_SIZE = 10  # Conexiones reutilizables por host en la sesión HTTP
+REQUESTS_PER_SECOND = 4  # Máximo de peticiones por segundo a un mismo host
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/112.0.0.0 Safari/537.36"
+
+FETCH_MODES = ("auto", "http", "browser")
+
+
+def configure_webdriver():
+    """Configurar y devolver una instancia de WebDriver"""
+    from selenium import webdriver
+    from selenium.webdriver.chrome.service import Service
+    from selenium.webdriver.chrome.options import Options
+    from selenium.webdriver.support.ui import WebDriverWait
+    from webdriver_manager.chrome import ChromeDriverManager
+
+    chrome_options = Options()
+    chrome_options.add_argument("--no-sandbox")
+    chrome_options.add_argument("--disable-dev-shm-usage")
+    chrome_options.add_argument("--disable-extensions")
+    chrome_options.add_argument("--disable-gpu")
+    chrome_options.add_argument("--blink-settings=imagesEnabled=false")  # Desactivar imágenes
+    chrome_options.add_argument("--headless")  # Ejecutar en modo headless
+
+    # Añadir user-agent para evitar ser detectado como bot
+    chrome_options.add_argument(f"user-agent={USER_AGENT}")
+
+    # Opciones adicionales para mejorar la estabilidad
+    chrome_options.add_argument("--disable-blink-features=AutomationControlled")
+    chrome_options.add_argument("--disable-infobars")
+    chrome_options.add_argument("--disable-browser-side-navigation")
+    chrome_options.add_argument("--dns-prefetch-disable")
+
+    driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=chrome_options)
+    return driver, WebDriverWait(driver, WAIT_TIMEOUT, poll_frequency=READY_POLL_INTERVAL)
+
+
+# Devuelve {dates: [...], blocks: [[...], ...]} con los textos de fechas y números
+# de toda la página (argumentos: selector de fechas, de bloques y de números)
+EXTRACT_PAGE_SCRIPT = """
+const text = el => (el.innerText || el.textContent || "").trim();
+const dates = Array.from(document.querySelectorAll(arguments[0]), text);
+const blocks = Array.from(document.querySelectorAll(arguments[1]),
+    block => Array.from(block.querySelectorAll(arguments[2]), text));
+return {dates: dates, blocks: blocks};
+"""
+
+
+class LoadMetrics:
+    """Tiempos de carga por página registrados por un fetcher (seguro entre hilos)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.load_times = []  # (url, segundos)
+
+    def record(self, url, seconds):
+        with self._lock:
+            self.load_times.append((url, seconds))
+
+    def summary(self):
+        """Devolver páginas, tiempo total, promedio y máximo de carga"""
+        with self._lock:
+            times = [seconds for _, seconds in self.load_times]
+        if not times:
+            return {"pages": 0, "total": 0.0, "mean": 0.0, "max": 0.0}
+        return {"pages": len(times), "total": sum(times), "mean": sum(times) / len(times), "max": max(times)}
+
+    def report(self):
+        stats = self.summary()
+        if stats["pages"]:
+            print(f"Páginas cargadas: {stats['pages']} - tiempo total {stats['total']:.1f} s, "
+                  f"promedio {stats['mean']:.2f} s, máximo {stats['max']:.2f} s")
+
+
+# Cantidad de fechas y de números de la página (argumentos: selector de fechas y de números)
+COUNT_PAGE_SCRIPT = """
+return [document.querySelectorAll(arguments[0]).length, document.querySelectorAll(arguments[1]).length];
+"""
+
+
+class _ScoresReady:
+    """Condición de espera: la cantidad de fechas y números dejó de cambiar entre dos sondeos
+
+    Una página con fechas o números está lista en cuanto sus cantidades se
+    repiten; una que sigue sin ninguno de los dos durante EMPTY_PAGE_SETTLE
+    segundos se da por vacía (sin resultados publicados) en lugar de esperar
+    todo WAIT_TIMEOUT.
+    """
+
+    def __init__(self, date_selector, scores_selector):
+        self.date_selector = date_selector
+        self.scores_selector = scores_selector
+        self.last_counts = None
+        self.empty_since = None
+
+    def __call__(self, driver):
+        counts = tuple(driver.execute_script(COUNT_PAGE_SCRIPT, self.date_selector, self.scores_selector))
+        stable = counts == self.last_counts
+        self.last_counts = counts
+        if any(counts):
+            self.empty_since = None
+            return stable
+        if self.empty_since is None:
+            self.empty_since = time.monotonic()
+        return time.monotonic() - self.empty_since >= EMPTY_PAGE_SETTLE
+
+
+class BrowserFetcher:
+    """Obtiene las fechas y los bloques de números de una página usando Chrome headless.
+
+    Una sola instancia puede reutilizarse para varias loterías, de modo que el
+    navegador se inicia una sola vez por proceso. Un WebDriver no admite varios
+    hilos, así que las llamadas concurrentes a fetch() se atienden una a una.
+    """
+
+    def __init__(self):
+        self.driver = None
+        self.wait = None
+        self.metrics = LoadMetrics()
+        self._lock = threading.Lock()
+
+    def _ensure_driver(self):
+        if self.driver is None:
+            self.driver, self.wait = configure_webdriver()
+
+    def load(self, url, lottery):
+        """Cargar una página con reintentos y esperar a que estén todos sus números
+
+        No hay pausa fija: se sondea la página hasta que la cantidad de fechas y
+        de números se mantiene estable entre dos sondeos (o hasta que la página
+        lleva EMPTY_PAGE_SETTLE segundos sin ninguno, si no tiene resultados).
+        """
+        lottery = get_lottery(lottery)
+        self._ensure_driver()
+        scores_selector = f"{lottery['block_selector']} {lottery['score_selector']}"
+
+        for attempt in range(1, MAX_ATTEMPTS + 1):
+            try:
+                start = time.perf_counter()
+                self.driver.get(url)
+                self.wait.until(_ScoresReady(lottery["date_selector"], scores_selector))
+                elapsed = time.perf_counter() - start
+                self.metrics.record(url, elapsed)
+                print(f"Página lista en {elapsed:.2f} segundos")
+                return
+            except Exception as e:
+                if attempt < MAX_ATTEMPTS:
+                    wait_time = random.uniform(2, 5)
+                    print(f"Error al cargar la página (intento {attempt}/{MAX_ATTEMPTS}): {str(e)}")
+                    print(f"Reintentando en {wait_time:.1f} segundos...")
+                    time.sleep(wait_time)
+                else:
+                    print(f"Error al cargar la página después de {MAX_ATTEMPTS} intentos: {str(e)}")
+                    raise
+
+    def fetch(self, url, lottery):
+        """Devolver (textos de fecha, lista de bloques con los textos de sus números)"""
+        lottery = get_lottery(lottery)
+        with self._lock:
+            return self._read_page(url, lottery)
+
+    def _read_page(self, url, lottery):
+        self.load(url, lottery)
+
+        # Todas las fechas y números de la página en una sola llamada al navegador
+        page = self.driver.execute_script(EXTRACT_PAGE_SCRIPT, lottery["date_selector"],
+                                          lottery["block_selector"], lottery["score_selector"])
+        return page["dates"], page["blocks"]
+
+    def close(self):
+        """Cerrar el navegador si se llegó a iniciar"""
+        self.metrics.report()
+        if self.driver is not None:
+            self.driver.quit()
+            self.driver = None
+            self.wait = None
+            print("Navegador cerrado.")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _parse_selector(selector):
+    """Convertir un selector simple ('span.score', '.a.b') en (etiqueta, clases)"""
+    tag, _, classes = selector.strip().partition(".")
+    return (tag or None), set(filter(None, classes.split(".")))
+
+
+def _matches(selector, tag, classes):
+    wanted_tag, wanted_classes = selector
+    return (wanted_tag is None or wanted_tag == tag) and wanted_classes <= classes
+
+
+class RateLimiter:
+    """Limita las peticiones a un máximo por segundo para cada host (seguro entre hilos)"""
+
+    def __init__(self, per_second=REQUESTS_PER_SECOND):
+        self.interval = 1.0 / per_second if per_second else 0
+        self._lock = threading.Lock()
+        self._next_slot = {}  # host -> momento a partir del cual se puede hacer la siguiente petición
+
+    def wait(self, url):
+        """Bloquear hasta que se pueda hacer una petición a la URL"""
+        if not self.interval:
+            return
+        host = urlparse(url).netloc
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+class _ResultsPageParser(HTMLParser):
+    """Extrae fechas y números de bloques de una página renderizada en el servidor"""
+
+    VOID_TAGS = {"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "source", "track", "wbr"}
+
+    def __init__(self, lottery):
+        super().__init__(convert_charrefs=True)
+        self.date_selector = _parse_selector(lottery["date_selector"])
+        self.block_selector = _parse_selector(lottery["block_selector"])
+        self.score_selector = _parse_selector(lottery["score_selector"])
+        self.stack = []  # (etiqueta, rol) de los elementos abiertos
+        self.date_texts = []
+        self.blocks = []
+        self._text = None
+
+    def handle_starttag(self, tag, attrs):
+        classes = set((dict(attrs).get("class") or "").split())
+        role = None
+        if _matches(self.date_selector, tag, classes):
+            role = "date"
+            self._text = []
+        elif _matches(self.block_selector, tag, classes):
+            role = "block"
+            self.blocks.append([])
+        elif self.blocks and self._inside("block") and _matches(self.score_selector, tag, classes):
+            role = "score"
+            self._text = []
+
+        if tag not in self.VOID_TAGS:
+            self.stack.append((tag, role))
+
+    def handle_endtag(self, tag):
+        # Cerrar hasta la etiqueta correspondiente (el HTML real no siempre está bien formado)
+        if not any(open_tag == tag for open_tag, _ in self.stack):
+            return
+        while self.stack:
+            open_tag, role = self.stack.pop()
+            if role == "date":
+                self.date_texts.append(self._collected_text())
+            elif role == "score":
+                self.blocks[-1].append(self._collected_text())
+            if open_tag == tag:
+                break
+
+    def handle_data(self, data):
+        if self._text is not None:
+            self._text.append(data)
+
+    def _inside(self, role):
+        return any(open_role == role for _, open_role in self.stack)
+
+    def _collected_text(self):
+        text = re.sub(r"\s+", " ", "".join(self._text or [])).strip()
+        self._text = None
+        return text
+
+
+def parse_results_page(html, lottery):
+    """Devolver (textos de fecha, bloques de números) a partir del HTML de una página"""
+    parser = _ResultsPageParser(get_lottery(lottery))
+    parser.feed(html)
+    parser.close()
+    return parser.date_texts, parser.blocks
+
+
+class HttpFetcher:
+    """Obtiene las páginas con una sesión HTTP reutilizable, sin iniciar Chrome.
+
+    Las páginas de resultados se renderizan en el servidor, así que basta con
+    descargar el HTML y extraer las fechas y los números. Si una página no trae
+    ni fechas ni bloques y hay un fetcher de respaldo, se prueba una sola vez
+    con ese para esa lotería: si el navegador sí encuentra resultados (la
+    página necesita JavaScript) se usa el navegador durante el resto de la
+    sesión; si tampoco encuentra nada, o la lotería ya trajo resultados por
+    HTTP, las páginas vacías se toman como vacías (lo normal en las páginas
+    antiguas del relleno) sin volver a abrir el navegador.
+
+    La sesión puede usarse desde varios hilos; rate_limiter controla cuántas
+    peticiones por segundo recibe cada host.
+    """
+
+    def __init__(self, fallback=None, rate_limiter=None):
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+
+        self.session = requests.Session()
+        self.session.headers.update({"User-Agent": USER_AGENT})
+        retries = Retry(total=MAX_ATTEMPTS - 1, backoff_factor=1, status_forcelist=(429, 500, 502, 503, 504))
+        adapter = HTTPAdapter(pool_connections=HTTP_POOL_SIZE, pool_maxsize=HTTP_POOL_SIZE, max_retries=retries)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self.metrics = LoadMetrics()
+        self.fallback = fallback
+        self.needs_browser = set()  # Loterías cuyas páginas necesitan JavaScript
+        self.http_only = set()  # Loterías que no necesitan el navegador (trajeron resultados por HTTP o el navegador tampoco)
+        self._probe_lock = threading.Lock()  # Una sola prueba con el navegador por lotería
+
+    def fetch(self, url, lottery):
+        """Devolver (textos de fecha, lista de bloques con los textos de sus números)"""
+        lottery = get_lottery(lottery)
+        if lottery["name"] in self.needs_browser:
+            return self.fallback.fetch(url, lottery)
+
+        self.rate_limiter.wait(url)
+        start = time.perf_counter()
+        response = self.session.get(url, timeout=HTTP_TIMEOUT)
+        response.raise_for_status()
+        self.metrics.record(url, time.perf_counter() - start)
+        date_texts, blocks = parse_results_page(response.text, lottery)
+
+        if date_texts or blocks:
+            self.http_only.add(lottery["name"])
+        elif self.fallback is not None and lottery["name"] not in self.http_only:
+            return self._probe_browser(url, lottery)
+
+        return date_texts, blocks
+
+    def _probe_browser(self, url, lottery):
+        """Probar una página vacía con el navegador y recordar para la lotería si hace falta"""
+        with self._probe_lock:
+            # Otro hilo pudo resolver la lotería mientras este esperaba
+            if lottery["name"] in self.needs_browser:
+                return self.fallback.fetch(url, lottery)
+            if lottery["name"] in self.http_only:
+                return [], []
+
+            print(f"La página de {lottery['display_name']} no trae resultados en el HTML, probando con el navegador...")
+            try:
+                date_texts, blocks = self.fallback.fetch(url, lottery)
+            except Exception as e:
+                print(f"El navegador tampoco encontró resultados: {str(e)}")
+                date_texts, blocks = [], []
+
+            if date_texts or blocks:
+                self.needs_browser.add(lottery["name"])
+            else:
+                # La página realmente está vacía: no se vuelve a probar con el navegador
+                self.http_only.add(lottery["name"])
+            return date_texts, blocks
+
+    def close(self):
+        self.metrics.report()
+        self.session.close()
+        if self.fallback is not None:
+            self.fallback.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def make_fetcher(mode="auto", rate_limiter=None):
+    """Crear el fetcher según el modo: 'http', 'browser' o 'auto' (HTTP con respaldo de Chrome)
+
+    rate_limiter permite que varios fetchers HTTP compartan el mismo límite por host.
+    """
+    if mode == "browser":
+        return BrowserFetcher()
+    if mode == "http":
+        return HttpFetcher(rate_limiter=rate_limiter)
+    if mode == "auto":
+        return HttpFetcher(fallback=BrowserFetcher(), rate_limiter=rate_limiter)
+    raise ValueError(f"Modo de descarga desconocido: '{mode}'. Opciones: {', '.join(FETCH_MODES)}")
@@ -0,0 +1,226 @@
+"""
+Intervalos entre apariciones de cada número (en sorteos y en días).
+
+Para cada número se obtiene la distribución completa de intervalos entre
+apariciones consecutivas, en qué percentil de esa distribución está el
+intervalo actual (sorteos desde su última salida) y la tasa de riesgo
+empírica: de las veces que el número llevó ese mismo tiempo sin salir, en
+qué proporción salió en el sorteo siguiente. Todo se calcula a la vez para
+todos los números con np.nonzero sobre la matriz de presencia de los
+sorteos, o a partir de los intervalos que el actualizador ya acumula en
+stats.NumberStats (from_stats), sin volver a leer el registro.
+
+El ranking de atrasados ordena por la probabilidad de llevar tanto tiempo sin
+salir si cada sorteo fuera independiente, con la frecuencia propia del
+número: (1 - p) ** sorteos_sin_salir. A diferencia de coldestNumbers (los
+días sin salir), tiene en cuenta que un número de una lotería con pocas
+posiciones tarda más en salir que uno del Super Kino.
+
+Uso:
+    python -m lottery_core.gaps super_kino --top 15
+    python -m lottery_core.gaps all
+"""
+
+import argparse
+import os
+import sys
+from datetime import datetime
+
+import numpy as np
+
+from .dates import from_ordinal, to_ordinal
+from .matrix import load_draw_matrix
+from .registry import LOTTERIES, get_lottery, json_file
+
+TOP_SAVED = 10  # Números atrasados que se guardan en el JSON (overdueNumbers)
+
+_cache = {}  # ruta absoluta -> (DrawMatrix, GapDistribution)
+
+
+class GapDistribution:
+    """Intervalos entre apariciones de todos los números de una lotería
+
+    Args:
+        one_hot: Matriz (n_sorteos, size) de presencia, del sorteo más antiguo al más reciente
+        ordinals: Ordinal de día de cada sorteo
+        numbers: Números de la lotería (columnas de one_hot que se analizan)
+        today: Fecha de referencia para los días sin salir (por defecto ahora)
+    """
+
+    def __init__(self, one_hot, ordinals, numbers, today=None):
+        one_hot = np.asarray(one_hot, dtype=bool)
+        self.ordinals = np.asarray(ordinals, dtype=np.int64)
+        self.numbers = np.asarray(numbers)
+        self.total_draws = len(one_hot)
+        self.today = (today or datetime.now()).toordinal()
+
+        # Apariciones agrupadas por número (np.nonzero recorre la traspuesta fila a fila)
+        columns, rows = np.nonzero(one_hot[:, self.numbers].T)
+        self.appearances = np.bincount(columns, minlength=len(self.numbers))
+        bounds = np.concatenate(([0], np.cumsum(self.appearances)))
+
+        # Entre apariciones consecutivas del mismo número (dentro de cada grupo de np.nonzero)
+        draw_gaps = np.diff(rows)
+        day_gaps = np.diff(self.ordinals[rows])
+        same = columns[1:] == columns[:-1]
+        self.gaps = [draw_gaps[start:max(stop - 1, start)]
+                     for start, stop in zip(bounds[:-1], bounds[1:])]  # Por número, en sorteos
+        self.day_gap_total = np.bincount(columns[1:][same], weights=day_gaps[same], minlength=len(self.numbers))
+        self.day_gap_max = np.zeros(len(self.numbers), dtype=np.int64)
+        np.maximum.at(self.day_gap_max, columns[1:][same], day_gaps[same])
+
+        seen = self.appearances > 0
+        last_rows = np.full(len(self.numbers), -1)
+        last_rows[seen] = rows[bounds[1:][seen] - 1]
+        self.last_seen = np.full(len(self.numbers), -1, dtype=np.int64)
+        self.last_seen[seen] = self.ordinals[last_rows[seen]]
+        # Sorteos desde la última aparición (0 = salió en el último sorteo); sin apariciones, todo el historial
+        self.draws_since_seen = np.where(seen, self.total_draws - 1 - last_rows, self.total_draws)
+
+    @classmethod
+    def from_matrix(cls, matrix, today=None):
+        """Intervalos de una DrawMatrix; los números salen de las claves del JSON"""
+        highest = int(matrix.draws.max()) if len(matrix) else 0
+        numbers = sorted(int(num) for num in matrix.data.get("numbers", {})) or list(range(highest + 1))
+        return cls(matrix.one_hot(max(numbers[-1], highest) + 1), matrix.ordinals, numbers, today)
+
+    @classmethod
+    def from_draws(cls, lottery, draws, today=None):
+        """Intervalos a partir de {fecha: números} (como read_draws)"""
+        lottery = get_lottery(lottery)
+        ordered = sorted(draws.items(), key=lambda item: to_ordinal(item[0]))
+        one_hot = np.zeros((len(ordered), lottery["max_number"] + 1), dtype=bool)
+        for index, (_, drawn_numbers) in enumerate(ordered):
+            one_hot[index, [int(num) for num in drawn_numbers if num is not None]] = True
+        ordinals = [to_ordinal(date_str) for date_str, _ in ordered]
+        return cls(one_hot, ordinals, range(lottery["min_number"], lottery["max_number"] + 1), today)
+
+    @classmethod
+    def from_stats(cls, stats, today=None):
+        """Intervalos a partir de los agregados guardados en stats.NumberStats, sin leer el registro"""
+        distribution = cls.__new__(cls)
+        keys = sorted(stats.numbers, key=int)
+        saved = [stats.numbers[num] for num in keys]
+        distribution.numbers = np.array([int(num) for num in keys])
+        distribution.total_draws = stats.total_draws
+        distribution.today = (today or datetime.now()).toordinal()
+        distribution.appearances = np.array([data["drawsSeen"] for data in saved], dtype=np.int64)
+        distribution.gaps = [np.repeat(np.array([int(gap) for gap in data["gapCounts"]], dtype=np.int64),
+                                       list(data["gapCounts"].values()))
+                             for data in saved]
+        distribution.day_gap_total = np.array([data["dayGapTotal"] for data in saved], dtype=np.float64)
+        distribution.day_gap_max = np.array([data["dayGapMax"] for data in saved], dtype=np.int64)
+        distribution.last_seen = np.array([to_ordinal(data["lastSeen"]) if data["lastSeen"] else -1 for data in saved],
+                                          dtype=np.int64)
+        distribution.draws_since_seen = np.array([stats.total_draws - 1 - data["lastDraw"]
+                                                  if data["lastDraw"] is not None else stats.total_draws
+                                                  for data in saved], dtype=np.int64)
+        return distribution
+
+    def _index(self, number):
+        return int(np.searchsorted(self.numbers, int(number)))
+
+    def histogram(self, number):
+        """Distribución de intervalos en sorteos: histogram[g] = veces que volvió a salir a los g sorteos"""
+        return np.bincount(self.gaps[self._index(number)])
+
+    def hazard(self, number):
+        """Tasa de riesgo empírica: hazard[g] = P(salir a los g sorteos | lleva g - 1 sin salir)"""
+        histogram = self.histogram(number)
+        at_risk = histogram[::-1].cumsum()[::-1]  # Intervalos de g sorteos o más
+        return histogram / np.maximum(at_risk, 1)
+
+    def summary(self, number):
+        """Estadísticas del número: intervalos, intervalo actual, percentil, riesgo y probabilidad de atraso"""
+        index = self._index(number)
+        draw_gaps = self.gaps[index]
+        current = int(self.draws_since_seen[index])
+        rate = self.appearances[index] / self.total_draws if self.total_draws else 0.0
+
+        # Riesgo de salir en el próximo sorteo tras current sorteos sin salir (intervalo current + 1)
+        longer = int((draw_gaps > current).sum())
+        hazard = float((draw_gaps == current + 1).sum() / longer) if longer else None
+        last_seen = int(self.last_seen[index])
+        return {
+            "number": f"{int(self.numbers[index]):02d}",
+            "appearances": int(self.appearances[index]),
+            "lastSeen": from_ordinal(last_seen) if last_seen >= 0 else None,
+            "drawsSinceSeen": current,
+            "daysSinceSeen": self.today - last_seen if last_seen >= 0 else None,
+            "meanGapDraws": float(draw_gaps.mean()) if len(draw_gaps) else None,
+            "medianGapDraws": float(np.median(draw_gaps)) if len(draw_gaps) else None,
+            "maxGapDraws": int(draw_gaps.max()) if len(draw_gaps) else None,
+            "meanGapDays": float(self.day_gap_total[index] / len(draw_gaps)) if len(draw_gaps) else None,
+            "maxGapDays": int(self.day_gap_max[index]) if len(draw_gaps) else None,
+            # Porcentaje de intervalos anteriores más cortos que el actual, que ya es de current + 1 sorteos
+            "gapPercentile": float((draw_gaps <= current).mean() * 100) if len(draw_gaps) else None,
+            "hazard": hazard,
+            "expectedHazard": float(rate),
+            "overdueProbability": float((1 - rate) ** current) if rate else None,
+        }
+
+    def overdue_ranking(self, limit=TOP_SAVED):
+        """Números más atrasados: menor probabilidad de llevar tanto tiempo sin salir
+
+        Los números que nunca salieron van primero (ordenados por número); su
+        overdueProbability es None porque no hay frecuencia con la que calcularla.
+        """
+        rates = self.appearances / max(self.total_draws, 1)
+        with np.errstate(divide="ignore"):
+            log_probability = np.where(rates > 0, self.draws_since_seen * np.log1p(-np.minimum(rates, 1 - 1e-12)), 0.0)
+        never_seen = self.appearances == 0
+        order = np.lexsort((self.numbers, -self.draws_since_seen, log_probability, ~never_seen))[:limit]
+        return [self.summary(self.numbers[index]) for index in order]
+
+
+def load_gap_distribution(json_path, today=None):
+    """Intervalos de un lottery_data_<name>.json, recalculados solo si cambia el JSON"""
+    path = os.path.abspath(json_path)
+    matrix = load_draw_matrix(path)
+    cached = _cache.get(path)
+    if cached and cached[0] is matrix and today is None:
+        return cached[1]
+
+    distribution = GapDistribution.from_matrix(matrix, today)
+    if today is None:
+        _cache[path] = (matrix, distribution)
+    return distribution
+
+
+def overdue_numbers(lottery, draws, today=None, limit=TOP_SAVED, stats=None):
+    """Ranking de atrasados en el formato del JSON (overdueNumbers)
+
+    Con stats (stats.NumberStats) se usa lo acumulado ahí y draws no hace falta.
+    """
+    if stats is not None:
+        return GapDistribution.from_stats(stats, today).overdue_ranking(limit)
+    return GapDistribution.from_draws(lottery, draws, today).overdue_ranking(limit)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Intervalos entre apariciones y números atrasados")
+    parser.add_argument("lottery", help="Lotería ('all' para todas)")
+    parser.add_argument("--top", type=int, default=TOP_SAVED, help="Números atrasados a mostrar")
+    args = parser.parse_args(sys.argv[1:] if argv is None else argv)
+
+    names = list(LOTTERIES) if args.lottery == "all" else [get_lottery(args.lottery)["name"]]
+    for name in names:
+        if not os.path.exists(json_file(name)):
+            continue
+        distribution = load_gap_distribution(json_file(name))
+        print(f"\n{LOTTERIES[name]['display_name']}: {distribution.total_draws} sorteos")
+        print(f"  {'Núm':>4} {'Sin salir':>10} {'Días':>6} {'Media':>7} {'Máx':>5} {'Percentil':>10} "
+              f"{'Riesgo':>8} {'Esperado':>9} {'P(atraso)':>10}")
+        for entry in distribution.overdue_ranking(args.top):
+            hazard = f"{entry['hazard']:.3f}" if entry["hazard"] is not None else "-"
+            probability = f"{entry['overdueProbability']:.4f}" if entry["overdueProbability"] is not None else "-"
+            days = entry["daysSinceSeen"] if entry["daysSinceSeen"] is not None else "-"
+            print(f"  {entry['number']:>4} {entry['drawsSinceSeen']:>10} {days:>6} "
+                  f"{entry['meanGapDraws'] or 0:>7.1f} {entry['maxGapDraws'] or 0:>5} "
+                  f"{entry['gapPercentile'] or 0:>9.1f}% {hazard:>8} {entry['expectedHazard']:>9.3f} "
+                  f"{probability:>10}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
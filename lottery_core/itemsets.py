@@ -0,0 +1,196 @@
+"""
+Combinaciones frecuentes de k números (tríos, cuartetos...) en los sorteos.
+
+Cuenta todos los subconjuntos de hasta max_k números que salieron juntos en
+al menos min_support sorteos, al estilo Apriori en formato vertical (Eclat):
+cada combinación lleva el bitset (entero de Python) de los sorteos en los que
+salió, una extensión con otro número es un AND y su soporte un bit_count().
+Como el soporte de una combinación nunca supera el de sus subconjuntos, solo
+se extienden las que alcanzan min_support, así que nunca se enumeran las
+C(20, 3) = 1140 ternas de cada sorteo del Kino.
+
+El trabajo se reparte por primer número entre varios procesos y la búsqueda
+es en profundidad: la memoria queda acotada por los resultados (o por --top
+por tamaño) más max_k bitsets por proceso. Los sorteos salen del registro de
+sorteos (lottery_core.drawlog) o, si todavía no existe, del JSON de la
+lotería; la consulta no crea ni modifica ningún archivo.
+
+Uso:
+    python -m lottery_core.itemsets super_kino --max-k 4 --min-support 10
+    python -m lottery_core.itemsets Loto_Super_Loto_Mas --max-k 3 --min-support 3 --top 15
+"""
+
+import argparse
+import heapq
+import json
+import os
+import sys
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+
+from .drawlog import draws_from_numbers, read_draws
+from .registry import get_lottery, json_file
+
+DEFAULT_MAX_K = 3  # Tamaño máximo de las combinaciones
+DEFAULT_MIN_SUPPORT = 5  # Sorteos mínimos en los que debe salir una combinación
+
+_bits = None  # Bitsets por número del proceso de trabajo (ver _init_worker)
+
+
+def draw_bitsets(draws):
+    """Bitset por número: el bit i vale 1 si el número salió en el sorteo i
+
+    Args:
+        draws: Números de cada sorteo (listas de "07"; los None se ignoran)
+    """
+    bits = defaultdict(int)
+    for index, numbers in enumerate(draws):
+        for num in set(numbers):
+            if num is not None:
+                bits[int(num)] |= 1 << index
+    return dict(bits)
+
+
+def _init_worker(bits):
+    global _bits
+    _bits = bits
+
+
+def _itemset_key(support, itemset):
+    # Más soporte primero y, a igual soporte, los números más bajos (para los montículos del TOP)
+    return (support, tuple(-num for num in itemset))
+
+
+def _mine_prefix(task):
+    """Combinaciones frecuentes que empiezan por un número (el subárbol de ese prefijo)
+
+    Returns:
+        dict: {k: [(soporte, combinación)]}; con top, solo las top mejores por k
+    """
+    first, items, max_k, min_support, top = task
+    found = defaultdict(list)
+
+    def record(itemset, support):
+        entries = found[len(itemset)]
+        if top is None:
+            entries.append((support, itemset))
+        elif len(entries) < top:
+            heapq.heappush(entries, (_itemset_key(support, itemset), support, itemset))
+        else:
+            heapq.heappushpop(entries, (_itemset_key(support, itemset), support, itemset))
+
+    def extend(itemset, bitset, start):
+        for index in range(start, len(items)):
+            together = bitset & _bits[items[index]]
+            support = together.bit_count()
+            if support >= min_support:
+                extended = itemset + (items[index],)
+                record(extended, support)
+                if len(extended) < max_k:
+                    extend(extended, together, index + 1)
+
+    extend((items[first],), _bits[items[first]], first + 1)
+    if top is None:
+        return dict(found)
+    return {k: [(support, itemset) for _, support, itemset in entries] for k, entries in found.items()}
+
+
+def frequent_itemsets(draws, max_k=DEFAULT_MAX_K, min_support=DEFAULT_MIN_SUPPORT, top=None, workers=None):
+    """Combinaciones de 2 a max_k números que salieron juntas en al menos min_support sorteos
+
+    Args:
+        draws: Números de cada sorteo (por ejemplo, los valores de read_draws)
+        max_k: Tamaño máximo de las combinaciones
+        min_support: Sorteos mínimos en los que debe salir una combinación
+        top: Si se indica, solo se conservan las top combinaciones de cada tamaño
+        workers: Procesos de trabajo (por defecto os.cpu_count(); 1 = sin procesos)
+
+    Returns:
+        dict: {k: [(combinación ("05", "12", "33"), soporte)]}, de más a menos soporte
+    """
+    bits = draw_bitsets(draws)
+    items = sorted(num for num, bitset in bits.items() if bitset.bit_count() >= min_support)
+    tasks = [(first, items, max_k, min_support, top) for first in range(len(items) - 1)]
+    workers = workers or os.cpu_count() or 1
+
+    if workers == 1 or len(tasks) < 2:
+        _init_worker(bits)
+        partials = [_mine_prefix(task) for task in tasks]
+    else:
+        # Los primeros números tienen los subárboles más grandes: se reparten de uno en uno
+        with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(bits,)) as executor:
+            partials = list(executor.map(_mine_prefix, tasks, chunksize=1))
+
+    merged = defaultdict(list)
+    for partial in partials:
+        for k, entries in partial.items():
+            merged[k].extend(entries)
+
+    result = {}
+    for k in range(2, max_k + 1):
+        entries = merged.get(k, [])
+        if top is not None:
+            entries = heapq.nlargest(top, entries, key=lambda entry: _itemset_key(*entry))
+        entries.sort(key=lambda entry: (-entry[0], entry[1]))
+        result[k] = [(tuple(f"{num:02d}" for num in itemset), support) for support, itemset in entries]
+    return result
+
+
+def load_draws(lottery):
+    """Sorteos de una lotería ({fecha: números}) sin crear el registro
+
+    Se leen del registro de sorteos y, si todavía no existe, del JSON.
+    """
+    lottery = get_lottery(lottery)
+    draws = read_draws(lottery)
+    if draws:
+        return draws
+    try:
+        with open(json_file(lottery), 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+    return draws_from_numbers(data.get("numbers", {}), lottery["positions"])
+
+
+def lottery_itemsets(lottery, max_k=DEFAULT_MAX_K, min_support=DEFAULT_MIN_SUPPORT, top=None, workers=None,
+                     draws=None):
+    """frequent_itemsets sobre los sorteos guardados de una lotería
+
+    Args:
+        draws: Sorteos ya cargados ({fecha: números}); None = leerlos con load_draws
+    """
+    if draws is None:
+        draws = load_draws(lottery)
+    return frequent_itemsets(draws.values(), max_k, min_support, top, workers)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Combinaciones frecuentes de k números en los sorteos")
+    parser.add_argument("lottery", help="Lotería")
+    parser.add_argument("--max-k", type=int, default=DEFAULT_MAX_K, help="Tamaño máximo de las combinaciones")
+    parser.add_argument("--min-support", type=int, default=DEFAULT_MIN_SUPPORT,
+                        help="Sorteos mínimos en los que debe salir una combinación")
+    parser.add_argument("--top", type=int, default=20, help="Combinaciones a mostrar por tamaño")
+    parser.add_argument("--workers", type=int, help="Procesos de trabajo (por defecto uno por núcleo)")
+    args = parser.parse_args(sys.argv[1:] if argv is None else argv)
+
+    lottery = get_lottery(args.lottery)
+    draws = load_draws(lottery)
+    total_draws = len(draws)
+    start = time.perf_counter()
+    result = lottery_itemsets(lottery, args.max_k, args.min_support, args.top, args.workers, draws=draws)
+    elapsed = time.perf_counter() - start
+
+    print(f"{lottery['display_name']}: {total_draws} sorteos, soporte mínimo {args.min_support}")
+    for k, entries in result.items():
+        print(f"\nTOP {args.top} combinaciones de {k} números:")
+        for itemset, support in entries:
+            print(f"  {'-'.join(itemset)}: {support} sorteos ({support / total_draws * 100:.2f}%)")
+    print(f"\nCalculado en {elapsed:.2f} s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
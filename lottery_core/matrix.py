@@ -0,0 +1,118 @@
+"""
+Sorteos de un JSON de json_Datos como matriz NumPy para los análisis.
+
+Los scripts de análisis (other/) necesitan los sorteos completos, no el
+historial por número que guarda el JSON de la web. load_draw_matrix() hace
+esa reconstrucción una sola vez: devuelve una matriz uint8 (n_sorteos,
+posiciones) ordenada del sorteo más antiguo al más reciente y el vector de
+ordinales de día de cada fila. El resultado se memoriza por archivo y se
+vuelve a leer solo si cambia su fecha de modificación, así que varios
+análisis en la misma sesión leen el JSON una sola vez.
+"""
+
+import json
+import os
+
+import numpy as np
+
+from .dates import from_ordinal, to_ordinal
+from .drawlog import draws_from_numbers
+
+_cache = {}  # ruta absoluta -> (mtime_ns, DrawMatrix)
+
+
+class DrawMatrix:
+    """Sorteos completos de una lotería
+
+    Args:
+        data: JSON completo de la lotería (lotteryName, lastUpdated, numbers...)
+        draws: Matriz uint8 (n_sorteos, posiciones), del más antiguo al más reciente
+        ordinals: Ordinal de día de cada fila de draws
+        skipped: Fechas descartadas por tener posiciones sin número
+    """
+
+    def __init__(self, data, draws, ordinals, skipped=0):
+        self.data = data
+        self.draws = draws
+        self.ordinals = ordinals
+        self.skipped = skipped
+
+    def __len__(self):
+        return len(self.ordinals)
+
+    @property
+    def positions(self):
+        return self.draws.shape[1]
+
+    @property
+    def dates(self):
+        """Fechas dd-mm-YYYY de cada fila"""
+        return [from_ordinal(int(ordinal)) for ordinal in self.ordinals]
+
+    def numbers(self, index):
+        """Números de una fila en el formato del JSON ("07")"""
+        return [f"{num:02d}" for num in self.draws[index].tolist()]
+
+    def one_hot(self, size=None):
+        """Matriz de presencia (n_sorteos, size) de los sorteos (ver one_hot_draws)"""
+        return one_hot_draws(self.draws, size)
+
+    def as_dict(self):
+        """Sorteos como {fecha: números}, del más antiguo al más reciente (como read_draws)"""
+        return {from_ordinal(ordinal): [f"{num:02d}" for num in row]
+                for ordinal, row in zip(self.ordinals.tolist(), self.draws.tolist())}
+
+
+def one_hot_draws(draws, size=None):
+    """Matriz bool (n_sorteos, size) con True en la columna de cada número que salió
+
+    Args:
+        draws: Números de cada sorteo (matriz o lista de listas de enteros)
+        size: Columnas (número más alto + 1); por defecto el máximo de draws + 1
+    """
+    draws = np.asarray(draws, dtype=np.intp)
+    if size is None:
+        size = int(draws.max()) + 1 if draws.size else 0
+    one_hot = np.zeros((len(draws), size), dtype=bool)
+    one_hot[np.arange(len(draws))[:, None], draws] = True
+    return one_hot
+
+
+def co_occurrence(one_hot):
+    """Matriz (size, size) de sorteos en los que salieron juntos dos números (X.T @ X)
+
+    La diagonal es el número de sorteos en los que salió cada número.
+    """
+    one_hot = one_hot.astype(np.int32)
+    return one_hot.T @ one_hot
+
+
+def build_draw_matrix(data):
+    """Construir la matriz de sorteos a partir del JSON ya cargado"""
+    positions = data.get("positionsCount", 0)
+    draws = draws_from_numbers(data.get("numbers", {}), positions)
+    complete = [(date_str, numbers) for date_str, numbers in draws.items() if None not in numbers]
+
+    matrix = np.array([[int(num) for num in numbers] for _, numbers in complete],
+                      dtype=np.uint8).reshape(len(complete), positions)
+    ordinals = np.array([to_ordinal(date_str) for date_str, _ in complete], dtype=np.int32)
+    return DrawMatrix(data, matrix, ordinals, skipped=len(draws) - len(complete))
+
+
+def load_draw_matrix(json_path):
+    """Sorteos de un lottery_data_<name>.json como DrawMatrix, memorizados por fecha de modificación
+
+    Raises:
+        OSError: Si el archivo no existe o no se puede leer
+        ValueError: Si el archivo no es un JSON válido
+    """
+    path = os.path.abspath(json_path)
+    mtime = os.stat(path).st_mtime_ns
+    cached = _cache.get(path)
+    if cached and cached[0] == mtime:
+        return cached[1]
+
+    with open(path, 'r', encoding='utf-8') as f:
+        matrix = build_draw_matrix(json.load(f))
+    _cache[path] = (mtime, matrix)
+    return matrix
@@ -0,0 +1,113 @@
+"""
+Simulación Monte Carlo de jugadas aleatorias contra los sorteos históricos.
+
+Las jugadas se generan por bloques en NumPy: cada jugada de `picks` números
+es una fila one-hot (jugadas, total_numbers) construida con el algoritmo de
+Floyd (picks pasos vectorizados sobre todo el bloque, sin ordenar ni
+descartar), los aciertos de un bloque contra su sorteo son un solo producto
+de matrices con la fila one-hot ganadora y los premios salen de un arreglo
+indexado por aciertos. Con una semilla fija los resultados son
+reproducibles.
+"""
+
+import numpy as np
+
+BATCH_SIZE = 5_000  # Jugadas por bloque (bloques pequeños caben en la caché)
+SEED = 42  # Semilla por defecto
+
+
+def prize_array(prize_table, picks):
+    """Premio por número de aciertos como arreglo: prizes[aciertos]"""
+    prizes = np.zeros(picks + 1, dtype=np.int64)
+    for matches, prize in prize_table.items():
+        if 0 <= matches <= picks:
+            prizes[matches] = prize
+    return prizes
+
+
+def random_tickets(rng, count, picks, total_numbers, out=None):
+    """Jugadas aleatorias sin números repetidos como matriz one-hot float32 (count, total_numbers)
+
+    La columna j corresponde al número j + 1. Algoritmo de Floyd: en el paso
+    j se elige un número al azar entre los j + 1 primeros y, si ya estaba en
+    la jugada, se toma el número j; todas las combinaciones salen con la
+    misma probabilidad.
+
+    Args:
+        rng: numpy.random.Generator
+        out: Matriz (count, total_numbers) a reutilizar
+    """
+    if out is None:
+        out = np.zeros((count, total_numbers), dtype=np.float32)
+    else:
+        out.fill(0)
+    flat = out.reshape(-1)
+    offsets = np.arange(0, count * total_numbers, total_numbers, dtype=np.intp)
+    limits = np.arange(total_numbers - picks + 1, total_numbers + 1, dtype=np.float32)[:, None]
+    steps = (rng.random((picks, count), dtype=np.float32) * limits).astype(np.intp)
+    for step, choice in enumerate(steps):
+        choice += offsets
+        taken = flat[choice] == 1
+        np.putmask(choice, taken, offsets + (total_numbers - picks + step))
+        flat[choice] = 1
+    return out
+
+
+def simulate_random_tickets(winning, players, picks, prize_table, seed=SEED,
+                            batch_size=BATCH_SIZE, progress=None):
+    """Jugar `players` jugadas aleatorias de `picks` números en cada sorteo
+
+    Args:
+        winning: Matriz one-hot (n_sorteos, total_numbers) de los números
+            ganadores; la columna j corresponde al número j + 1
+        players: Jugadas por sorteo
+        picks: Números por jugada
+        prize_table: {aciertos: premio}
+        seed: Semilla del generador (None = aleatoria)
+        batch_size: Jugadas máximas por bloque
+        progress: Función opcional llamada con los sorteos ya procesados
+
+    Returns:
+        dict: matches (jugadas por número de aciertos, arreglo de picks + 1),
+        total_won, first_tickets (números de la primera jugada de cada
+        sorteo), first_matches y first_prizes (sus aciertos y premios)
+    """
+    winning = np.asarray(winning, dtype=np.float32)
+    total_draws, total_numbers = winning.shape
+    rng = np.random.default_rng(seed)
+    prizes = prize_array(prize_table, picks)
+
+    draws_per_block = max(1, batch_size // max(players, 1))
+    players_per_block = min(players, batch_size)
+    buffer = np.zeros((draws_per_block * players_per_block, total_numbers), dtype=np.float32)
+
+    matches_count = np.zeros(picks + 1, dtype=np.int64)
+    first_tickets = []
+    first_matches = np.zeros(total_draws, dtype=np.int64)
+
+    for start in range(0, total_draws, draws_per_block):
+        stop = min(start + draws_per_block, total_draws)
+        block_draws = stop - start
+        for first_player in range(0, players, players_per_block):
+            block_players = min(players_per_block, players - first_player)
+            count = block_draws * block_players
+            tickets = random_tickets(rng, count, picks, total_numbers, buffer[:count])
+            tickets = tickets.reshape(block_draws, block_players, total_numbers)
+
+            # (sorteos, jugadores, números) @ (sorteos, números, 1): aciertos de cada jugada
+            matches = np.matmul(tickets, winning[start:stop, :, None])[..., 0].astype(np.intp)
+            matches_count += np.bincount(matches.ravel(), minlength=picks + 1)
+
+            if first_player == 0:
+                first_matches[start:stop] = matches[:, 0]
+                first_tickets.extend(np.flatnonzero(row) + 1 for row in tickets[:, 0])
+        if progress:
+            progress(stop)
+
+    return {
+        "matches": matches_count,
+        "total_won": int(matches_count @ prizes),
+        "first_tickets": first_tickets,
+        "first_matches": first_matches,
+        "first_prizes": prizes[first_matches],
+    }
@@ -0,0 +1,155 @@
+from .dates import to_ordinal
+from .registry import get_lottery, position_key
+
+FREQUENCY_WINDOWS = (30, 100)  # Sorteos de cada ventana de frequencyRankings (ver rolling.py)
+
+
+def new_numbers_data(lottery):
+    """Crear la estructura vacía de números (con sus posiciones) de una lotería"""
+    lottery = get_lottery(lottery)
+    numbers_data = {}
+    for i in range(lottery["min_number"], lottery["max_number"] + 1):
+        num_str = str(i).zfill(2)
+        numbers_data[num_str] = {
+            "number": num_str,
+            "lastSeen": None,
+            "daysSinceSeen": None,
+            "positions": {position_key(p): 0 for p in range(1, lottery["positions"] + 1)},
+            "history": []  # Historial de apariciones
+        }
+    return numbers_data
+
+
+def add_draw(numbers_data, complete_date, drawn_numbers, draw_ordinal, today_ordinal):
+    """Registrar un sorteo en la vista por número (lastSeen, posiciones e historial)
+
+    Las fechas se pasan como ordinales de día (ver dates.py). Devuelve la
+    cantidad de números añadidos al historial.
+    """
+    days_diff = today_ordinal - draw_ordinal
+    added = 0
+
+    for pos, num in enumerate(drawn_numbers, 1):
+        if num not in numbers_data:
+            continue
+        data = numbers_data[num]
+
+        # Si no hemos visto este número antes o esta fecha es más reciente
+        if data["lastSeen"] is None or draw_ordinal > to_ordinal(data["lastSeen"]):
+            data["lastSeen"] = complete_date
+            data["daysSinceSeen"] = days_diff
+
+        # Actualizar contador de posiciones
+        data["positions"][position_key(pos)] += 1
+
+        # Añadir al historial de apariciones
+        data["history"].append({
+            "date": complete_date,
+            "position": pos,
+            "daysAgo": days_diff
+        })
+        added += 1
+
+    return added
+
+
+def repeated_numbers(last_30_days_occurrences):
+    """Números que aparecieron 2 o más veces en los últimos 30 días"""
+    repeated = {}
+    for num, dates in last_30_days_occurrences.items():
+        if len(dates) >= 2:
+            repeated[num] = {
+                "occurrences": len(dates),
+                "dates": dates
+            }
+    return repeated
+
+
+def hot_cold_numbers(numbers_data, limit=10):
+    """Calcular los números más fríos y más calientes según los días sin salir"""
+    numbers_with_values = [(num, data["daysSinceSeen"])
+                           for num, data in numbers_data.items()
+                           if data["daysSinceSeen"] is not None]
+
+    # Ordenar por días sin salir (de más a menos y de menos a más)
+    cold_numbers = sorted(numbers_with_values, key=lambda x: x[1], reverse=True)
+    hot_numbers = sorted(numbers_with_values, key=lambda x: x[1])
+
+    def as_entries(values):
+        return [{
+            "number": num,
+            "daysSinceSeen": days,
+            "lastSeen": numbers_data[num]["lastSeen"]
+        } for num, days in values[:limit]]
+
+    return as_entries(cold_numbers), as_entries(hot_numbers)
+
+
+def frequency_rankings_entries(lottery, draws):
+    """Ranking de frecuencia por ventanas de sorteos (frequencyRankings, ver rolling.py)
+
+    Returns:
+        dict: El ranking, o None si NumPy no está instalado (el JSON queda sin el campo)
+    """
+    try:
+        from .rolling import frequency_rankings
+    except ImportError:
+        return None
+    return frequency_rankings(lottery, draws)
+
+
+def overdue_numbers_entries(lottery, draws, today=None, stats=None):
+    """Ranking de números atrasados por intervalos entre apariciones (overdueNumbers, ver gaps.py)
+
+    Args:
+        stats: stats.NumberStats con los intervalos acumulados; si se pasa, draws puede ser None
+
+    Returns:
+        list: El ranking, o None si NumPy no está instalado (el JSON queda sin el campo)
+    """
+    try:
+        from .gaps import overdue_numbers
+    except ImportError:
+        return None
+    return overdue_numbers(lottery, draws, today, stats=stats)
+
+
+def winning_numbers_entries(drawn_numbers, date_str):
+    """Lista de números ganadores con su posición tal como se guarda en el JSON"""
+    return [{
+        "number": num,
+        "position": idx + 1,
+        "date": date_str
+    } for idx, num in enumerate(drawn_numbers)]
+
+
+def format_time_period(days):
+    """Convertir días a formato legible (años, meses, días)"""
+    if days <= 0:
+        return "0 días"
+
+    years = days // 365
+    remaining_days = days % 365
+    months = remaining_days // 30
+    final_days = remaining_days % 30
+
+    parts = []
+
+    if years > 0:
+        parts.append("1 año" if years == 1 else f"{years} años")
+
+    if months > 0:
+        parts.append("1 mes" if months == 1 else f"{months} meses")
+
+    if final_days > 0:
+        parts.append("1 día" if final_days == 1 else f"{final_days} días")
+
+    if not parts:  # Si todo es 0, mostrar 0 días
+        return "0 días"
+
+    if len(parts) == 1:
+        return parts[0]
+    elif len(parts) == 2:
+        return f"{parts[0]} y {parts[1]}"
+    else:
+        return f"{parts[0]}, {parts[1]} y {parts[2]}"
@@ -0,0 +1,168 @@
+"""
+Probabilidades exactas de una jugada aleatoria en juegos tipo Kino.
+
+Una jugada de `picks` números entre `total_numbers` contra un sorteo de
+`drawn` números acierta k con probabilidad hipergeométrica
+C(drawn, k) * C(total_numbers - drawn, picks - k) / C(total_numbers, picks).
+Con eso y la tabla de premios salen sin simular el valor esperado, la
+varianza y el retorno al jugador; el riesgo de ruina se calcula por
+programación dinámica sobre el saldo. compare_with_simulation() comprueba que
+una simulación Monte Carlo (lottery_core.montecarlo) converge a estos valores.
+"""
+
+from math import comb, gcd, sqrt
+
+import numpy as np
+
+# Reglas de cada juego: números por jugada, costo y premio por aciertos
+# (las usan el backtest y los simuladores de other/)
+GAMES = {
+    "super_kino": {
+        "picks": 10,
+        "cost": 25,
+        "prize_table": {
+            10: 25_000_000,  # 10 aciertos: 25 millones
+            9: 150_000,      # 9 aciertos: 150 mil
+            8: 10_000,       # 8 aciertos: 10 mil
+            7: 1_000,        # 7 aciertos: 1 mil
+            6: 300,          # 6 aciertos: 300 pesos
+            5: 60,           # 5 aciertos: 60 pesos
+            0: 80,           # 0 aciertos: devolución de 80 pesos
+            # 1, 2, 3, 4 aciertos no ganan nada
+        },
+    },
+    "Pega_3_Mas": {
+        "picks": 3,
+        "cost": 10,
+        "prize_table": {3: 30_000, 2: 600, 1: 10},
+    },
+}
+
+
+def match_distribution(picks, drawn, total_numbers):
+    """Probabilidad de cada número de aciertos: [P(0), ..., P(picks)]"""
+    total = comb(total_numbers, picks)
+    return [comb(drawn, k) * comb(total_numbers - drawn, picks - k) / total for k in range(picks + 1)]
+
+
+def ticket_odds(prize_table, picks, drawn, total_numbers, cost):
+    """Distribución exacta, valor esperado y varianza de una jugada aleatoria
+
+    Args:
+        prize_table: {aciertos: premio}
+        picks: Números por jugada
+        drawn: Números que salen por sorteo
+        total_numbers: Rango de números (1 a total_numbers)
+        cost: Costo de la jugada
+
+    Returns:
+        dict: distribution (probabilidad por aciertos), prizes, expected_prize,
+        expected_net (valor esperado neto por jugada), variance y std (del
+        resultado de una jugada), rtp (retorno al jugador, 0-1) y win_probability
+    """
+    distribution = match_distribution(picks, drawn, total_numbers)
+    prizes = [prize_table.get(k, 0) for k in range(picks + 1)]
+    expected_prize = sum(p * prize for p, prize in zip(distribution, prizes))
+    variance = sum(p * (prize - expected_prize) ** 2 for p, prize in zip(distribution, prizes))
+    return {
+        "picks": picks,
+        "cost": cost,
+        "distribution": distribution,
+        "prizes": prizes,
+        "expected_prize": expected_prize,
+        "expected_net": expected_prize - cost,
+        "variance": variance,
+        "std": sqrt(variance),
+        "rtp": expected_prize / cost,
+        "win_probability": sum(p for p, prize in zip(distribution, prizes) if prize > cost),
+    }
+
+
+def risk_of_ruin(odds, bankroll, games):
+    """Probabilidad de quedarse sin saldo para pagar una jugada dentro de `games` jugadas
+
+    Se juega una jugada por sorteo empezando con `bankroll`; el saldo se
+    recorre por programación dinámica en unidades del máximo común divisor
+    de costo, premios y saldo. Un saldo de costo * games o más ya no se
+    puede agotar, así que se cuenta como a salvo.
+    """
+    cost = odds["cost"]
+    if bankroll < cost:
+        return 1.0
+    if games <= 0:
+        return 0.0
+
+    unit = gcd(cost, bankroll, *odds["prizes"])
+    cost_units = cost // unit
+    safe_units = cost_units * games
+    start = bankroll // unit
+    if start >= safe_units:
+        return 0.0
+
+    outcomes = {}
+    for p, prize in zip(odds["distribution"], odds["prizes"]):
+        net = (prize - cost) // unit
+        outcomes[net] = outcomes.get(net, 0.0) + p
+
+    alive = np.zeros(safe_units)
+    alive[start] = 1.0
+    ruined = 0.0
+    for _ in range(games):
+        after = np.zeros(safe_units)
+        for net, p in outcomes.items():
+            if net >= safe_units:
+                continue  # Cualquier saldo vivo pasa a estar a salvo
+            if net >= 0:
+                after[net:] += p * alive[:safe_units - net]
+            else:
+                # Los saldos vivos son >= costo, así que nunca bajan de 0
+                after[:safe_units + net] += p * alive[-net:]
+        ruined += after[:cost_units].sum()
+        after[:cost_units] = 0.0
+        alive = after
+    return float(ruined)
+
+
+def compare_with_simulation(odds, matches_count, total_won=None):
+    """Comparar una simulación Monte Carlo con los valores exactos
+
+    Args:
+        odds: Resultado de ticket_odds
+        matches_count: Jugadas simuladas por número de aciertos ({k: veces} o lista)
+        total_won: Premios simulados (por defecto, los de matches_count)
+
+    Returns:
+        dict: games, rows ([(aciertos, esperado, observado, z)]), max_z (mayor
+        |z| entre los aciertos con al menos 10 jugadas esperadas), rtp,
+        simulated_rtp, rtp_z (diferencia en errores estándar) y converged
+        (|z| <= 4 en todo)
+    """
+    if not isinstance(matches_count, dict):
+        matches_count = dict(enumerate(matches_count))
+    games = sum(matches_count.values())
+    if total_won is None:
+        total_won = sum(count * odds["prizes"][k] for k, count in matches_count.items())
+
+    rows = []
+    max_z = 0.0
+    for k, p in enumerate(odds["distribution"]):
+        expected = games * p
+        observed = matches_count.get(k, 0)
+        sigma = sqrt(games * p * (1 - p))
+        z = (observed - expected) / sigma if sigma else 0.0
+        rows.append((k, expected, observed, z))
+        if expected >= 10:
+            max_z = max(max_z, abs(z))
+
+    simulated_rtp = total_won / (games * odds["cost"]) if games else 0.0
+    rtp_error = odds["std"] / (odds["cost"] * sqrt(games)) if games else 0.0
+    rtp_z = (simulated_rtp - odds["rtp"]) / rtp_error if rtp_error else 0.0
+    return {
+        "games": games,
+        "rows": rows,
+        "max_z": max_z,
+        "rtp": odds["rtp"],
+        "simulated_rtp": simulated_rtp,
+        "rtp_z": rtp_z,
+        "converged": max_z <= 4 and abs(rtp_z) <= 4,
+    }
@@ -0,0 +1,134 @@
+"""
+Orquestador: actualiza todas las loterías en un solo proceso.
+
+En lugar de ejecutar los 15 *_updater.py por separado (y arrancar Chrome en
+cada uno), las actualizaciones se reparten entre un grupo pequeño de fetchers
+reutilizables. Cada fetcher atiende una lotería a la vez y luego pasa a la
+siguiente, de modo que el navegador se inicia como mucho una vez por fetcher.
+
+Uso:
+    python -m lottery_core.orchestrator                    # todas las loterías
+    python -m lottery_core.orchestrator super_kino nacional --concurrency 2
+"""
+
+import argparse
+import queue
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from .fetchers import FETCH_MODES, RateLimiter, make_fetcher
+from .registry import LOTTERIES, get_lottery
+from .updater import update
+
+DEFAULT_CONCURRENCY = 3  # Loterías que se actualizan a la vez (y fetchers en el grupo)
+
+
+class FetcherPool:
+    """Grupo de fetchers reutilizables que se prestan a una actualización a la vez"""
+
+    def __init__(self, size, mode="auto"):
+        self.mode = mode
+        self.rate_limiter = RateLimiter()  # Compartido: el límite por host vale para todo el grupo
+        self._idle = queue.LifoQueue()
+        self._all = []
+        self._size = size
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Tomar un fetcher libre, creándolo si el grupo aún no está completo"""
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if len(self._all) < self._size:
+                fetcher = make_fetcher(self.mode, rate_limiter=self.rate_limiter)
+                self._all.append(fetcher)
+                return fetcher
+        return self._idle.get()
+
+    def release(self, fetcher):
+        self._idle.put(fetcher)
+
+    def close(self):
+        for fetcher in self._all:
+            fetcher.close()
+        self._all = []
+
+
+def update_all(names=None, concurrency=DEFAULT_CONCURRENCY, mode="auto", page_dates=None):
+    """Actualizar varias loterías compartiendo un grupo de fetchers
+
+    page_dates puede indicar, por lotería, las fechas de las páginas a visitar
+    (lo usa el scheduler para pedir solo los sorteos que faltan).
+
+    Returns:
+        list: Un resumen por lotería con status ('ok', 'al día' o 'error'),
+        new_numbers y seconds
+    """
+    names = names or list(LOTTERIES)
+    page_dates = page_dates or {}
+    concurrency = max(1, min(concurrency, len(names)))
+    pool = FetcherPool(concurrency, mode)
+
+    def run(name):
+        start = time.perf_counter()
+        fetcher = pool.acquire()
+        try:
+            new_numbers = update(name, fetcher=fetcher, page_dates=page_dates.get(name))
+        except Exception as e:
+            print(f"Error durante la actualización de {name}: {e}")
+            new_numbers = None
+        finally:
+            pool.release(fetcher)
+
+        if new_numbers is None:
+            status = "error"
+        elif new_numbers == 0:
+            status = "al día"
+        else:
+            status = "ok"
+        return {"lottery": name, "status": status, "new_numbers": new_numbers or 0,
+                "seconds": time.perf_counter() - start}
+
+    start = time.perf_counter()
+    try:
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            summary = list(executor.map(run, names))
+    finally:
+        pool.close()
+
+    print_summary(summary, time.perf_counter() - start)
+    return summary
+
+
+def print_summary(summary, total_seconds):
+    """Mostrar el resumen consolidado de una ejecución del orquestador"""
+    print("\n" + "=" * 60)
+    print("RESUMEN DE ACTUALIZACIÓN")
+    print("=" * 60)
+    for row in summary:
+        display_name = get_lottery(row["lottery"])["display_name"]
+        print(f"{display_name:<24} {row['status']:<8} {row['new_numbers']:>5} nuevos  {row['seconds']:6.1f} s")
+    print("-" * 60)
+    errors = sum(1 for row in summary if row["status"] == "error")
+    new_numbers = sum(row["new_numbers"] for row in summary)
+    print(f"Loterías: {len(summary)} - con errores: {errors} - números nuevos: {new_numbers}")
+    print(f"Tiempo total: {total_seconds:.1f} s")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Actualizar todas las loterías en un solo proceso")
+    parser.add_argument("lotteries", nargs="*", help="Loterías a actualizar (por defecto todas)")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY,
+                        help="Loterías que se actualizan a la vez")
+    parser.add_argument("--mode", choices=FETCH_MODES, default="auto", help="Cómo descargar las páginas")
+    args = parser.parse_args(sys.argv[1:] if argv is None else argv)
+    summary = update_all(args.lotteries or None, concurrency=args.concurrency, mode=args.mode)
+    return 1 if any(row["status"] == "error" for row in summary) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,164 @@
+"""
+Parejas de números por ventanas de días, mantenidas de forma incremental.
+
+Para cada ventana (7, 30, 90 y 365 días por defecto) se guarda la cola de
+sorteos que caen dentro y un Counter con las veces que salió cada pareja. Un
+sorteo nuevo suma sus parejas a todas las ventanas y, al avanzar la fecha de
+referencia, los sorteos que quedan fuera de una ventana restan las suyas: cada
+sorteo entra y sale una sola vez, en lugar de recorrer todo el historial en
+cada consulta. El ranking de cada ventana se ordena una vez tras cada cambio y
+las consultas lo reutilizan.
+
+El actualizador refresca el archivo json_Datos/draws/<name>.pairs.json tras
+cada ejecución, con los sorteos del último año y el TOP de cada ventana.
+"""
+
+import json
+import os
+from collections import Counter, deque
+from datetime import datetime
+from itertools import combinations
+
+from .dates import from_ordinal, to_ordinal
+from .drawlog import read_draws
+from .registry import get_lottery, pairs_file
+
+WINDOWS = (7, 30, 90, 365)  # Días de cada ventana
+TOP_SAVED = 20  # Parejas por ventana que se guardan en el archivo
+
+
+def draw_pairs(numbers):
+    """Parejas ordenadas de números diferentes de un sorteo (ej: ("05", "12"))"""
+    unique = sorted(set(num for num in numbers if num is not None))
+    return list(combinations(unique, 2))
+
+
+class PairWindows:
+    """Parejas que salieron en los últimos N días, para varias N
+
+    Una ventana de N días contiene los sorteos con daysAgo <= N respecto a la
+    fecha de referencia (today).
+
+    Args:
+        windows: Días de cada ventana
+        lottery: Nombre de la lotería en el registro (solo hace falta para guardar o recalcular)
+    """
+
+    def __init__(self, windows=WINDOWS, lottery=None):
+        self.lottery = get_lottery(lottery) if lottery is not None else None
+        self.windows = tuple(sorted(set(windows)))
+        self.today = None  # Ordinal de la fecha de referencia
+        self.last_ordinal = None  # Ordinal del último sorteo añadido
+        # Ventana -> cola de (ordinal, fecha, números, parejas) de sus sorteos, del más antiguo al más reciente
+        self.queues = {days: deque() for days in self.windows}
+        self.counts = {days: Counter() for days in self.windows}
+        self._ranking = {}  # Ventana -> [(pareja, veces)] ordenado; se descarta cuando cambia la ventana
+
+    @classmethod
+    def from_draws(cls, draws, today=None, windows=WINDOWS, lottery=None):
+        """Calcular las ventanas desde cero a partir de {fecha: números}"""
+        pair_windows = cls(windows, lottery)
+        pair_windows.add_draws(draws.items())
+        pair_windows.advance(today or datetime.now())
+        return pair_windows
+
+    def add_draws(self, draws):
+        """Añadir sorteos nuevos [(fecha, números)] posteriores al último añadido
+
+        Returns:
+            bool: False si algún sorteo no es posterior al último añadido; en
+            ese caso no se aplica nada y hay que recalcular
+        """
+        draws = sorted(draws, key=lambda item: to_ordinal(item[0]))
+        if draws and self.last_ordinal is not None and to_ordinal(draws[0][0]) <= self.last_ordinal:
+            return False
+
+        for date_str, numbers in draws:
+            ordinal = to_ordinal(date_str)
+            entry = (ordinal, date_str, numbers, draw_pairs(numbers))
+            for days in self.windows:
+                if self.today is not None and ordinal < self.today - days:
+                    continue  # Ya está fuera de esta ventana
+                self.queues[days].append(entry)
+                self.counts[days].update(entry[3])
+                self._ranking.pop(days, None)
+            self.last_ordinal = ordinal
+        return True
+
+    def advance(self, today):
+        """Mover la fecha de referencia, sacando de cada ventana los sorteos que ya no entran"""
+        self.today = today.toordinal() if hasattr(today, "toordinal") else today
+        for days in self.windows:
+            queue, counts = self.queues[days], self.counts[days]
+            while queue and queue[0][0] < self.today - days:
+                _, _, _, pairs = queue.popleft()
+                counts.subtract(pairs)
+                for pair in pairs:
+                    if counts[pair] <= 0:
+                        del counts[pair]
+                self._ranking.pop(days, None)
+
+    def update(self, new_draws, today=None):
+        """Añadir sorteos nuevos y avanzar a today; si rellenan fechas antiguas se recalcula desde el registro"""
+        if not self.add_draws(new_draws):
+            print("Sorteos anteriores al último registrado: recalculando parejas desde el registro")
+            draws = read_draws(self.lottery)
+            draws.update(new_draws)
+            self.__init__(self.windows, self.lottery)
+            self.add_draws(draws.items())
+        self.advance(today or datetime.now())
+
+    def top_pairs(self, days, limit=15):
+        """Parejas más repetidas de una ventana: [(pareja, veces)], de más a menos veces"""
+        if days not in self._ranking:
+            self._ranking[days] = sorted(self.counts[days].items(), key=lambda item: (-item[1], item[0]))
+        return self._ranking[days][:limit]
+
+    def pair_count(self, days, pair):
+        """Veces que salió una pareja en una ventana"""
+        return self.counts[days].get(tuple(sorted(pair)), 0)
+
+    def pair_dates(self, days, pair):
+        """Fechas (más reciente primero) en las que salió una pareja dentro de una ventana"""
+        pair = tuple(sorted(pair))
+        return [date_str for _, date_str, _, pairs in reversed(self.queues[days]) if pair in pairs]
+
+    def to_dict(self):
+        longest = self.queues[self.windows[-1]] if self.windows else []
+        return {
+            "lottery": self.lottery["name"] if self.lottery else None,
+            "today": from_ordinal(self.today) if self.today is not None else None,
+            "windows": list(self.windows),
+            "draws": [[date_str, numbers] for _, date_str, numbers, _ in longest],
+            "topPairs": {
+                str(days): [{"pair": f"{pair[0]}-{pair[1]}", "count": count}
+                            for pair, count in self.top_pairs(days, TOP_SAVED)]
+                for days in self.windows
+            },
+        }
+
+
+def load_pair_windows(lottery, today=None):
+    """Cargar las ventanas guardadas (avanzadas a today), calculándolas desde el registro si no existen"""
+    lottery = get_lottery(lottery)
+    try:
+        with open(pairs_file(lottery), 'r', encoding='utf-8') as f:
+            state = json.load(f)
+        pair_windows = PairWindows(state["windows"], lottery)
+        pair_windows.add_draws(state["draws"])
+        if state["today"]:
+            pair_windows.advance(to_ordinal(state["today"]))
+    except (OSError, ValueError, KeyError, TypeError):
+        return PairWindows.from_draws(read_draws(lottery), today, lottery=lottery)
+    pair_windows.advance(today or datetime.now())
+    return pair_windows
+
+
+def save_pair_windows(pair_windows):
+    """Guardar las ventanas junto al registro de sorteos"""
+    path = pairs_file(pair_windows.lottery)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(pair_windows.to_dict(), f, ensure_ascii=False)
+    os.replace(tmp_path, path)
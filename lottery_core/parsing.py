@@ -0,0 +1,50 @@
+def complete_dates(date_texts, page_date):
+    """Añadir el año a las fechas dd-mm de una página a partir de la fecha de la URL"""
+    url_year = page_date.year
+    dates = []
+    for date_text in date_texts:
+        if len(date_text.split('-')) == 3:
+            # Ya tiene año
+            dates.append(date_text)
+            continue
+
+        day, month = map(int, date_text.split('-'))
+
+        # Si la fecha de la URL es enero y encontramos fechas de diciembre,
+        # estas fechas deben ser del año anterior (y al revés para diciembre/enero)
+        if page_date.month == 1 and month == 12:
+            correct_year = url_year - 1
+        elif page_date.month == 12 and month == 1:
+            correct_year = url_year + 1
+        else:
+            correct_year = url_year
+
+        dates.append(f"{date_text}-{correct_year}")
+    return dates
+
+
+def clean_numbers(raw_numbers, positions):
+    """Validar los textos de un bloque y devolverlos con 2 dígitos (o None si no son válidos)"""
+    if len(raw_numbers) < positions:
+        return None
+
+    drawn_numbers = [num.strip() for num in raw_numbers[:positions]]
+    for num in drawn_numbers:
+        if not (num.isdigit() and len(num) <= 2):
+            print(f"    Número inválido: '{num}'")
+            return None
+
+    return [num.zfill(2) for num in drawn_numbers]
+
+
+def page_draws(date_texts, blocks, page_date, positions):
+    """Emparejar fechas y bloques de una página y devolver [(fecha completa, números)]"""
+    dates = complete_dates(date_texts, page_date)
+    draws = []
+    for i in range(min(len(dates), len(blocks))):
+        drawn_numbers = clean_numbers(blocks[i], positions)
+        if drawn_numbers is None:
+            continue
+        print(f"  Bloque #{i+1} - Fecha: {dates[i]} - Números: {', '.join(drawn_numbers)}")
+        draws.append((dates[i], drawn_numbers))
+    return draws
@@ -0,0 +1,135 @@
+import os
+
+# Rutas del proyecto
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+JSON_DIR = os.path.join(PROJECT_DIR, "json_Datos")
+
+# Valores comunes a todas las loterías (cada entrada del registro puede sobrescribirlos)
+DEFAULTS = {
+    "base_url": "https://loteriasdominicanas.com/",  # Dominio de donde se obtienen los resultados
+    "date_selector": ".session-date.px-2",  # Selector CSS de las fechas de cada sorteo
+    "block_selector": ".game-scores.p-2.ball-mode",  # Selector CSS de los bloques de números
+    "score_selector": "span.score",  # Selector CSS de cada número dentro de un bloque
+    "total_iterations": 200,  # Número de iteraciones (páginas a visitar) del scraper completo
+    "days_to_go_back": 8,  # Días a retroceder entre cada iteración (cada página muestra ~8 fechas)
+    "overwrite_existing": False,  # Si el actualizador reemplaza un sorteo ya registrado en lugar de saltarlo
+    "draw_days": (0, 1, 2, 3, 4, 5, 6),  # Días de sorteo (lunes=0 ... domingo=6)
+    "draw_time": "21:00",  # Hora aproximada del sorteo (hora de República Dominicana)
+    "sunday_draw_time": None,  # Hora del sorteo del domingo si es distinta
+}
+
+# Registro de loterías: una entrada por juego con las constantes que antes
+# estaban copiadas en cada *_scrapper.py
+#   name          -> Nombre para el archivo JSON (sin espacios ni caracteres especiales)
+#   url_param     -> Parámetro para la URL (se añade a base_url)
+#   display_name  -> Nombre para mostrar en la salida
+#   positions     -> Número de posiciones por sorteo
+#   min_number    -> Número mínimo (algunas loterías comienzan desde 1 en lugar de 0)
+#   max_number    -> Número máximo
+#   overwrite_existing -> Las quinielas y Super Palé reemplazan el último sorteo si ya estaba registrado
+#   draw_days / draw_time / sunday_draw_time -> Calendario de sorteos que usa el scheduler
+_LOTTERY_TABLE = [
+    {"name": "nacional", "url_param": "loteria-nacional/quiniela", "display_name": "nacional",
+     "positions": 3, "min_number": 0, "max_number": 99,
+     "draw_time": "21:00", "sunday_draw_time": "18:00"},
+    {"name": "gana_mas", "url_param": "loteria-nacional/gana-mas", "display_name": "Gana Más",
+     "positions": 3, "min_number": 0, "max_number": 99, "draw_time": "14:30"},
+    {"name": "juega_mas_pega", "url_param": "loteria-nacional/juega-mas-pega-mas", "display_name": "juega + pega",
+     "positions": 5, "min_number": 1, "max_number": 26, "draw_time": "14:30"},
+    {"name": "Quiniela_Pale", "url_param": "leidsa/quiniela-pale", "display_name": "Quiniela Pale",
+     "positions": 3, "min_number": 0, "max_number": 99, "overwrite_existing": True,
+     "draw_time": "20:55", "sunday_draw_time": "15:55"},
+    {"name": "super_pale", "url_param": "/loterias/leidsa/super-pale", "display_name": "Super Palé",
+     "positions": 2, "min_number": 0, "max_number": 99, "overwrite_existing": True,
+     "draw_time": "20:55", "sunday_draw_time": "15:55",
+     # Super Palé se obtiene de conectate.com.do, que usa otros selectores para fechas y bloques
+     "base_url": "https://www.conectate.com.do",
+     "date_selector": ".session-date.session-badge",
+     "block_selector": ".game-scores.ball-mode"},
+    {"name": "Pega_3_Mas", "url_param": "leidsa/pega-3-mas", "display_name": "Pega 3 Más",
+     "positions": 3, "min_number": 0, "max_number": 50,
+     "draw_time": "20:55", "sunday_draw_time": "15:55"},
+    {"name": "Loto_Super_Loto_Mas", "url_param": "leidsa/loto-mas", "display_name": "Loto - Super Loto Más",
+     "positions": 8, "min_number": 1, "max_number": 40,
+     "draw_days": (2, 5), "draw_time": "20:55"},  # Solo miércoles y sábados
+    {"name": "loto_Pool", "url_param": "leidsa/loto-pool", "display_name": "Loto Pool",
+     "positions": 5, "min_number": 1, "max_number": 31,
+     "draw_time": "20:55", "sunday_draw_time": "15:55"},
+    {"name": "super_kino", "url_param": "leidsa/super-kino-tv", "display_name": "super kino tv",
+     "positions": 20, "min_number": 1, "max_number": 80,
+     "draw_time": "20:55", "sunday_draw_time": "15:55"},
+    {"name": "Quiniela_Real", "url_param": "loto-real/quiniela", "display_name": "Quiniela Real",
+     "positions": 3, "min_number": 0, "max_number": 99, "overwrite_existing": True,
+     "draw_time": "12:55"},
+    {"name": "quiniela_loteka", "url_param": "loteka/quiniela-mega-decenas", "display_name": "Quiniela Loteka",
+     "positions": 3, "min_number": 0, "max_number": 99, "overwrite_existing": True,
+     "draw_time": "19:55"},
+    {"name": "primera_dia", "url_param": "la-primera/quiniela-medio-dia", "display_name": "La Primera",
+     "positions": 3, "min_number": 0, "max_number": 99, "draw_time": "12:00"},
+    {"name": "primera_noche", "url_param": "la-primera/quiniela-noche", "display_name": "La Primera Noche",
+     "positions": 3, "min_number": 0, "max_number": 99, "total_iterations": 150,
+     "draw_time": "20:00"},
+    {"name": "suerte_dia", "url_param": "la-suerte-dominicana/quiniela", "display_name": "La Suerte 12:30",
+     "positions": 3, "min_number": 0, "max_number": 99, "draw_time": "12:30"},
+    {"name": "suerte_noche", "url_param": "la-suerte-dominicana/quiniela-tarde", "display_name": "La Suerte 18:00",
+     "positions": 3, "min_number": 0, "max_number": 99, "total_iterations": 128,
+     "draw_time": "18:00"},
+]
+
+LOTTERIES = {entry["name"]: {**DEFAULTS, **entry} for entry in _LOTTERY_TABLE}
+
+# Nombres de las posiciones tal como se guardan en el JSON
+POSITION_NAMES = ["first", "second", "third", "fourth", "fifth", "sixth"]
+
+
+def get_lottery(lottery):
+    """Devolver la configuración de una lotería a partir de su nombre (o la propia configuración)"""
+    if isinstance(lottery, dict):
+        return lottery
+    try:
+        return LOTTERIES[lottery]
+    except KeyError:
+        raise KeyError(f"Lotería desconocida: '{lottery}'. Disponibles: {', '.join(LOTTERIES)}")
+
+
+def position_key(pos):
+    """Nombre de la clave de posición (1-indexada) usada en el JSON"""
+    if pos <= len(POSITION_NAMES):
+        return POSITION_NAMES[pos - 1]
+    return f"position_{pos}"
+
+
+def json_file(lottery):
+    """Ruta del archivo JSON de datos de una lotería"""
+    return os.path.join(JSON_DIR, f"lottery_data_{get_lottery(lottery)['name']}.json")
+
+
+def draw_log_file(lottery):
+    """Ruta del registro de sorteos (un sorteo por línea) de una lotería"""
+    return os.path.join(JSON_DIR, "draws", f"{get_lottery(lottery)['name']}.jsonl")
+
+
+def stats_file(lottery):
+    """Ruta de las estadísticas por número guardadas junto al registro de sorteos"""
+    return os.path.join(JSON_DIR, "draws", f"{get_lottery(lottery)['name']}.stats.json")
+
+
+def pairs_file(lottery):
+    """Ruta de las parejas por ventana de días guardadas junto al registro de sorteos"""
+    return os.path.join(JSON_DIR, "draws", f"{get_lottery(lottery)['name']}.pairs.json")
+
+
+def draw_db_file():
+    """Ruta de la base de datos SQLite con los sorteos de todas las loterías"""
+    return os.path.join(JSON_DIR, "draws", "draws.sqlite3")
+
+
+def scheduler_file():
+    """Ruta del estado del scheduler (sorteos dados por perdidos) junto a los registros de sorteos"""
+    return os.path.join(JSON_DIR, "draws", "scheduler.json")
+
+
+def build_url(lottery, url_date):
+    """Construir la URL de resultados de una lotería para una fecha dd-mm-YYYY"""
+    lottery = get_lottery(lottery)
+    return f"{lottery['base_url']}{lottery['url_param']}?date={url_date}"
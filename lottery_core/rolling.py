@@ -0,0 +1,121 @@
+"""
+Frecuencia de cada número en ventanas móviles de sorteos, con sumas prefijas.
+
+prefix[t] guarda cuántas veces salió cada número en los t primeros sorteos
+(orden cronológico), así que la frecuencia en los W sorteos anteriores a t es
+prefix[t] - prefix[t - W]: una resta de un vector por consulta en lugar de
+volver a contar el historial. Las frecuencias de todas las fechas a la vez
+son una resta de dos matrices y el TOP k de cada fecha un argpartition por
+filas. Lo usan el simulador de números calientes del Super Kino, el backtest
+(lottery_core.backtest) y las salidas de frecuencia de los actualizadores.
+"""
+
+import numpy as np
+
+from .dates import to_ordinal
+from .numbers import FREQUENCY_WINDOWS
+from .registry import get_lottery
+
+WINDOWS = FREQUENCY_WINDOWS  # Sorteos de cada ventana en el JSON (frequencyRankings)
+TOP_SAVED = 10  # Números por ranking que se guardan en el JSON
+
+
+class RollingFrequency:
+    """Sumas prefijas de apariciones por número
+
+    Args:
+        one_hot: Matriz (n_sorteos, size) de presencia de cada número, del sorteo más antiguo al más reciente
+        ordinals: Ordinal de día de cada sorteo (para consultar por fecha)
+    """
+
+    def __init__(self, one_hot, ordinals=None):
+        one_hot = np.asarray(one_hot)
+        self.prefix = np.zeros((len(one_hot) + 1, one_hot.shape[1]), dtype=np.int32)
+        np.cumsum(one_hot, axis=0, out=self.prefix[1:])
+        self.ordinals = ordinals
+
+    @classmethod
+    def from_matrix(cls, matrix, size=None):
+        """Sumas prefijas de una DrawMatrix (lottery_core.matrix)"""
+        return cls(matrix.one_hot(size), matrix.ordinals)
+
+    def __len__(self):
+        return len(self.prefix) - 1
+
+    def as_of(self, ordinal):
+        """Sorteos anteriores a una fecha (ordinal de día): el t para consultar "a esa fecha" """
+        return int(np.searchsorted(self.ordinals, ordinal, side="left"))
+
+    def counts(self, t, window=None):
+        """Apariciones de cada número en los window sorteos anteriores al sorteo t (None o 0 = todos)"""
+        start = max(t - window, 0) if window else 0
+        return self.prefix[t] - self.prefix[start]
+
+    def counts_matrix(self, window=None, start=0):
+        """Frecuencias para cada t de start a len(self): matriz (len(self) + 1 - start, size)"""
+        ends = np.arange(start, len(self) + 1)
+        if not window:
+            return self.prefix[start:]
+        return self.prefix[ends] - self.prefix[np.maximum(ends - window, 0)]
+
+    def top_k(self, k, window=None, start=0, numbers=None, coldest=False):
+        """Los k números más (o menos) frecuentes en la ventana anterior a cada t
+
+        A igual frecuencia va primero el número más bajo.
+
+        Args:
+            numbers: Columnas que cuentan (por defecto todas)
+            coldest: Los menos frecuentes en lugar de los más frecuentes
+
+        Returns:
+            numpy.ndarray: Matriz (len(self) + 1 - start, k) de números, del
+            primero al último del ranking
+        """
+        counts = self.counts_matrix(window, start)
+        numbers = np.arange(counts.shape[1]) if numbers is None else np.asarray(numbers)
+        counts = counts[:, numbers].astype(np.int64)
+        size = len(numbers)
+        # Una sola clave por número: frecuencia y, a igualdad, el número más bajo
+        keys = (-counts if coldest else counts) * size + (size - 1 - np.arange(size))
+        k = min(k, size)
+        if k < size:
+            chosen = np.argpartition(-keys, k - 1, axis=1)[:, :k]
+        else:
+            chosen = np.broadcast_to(np.arange(size), keys.shape)
+        order = np.argsort(-np.take_along_axis(keys, chosen, axis=1), axis=1)
+        return numbers[np.take_along_axis(chosen, order, axis=1)]
+
+
+def frequency_rankings(lottery, draws, windows=WINDOWS, limit=TOP_SAVED):
+    """Números más y menos frecuentes en los últimos sorteos, en el formato del JSON
+
+    Args:
+        lottery: Nombre de la lotería en el registro (o su configuración)
+        draws: {fecha: números} (como read_draws); basta con los de la ventana más larga
+
+    Returns:
+        dict: {"30": {"draws": 30, "hottest": [{"number", "count"}], "coldest": [...]}, ...}
+    """
+    lottery = get_lottery(lottery)
+    # Solo hacen falta los sorteos de la ventana más larga
+    recent = sorted(draws.items(), key=lambda item: to_ordinal(item[0]))[-max(windows, default=0):]
+    rows = [[int(num) for num in numbers if num is not None] for _, numbers in recent]
+    one_hot = np.zeros((len(rows), lottery["max_number"] + 1), dtype=bool)
+    for index, row in enumerate(rows):
+        one_hot[index, row] = True
+    rolling = RollingFrequency(one_hot)
+    numbers = np.arange(lottery["min_number"], lottery["max_number"] + 1)
+
+    rankings = {}
+    for window in windows:
+        counts = rolling.counts(len(rolling), window)
+
+        def as_entries(ranked):
+            return [{"number": f"{num:02d}", "count": int(counts[num])} for num in ranked.tolist()]
+
+        rankings[str(window)] = {
+            "draws": min(window, len(rolling)),
+            "hottest": as_entries(rolling.top_k(limit, window, len(rolling), numbers)[0]),
+            "coldest": as_entries(rolling.top_k(limit, window, len(rolling), numbers, coldest=True)[0]),
+        }
+    return rankings
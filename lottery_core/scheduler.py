@@ -0,0 +1,278 @@
+"""
+Scheduler de actualizaciones según el calendario de sorteos.
+
+En lugar de lanzar todos los actualizadores cada cierto tiempo desde un cron,
+cada lotería se actualiza solo poco después de su sorteo (draw_days/draw_time
+en el registro) y solo se piden las páginas que contienen las fechas de sorteo
+que faltan en su JSON. Las loterías que ya están al día no se tocan.
+
+Las horas de sorteo del registro son de República Dominicana, así que todas
+las comparaciones se hacen en esa zona horaria (TIMEZONE), sea cual sea la
+hora local del equipo. Los sorteos cuyo resultado no apareció a tiempo se
+guardan en json_Datos/draws/scheduler.json para que --once (cron) tampoco
+los vuelva a pedir en cada pasada.
+
+Uso:
+    python -m lottery_core.scheduler            # servicio: duerme hasta el próximo sorteo
+    python -m lottery_core.scheduler --once     # una pasada (para cron)
+    python -m lottery_core.scheduler --status   # mostrar qué falta en cada lotería
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import date, datetime, timedelta, timezone
+
+from .dates import to_ordinal
+from .drawlog import read_recent_draws
+from .fetchers import FETCH_MODES
+from .orchestrator import DEFAULT_CONCURRENCY, update_all
+from .registry import LOTTERIES, get_lottery, json_file, scheduler_file
+from .updater import MAX_ITERATIONS
+
+try:
+    from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+    TIMEZONE = ZoneInfo("America/Santo_Domingo")
+except (ImportError, ZoneInfoNotFoundError):
+    # Sin base de zonas horarias (Windows sin tzdata): República Dominicana está en UTC-4 todo el año
+    TIMEZONE = timezone(timedelta(hours=-4), "AST")
+
+RESULTS_DELAY = timedelta(minutes=20)  # Tiempo tras el sorteo hasta que el resultado suele estar publicado
+RETRY_INTERVAL = timedelta(minutes=10)  # Espera entre reintentos si el resultado aún no aparece
+MAX_RESULT_WAIT = timedelta(hours=3)  # Tras este tiempo sin resultado se espera al siguiente sorteo
+LOOKBACK_DAYS = 30  # Días hacia atrás que se revisan si el JSON no tiene fecha de último sorteo
+
+
+def local_now(now=None):
+    """Fecha y hora en República Dominicana (un now sin zona horaria se toma como hora de allí)"""
+    if now is None:
+        return datetime.now(TIMEZONE)
+    if now.tzinfo is None:
+        return now.replace(tzinfo=TIMEZONE)
+    return now.astimezone(TIMEZONE)
+
+
+def _draw_time(lottery, day):
+    """Hora del sorteo de una lotería en un día dado (hora de República Dominicana)"""
+    draw_time = lottery["draw_time"]
+    if day.weekday() == 6 and lottery["sunday_draw_time"]:
+        draw_time = lottery["sunday_draw_time"]
+    hour, minute = (int(part) for part in draw_time.split(":"))
+    return datetime(day.year, day.month, day.day, hour, minute, tzinfo=TIMEZONE)
+
+
+def draw_datetimes(lottery, start, end):
+    """Fechas y horas de los sorteos de una lotería entre dos días (ambos incluidos)"""
+    lottery = get_lottery(lottery)
+    draws = []
+    day = start
+    while day <= end:
+        if day.weekday() in lottery["draw_days"]:
+            draws.append(_draw_time(lottery, day))
+        day += timedelta(days=1)
+    return draws
+
+
+def next_draw(lottery, now):
+    """Primer sorteo de la lotería posterior a now"""
+    lottery = get_lottery(lottery)
+    now = local_now(now)
+    draws = draw_datetimes(lottery, now.date(), now.date() + timedelta(days=7))
+    return next(draw for draw in draws if draw > now)
+
+
+def latest_recorded_date(lottery):
+    """Fecha del último sorteo guardado (None si no hay registro ni JSON con fecha válida)"""
+    draws = read_recent_draws(lottery, 1)
+    if draws:
+        return date.fromordinal(to_ordinal(next(iter(draws))))
+    try:
+        with open(json_file(lottery), 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        return date.fromordinal(to_ordinal(data["winningNumbers"][0]["date"].split(" ")[0]))
+    except (OSError, ValueError, KeyError, IndexError):
+        return None
+
+
+def missing_draw_dates(lottery, latest, now):
+    """Sorteos posteriores a latest cuyo resultado ya debería estar publicado, del más reciente al más antiguo"""
+    lottery = get_lottery(lottery)
+    now = local_now(now)
+    start = latest + timedelta(days=1) if latest else now.date() - timedelta(days=LOOKBACK_DAYS)
+    draws = draw_datetimes(lottery, start, now.date())
+    return [draw.date() for draw in reversed(draws) if draw + RESULTS_DELAY <= now]
+
+
+def pages_for_dates(missing_dates, days_per_page):
+    """Fechas de URL mínimas para cubrir los sorteos que faltan
+
+    La página de una fecha muestra los sorteos de esa fecha y de los
+    days_per_page - 1 días anteriores, así que cada página se pide para el
+    sorteo pendiente más reciente que aún no está cubierto.
+    """
+    pages = []
+    for day in sorted(missing_dates, reverse=True):
+        if pages and day > pages[-1] - timedelta(days=days_per_page):
+            continue
+        pages.append(day)
+    return [datetime(day.year, day.month, day.day) for day in pages[:MAX_ITERATIONS]]
+
+
+def lottery_status(lottery, now, given_up=None):
+    """Estado de una lotería para el scheduler
+
+    Returns:
+        dict: name, latest, missing (fechas pendientes), pages (fechas de URL
+        a pedir), due (si hay que actualizarla ahora) y next_draw
+    """
+    lottery = get_lottery(lottery)
+    now = local_now(now)
+    latest = latest_recorded_date(lottery)
+    missing = missing_draw_dates(lottery, latest, now)
+    # Si el último sorteo pendiente ya se dio por perdido, esperar al siguiente
+    due = bool(missing) and (given_up or {}).get(lottery["name"]) != missing[0]
+    return {
+        "name": lottery["name"],
+        "latest": latest,
+        "missing": missing,
+        "pages": pages_for_dates(missing, lottery["days_to_go_back"]),
+        "due": due,
+        "next_draw": next_draw(lottery, now),
+    }
+
+
+def due_lotteries(now, names=None, given_up=None):
+    """Estados de las loterías que tienen sorteos pendientes de descargar"""
+    statuses = [lottery_status(name, now, given_up) for name in names or LOTTERIES]
+    return [status for status in statuses if status["due"]]
+
+
+def load_given_up():
+    """Sorteos dados por perdidos en pasadas anteriores: {lotería: fecha}"""
+    try:
+        with open(scheduler_file(), 'r', encoding='utf-8') as f:
+            return {name: date.fromordinal(to_ordinal(day)) for name, day in json.load(f).items()}
+    except (OSError, ValueError, AttributeError):
+        return {}
+
+
+def save_given_up(given_up):
+    """Guardar los sorteos dados por perdidos para las próximas pasadas"""
+    path = scheduler_file()
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({name: day.strftime("%d-%m-%Y") for name, day in given_up.items()}, f, indent=2)
+
+
+def run_due(now=None, names=None, mode="auto", concurrency=DEFAULT_CONCURRENCY, given_up=None):
+    """Actualizar solo las loterías con sorteos pendientes y solo las páginas necesarias
+
+    Returns:
+        list: Resumen del orquestador ([] si no había nada que actualizar)
+    """
+    now = local_now(now)
+    due = due_lotteries(now, names, given_up)
+    if not due:
+        print(f"{now.strftime('%d-%m-%Y %H:%M')} - Todas las loterías están al día.")
+        return []
+
+    for status in due:
+        print(f"{status['name']}: {len(status['missing'])} sorteo(s) pendiente(s), "
+              f"{len(status['pages'])} página(s) a descargar")
+    return update_all([status["name"] for status in due], concurrency=concurrency, mode=mode,
+                      page_dates={status["name"]: status["pages"] for status in due})
+
+
+def give_up_late_draws(now, names, given_up):
+    """Dar por perdidos los sorteos pendientes que superaron MAX_RESULT_WAIT
+
+    Returns:
+        bool: Si queda algún sorteo pendiente al que todavía hay que esperar
+    """
+    now = local_now(now)
+    pending = False
+    for status in due_lotteries(now, names, given_up):
+        newest = status["missing"][0]
+        if now - _draw_time(get_lottery(status["name"]), newest) > MAX_RESULT_WAIT:
+            print(f"{status['name']}: sin resultado del {newest.strftime('%d-%m-%Y')}, "
+                  f"se esperará al próximo sorteo")
+            given_up[status["name"]] = newest
+        else:
+            pending = True
+    return pending
+
+
+def run_once(names=None, mode="auto", concurrency=DEFAULT_CONCURRENCY):
+    """Una pasada (cron): actualizar lo pendiente recordando entre pasadas los sorteos dados por perdidos"""
+    given_up = load_given_up()
+    summary = run_due(names=names, mode=mode, concurrency=concurrency, given_up=given_up)
+    give_up_late_draws(local_now(), names, given_up)
+    save_given_up(given_up)
+    return summary
+
+
+def next_wakeup(now, names=None, pending=False):
+    """Momento del próximo intento: el siguiente sorteo más el retraso de publicación
+
+    Si quedan resultados pendientes se reintenta antes, tras RETRY_INTERVAL.
+    """
+    now = local_now(now)
+    wakeup = min(next_draw(name, now) + RESULTS_DELAY for name in names or LOTTERIES)
+    if pending:
+        wakeup = min(wakeup, now + RETRY_INTERVAL)
+    return wakeup
+
+
+def serve(names=None, mode="auto", concurrency=DEFAULT_CONCURRENCY):
+    """Bucle del servicio: actualizar lo pendiente y dormir hasta el próximo sorteo"""
+    given_up = load_given_up()  # Lotería -> sorteo pendiente cuyo resultado no apareció a tiempo
+    while True:
+        run_due(names=names, mode=mode, concurrency=concurrency, given_up=given_up)
+
+        now = local_now()
+        pending = give_up_late_draws(now, names, given_up)
+        save_given_up(given_up)
+
+        wakeup = next_wakeup(now, names, pending)
+        print(f"Próxima revisión: {wakeup.strftime('%d-%m-%Y %H:%M')} (hora de República Dominicana)")
+        time.sleep(max(0, (wakeup - local_now()).total_seconds()))
+
+
+def print_status(now, names=None):
+    """Mostrar el último sorteo guardado, lo pendiente y el próximo sorteo de cada lotería"""
+    print(f"{'Lotería':<24} {'Último':<11} {'Faltan':>6} {'Páginas':>7}  Próximo sorteo")
+    for name in names or LOTTERIES:
+        status = lottery_status(name, now)
+        latest = status["latest"].strftime("%d-%m-%Y") if status["latest"] else "-"
+        print(f"{get_lottery(name)['display_name']:<24} {latest:<11} {len(status['missing']):>6} "
+              f"{len(status['pages']):>7}  {status['next_draw'].strftime('%d-%m-%Y %H:%M')}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Actualizar las loterías según su calendario de sorteos")
+    parser.add_argument("lotteries", nargs="*", help="Loterías a vigilar (por defecto todas)")
+    parser.add_argument("--once", action="store_true", help="Hacer una sola pasada y salir")
+    parser.add_argument("--status", action="store_true", help="Mostrar el estado sin descargar nada")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY,
+                        help="Loterías que se actualizan a la vez")
+    parser.add_argument("--mode", choices=FETCH_MODES, default="auto", help="Cómo descargar las páginas")
+    args = parser.parse_args(sys.argv[1:] if argv is None else argv)
+    names = args.lotteries or None
+
+    if args.status:
+        print_status(local_now(), names)
+        return 0
+    if args.once:
+        summary = run_once(names=names, mode=args.mode, concurrency=args.concurrency)
+        return 1 if any(row["status"] == "error" for row in summary) else 0
+    try:
+        serve(names, mode=args.mode, concurrency=args.concurrency)
+    except KeyboardInterrupt:
+        print("\nScheduler detenido.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,257 @@
+"""
+Motor de scraping común a todas las loterías.
+
+Reemplaza a los *_scrapper.py copiados en cada carpeta: la configuración de
+cada juego vive en registry.LOTTERIES y todas usan el mismo ciclo de páginas,
+el mismo análisis de bloques y la misma escritura del JSON.
+
+Uso:
+    python -m lottery_core.scraper super_kino nacional
+    python -m lottery_core.scraper                 # todas las loterías
+    python -m lottery_core.scraper --mode browser  # forzar Chrome en lugar de HTTP
+    python -m lottery_core.scraper --workers 8     # más descargas simultáneas
+"""
+
+import argparse
+import json
+import os
+import sys
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from .dates import DATE_FORMAT, from_ordinal, to_ordinal
+from .drawdb import store_draws
+from .drawlog import write_draws
+from .fetchers import FETCH_MODES, make_fetcher
+from .numbers import (add_draw, frequency_rankings_entries, hot_cold_numbers, new_numbers_data,
+                      overdue_numbers_entries, repeated_numbers, winning_numbers_entries)
+from .pairs import PairWindows, save_pair_windows
+from .parsing import page_draws
+from .registry import LOTTERIES, build_url, get_lottery, json_file
+from .stats import NumberStats, save_stats
+
+
+BACKFILL_WORKERS = 4  # Páginas que se descargan a la vez durante el scraping histórico
+
+
+def page_dates(start_date, iterations, days_to_go_back):
+    """Fechas de URL de cada iteración, de la más reciente a la más antigua"""
+    return [start_date - timedelta(days=days_to_go_back * k) for k in range(iterations)]
+
+
+def fetch_pages(lottery, dates, fetcher, workers=BACKFILL_WORKERS):
+    """Descargar las páginas de las fechas dadas con un grupo acotado de hilos
+
+    Las URLs se conocen de antemano, así que se piden en paralelo (el límite de
+    peticiones por host lo aplica el fetcher). Los resultados se devuelven en el
+    mismo orden que las fechas, a medida que están disponibles.
+    """
+    lottery = get_lottery(lottery)
+
+    def fetch_one(page_date):
+        return fetcher.fetch(build_url(lottery, page_date.strftime(DATE_FORMAT)), lottery)
+
+    if workers <= 1:
+        for page_date in dates:
+            yield fetch_one(page_date)
+        return
+
+    executor = ThreadPoolExecutor(max_workers=workers)
+    try:
+        yield from executor.map(fetch_one, dates)
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def scrape(lottery, fetcher=None, iterations=None, output_file=None, mode="auto", workers=BACKFILL_WORKERS):
+    """Recorrer el historial de una lotería y guardar el JSON completo
+
+    Args:
+        lottery: Nombre de la lotería en el registro (o su configuración)
+        fetcher: Fetcher compartido; si no se pasa se crea uno propio y se cierra al final
+        iterations: Número de páginas a visitar (por defecto total_iterations del registro)
+        output_file: Ruta del JSON de salida (por defecto json_Datos/lottery_data_<name>.json)
+        mode: Modo del fetcher propio ('auto', 'http' o 'browser'), ver fetchers.make_fetcher
+        workers: Páginas que se descargan en paralelo (1 = secuencial)
+
+    Returns:
+        dict: Los datos guardados en el JSON
+    """
+    lottery = get_lottery(lottery)
+    total_iterations = iterations or lottery["total_iterations"]
+    days_to_go_back = lottery["days_to_go_back"]
+    output_file = output_file or json_file(lottery)
+
+    own_fetcher = fetcher is None
+    if own_fetcher:
+        fetcher = make_fetcher(mode)
+
+    try:
+        numbers_data = new_numbers_data(lottery)
+
+        # Número -> lista de fechas de aparición en los últimos 30 días
+        last_30_days_occurrences = defaultdict(list)
+
+        # Números ganadores más recientes
+        latest_winning_numbers = []
+        latest_winning_ordinal = None
+
+        # Fecha inicial (hoy); las comparaciones se hacen con ordinales de día
+        today = datetime.now()
+        today_ordinal = today.toordinal()
+        thirty_days_ago = today_ordinal - 30  # Cuentan los sorteos posteriores a este día
+
+        total_numbers_found = 0
+        draws_by_date = {}  # Un registro por sorteo para el registro de sorteos
+
+        print(f"Iniciando análisis de {lottery['display_name']} con {total_iterations} iteraciones...")
+        print(f"Fecha actual: {today.strftime('%d-%m-%Y')}")
+        print(f"Contando repeticiones desde: {from_ordinal(thirty_days_ago)}")
+
+        dates = page_dates(today, total_iterations, days_to_go_back)
+        pages = fetch_pages(lottery, dates, fetcher, workers)
+
+        # Las páginas se procesan en orden de fecha aunque se descarguen en paralelo
+        for iteration, (current_date, (date_texts, blocks)) in enumerate(zip(dates, pages), 1):
+            print(f"\nIteración {iteration}/{total_iterations} - Fecha: {current_date.strftime('%d-%m-%Y')}")
+            print(f"Encontradas {len(date_texts)} fechas sin año: {date_texts}")
+            print(f"Encontrados {len(blocks)} bloques de juego")
+
+            if len(date_texts) == 0 or len(blocks) == 0:
+                print("No se encontraron suficientes elementos en esta página.")
+                continue
+
+            draws = page_draws(date_texts, blocks, current_date, lottery["positions"])
+
+            for i, (complete_date, drawn_numbers) in enumerate(draws):
+                try:
+                    draw_ordinal = to_ordinal(complete_date)
+                except ValueError as e:
+                    print(f"    Error procesando la fecha '{complete_date}': {str(e)}")
+                    continue
+
+                # Guardar los números ganadores del primer bloque de la primera iteración
+                if iteration == 1 and i == 0:
+                    if latest_winning_ordinal is None or draw_ordinal > latest_winning_ordinal:
+                        latest_winning_numbers = drawn_numbers
+                        latest_winning_ordinal = draw_ordinal
+                        print(f"Números ganadores más recientes actualizados: {', '.join(drawn_numbers)} ({complete_date})")
+
+                draws_by_date.setdefault(complete_date, drawn_numbers)
+                total_numbers_found += add_draw(numbers_data, complete_date, drawn_numbers, draw_ordinal, today_ordinal)
+
+                # Registrar ocurrencia para conteo de últimos 30 días
+                if draw_ordinal > thirty_days_ago:
+                    for num in drawn_numbers:
+                        if num in numbers_data and complete_date not in last_30_days_occurrences[num]:
+                            last_30_days_occurrences[num].append(complete_date)
+
+            print(f"Procesados {len(draws)} bloques en esta iteración")
+
+        numbers_with_data = sum(1 for data in numbers_data.values() if data["lastSeen"] is not None)
+
+        print("\n--- RESULTADOS FINALES ---")
+        print(f"Total de números encontrados: {total_numbers_found}")
+        print(f"Números con al menos una aparición: {numbers_with_data} de {len(numbers_data)}")
+
+        coldest, hottest = hot_cold_numbers(numbers_data)
+        output_data = {
+            "lotteryName": lottery["display_name"],
+            "lastUpdated": today.strftime("%d-%m-%Y %H:%M:%S"),
+            "totalProcessed": total_numbers_found,
+            "numbersWithData": numbers_with_data,
+            "analysisPeriod": total_iterations * days_to_go_back,  # Período de análisis en días
+            "totalIterations": total_iterations,
+            "daysPerIteration": days_to_go_back,
+            "positionsCount": lottery["positions"],
+            "numbers": numbers_data,
+            "repeatedInLast30Days": repeated_numbers(last_30_days_occurrences),
+            "coldestNumbers": coldest,
+            "hottestNumbers": hottest,
+            "winningNumbers": []
+        }
+
+        if latest_winning_numbers and latest_winning_ordinal:
+            winning_date_str = from_ordinal(latest_winning_ordinal)
+            output_data["winningNumbers"] = winning_numbers_entries(latest_winning_numbers, winning_date_str)
+            print(f"Números ganadores añadidos al JSON: {latest_winning_numbers} ({winning_date_str})")
+
+        rankings = frequency_rankings_entries(lottery, draws_by_date)
+        if rankings is not None:
+            output_data["frequencyRankings"] = rankings
+        overdue = overdue_numbers_entries(lottery, draws_by_date, today)
+        if overdue is not None:
+            output_data["overdueNumbers"] = overdue
+
+        os.makedirs(os.path.dirname(output_file), exist_ok=True)
+        with open(output_file, 'w', encoding='utf-8') as f:
+            json.dump(output_data, f, indent=2, ensure_ascii=False)
+
+        # El registro de sorteos solo se reescribe cuando se genera el JSON por defecto de la lotería
+        if output_file == json_file(lottery):
+            write_draws(lottery, draws_by_date)
+            store_draws(lottery, draws_by_date.items(), replace=True)
+            save_stats(NumberStats.from_draws(lottery, draws_by_date))
+            save_pair_windows(PairWindows.from_draws(draws_by_date, lottery=lottery))
+            print(f"Registro de sorteos guardado con {len(draws_by_date)} sorteos")
+
+        print(f"\nDatos guardados en '{output_file}'")
+        print(f"¡Análisis de {lottery['display_name']} completado con éxito!")
+        return output_data
+
+    finally:
+        if own_fetcher:
+            fetcher.close()
+
+
+def scrape_all(names=None, fetcher=None, mode="auto", workers=BACKFILL_WORKERS):
+    """Ejecutar el scraper de varias loterías compartiendo un único fetcher
+
+    Returns:
+        dict: nombre -> True/False según si el scraping terminó correctamente
+    """
+    names = names or list(LOTTERIES)
+    own_fetcher = fetcher is None
+    if own_fetcher:
+        fetcher = make_fetcher(mode)
+
+    results = {}
+    try:
+        for name in names:
+            print(f"\n=== {get_lottery(name)['display_name']} ===")
+            try:
+                scrape(name, fetcher=fetcher, workers=workers)
+                results[name] = True
+            except Exception as e:
+                print(f"Error general: {e}")
+                results[name] = False
+    finally:
+        if own_fetcher:
+            fetcher.close()
+
+    print("\n--- RESUMEN ---")
+    for name, ok in results.items():
+        print(f"{name}: {'OK' if ok else 'ERROR'}")
+    return results
+
+
+def run_single(name, mode="auto"):
+    """Punto de entrada de los scripts *_scrapper.py de cada carpeta"""
+    try:
+        scrape(name, mode=mode)
+    except Exception as e:
+        print(f"Error general: {e}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Scraper histórico de loterías")
+    parser.add_argument("lotteries", nargs="*", help="Loterías a procesar (por defecto todas)")
+    parser.add_argument("--mode", choices=FETCH_MODES, default="auto", help="Cómo descargar las páginas")
+    parser.add_argument("--workers", type=int, default=BACKFILL_WORKERS, help="Páginas a descargar en paralelo")
+    args = parser.parse_args(sys.argv[1:] if argv is None else argv)
+    scrape_all(args.lotteries or None, mode=args.mode, workers=args.workers)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+"""
+Estadísticas por número mantenidas de forma incremental.
+
+Guarda junto al registro de sorteos (json_Datos/draws/<name>.stats.json) los
+agregados que antes se recalculaban recorriendo todo el historial en cada
+actualización: apariciones, posiciones, última fecha de cada número y el
+rango de fechas analizado. Un sorteo nuevo se aplica en tiempo proporcional a
+sus números, y el ranking de calientes/fríos se mantiene ordenado por última
+aparición (ese orden no cambia con el paso de los días, solo con sorteos
+nuevos).
+
+También se acumulan los intervalos entre apariciones de cada número (cuántas
+veces volvió a salir a los g sorteos y el total y máximo en días), de los que
+sale el ranking de atrasados (gaps.GapDistribution.from_stats).
+"""
+
+import json
+import os
+from bisect import bisect_left, insort
+from .dates import to_ordinal
+from .drawlog import read_draws
+from .numbers import new_numbers_data
+from .registry import get_lottery, position_key, stats_file
+
+STATE_VERSION = 2  # Estados guardados con otra versión se recalculan desde el registro
+
+
+class NumberStats:
+    """Agregados por número de una lotería
+
+    Args:
+        lottery: Nombre de la lotería en el registro (o su configuración)
+        state: Estado guardado (to_dict); si no se pasa se empieza vacío
+    """
+
+    def __init__(self, lottery, state=None):
+        self.lottery = get_lottery(lottery)
+        state = state or {}
+        self.first_date = state.get("firstDate")
+        self.last_date = state.get("lastDate")
+        self.total_draws = state.get("totalDraws", 0)
+        self.numbers = {
+            num: {"count": 0, "lastSeen": None, "positions": data["positions"],
+                  # Sorteos en los que salió, índice del último e intervalos en sorteos ({g: veces}) y en días
+                  "drawsSeen": 0, "lastDraw": None, "gapCounts": {}, "dayGapTotal": 0, "dayGapMax": 0}
+            for num, data in new_numbers_data(self.lottery).items()
+        }
+        for num, saved in state.get("numbers", {}).items():
+            if num in self.numbers:
+                self.numbers[num].update(saved)
+
+        # (ordinal de la última aparición, número), ordenado: el principio son los fríos y el final los calientes
+        self._ranking = sorted((to_ordinal(data["lastSeen"]), num)
+                               for num, data in self.numbers.items() if data["lastSeen"])
+
+    @classmethod
+    def from_draws(cls, lottery, draws):
+        """Calcular las estadísticas desde cero a partir de {fecha: números}"""
+        stats = cls(lottery)
+        stats.add_draws(draws.items())
+        return stats
+
+    def add_draws(self, draws):
+        """Aplicar sorteos nuevos [(fecha, números)] posteriores al último registrado
+
+        Returns:
+            bool: False si algún sorteo no es posterior a last_date (se
+            reemplaza o rellena un sorteo antiguo); en ese caso no se aplica
+            nada y hay que recalcular con rebuild()
+        """
+        last_ordinal = to_ordinal(self.last_date) if self.last_date else None
+        draws = sorted(draws, key=lambda item: to_ordinal(item[0]))
+        if draws and last_ordinal is not None and to_ordinal(draws[0][0]) <= last_ordinal:
+            return False
+
+        for date_str, drawn_numbers in draws:
+            ordinal = to_ordinal(date_str)
+            for num in dict.fromkeys(drawn_numbers):
+                if num in self.numbers:
+                    self._add_gap(self.numbers[num], ordinal)
+            for pos, num in enumerate(drawn_numbers, 1):
+                if num not in self.numbers:
+                    continue
+                data = self.numbers[num]
+                data["count"] += 1
+                data["positions"][position_key(pos)] += 1
+                if data["lastSeen"] is None or ordinal > to_ordinal(data["lastSeen"]):
+                    self._move(num, data["lastSeen"], ordinal)
+                    data["lastSeen"] = date_str
+
+            if self.first_date is None:
+                self.first_date = date_str
+            self.last_date = date_str
+            self.total_draws += 1
+        return True
+
+    def update(self, new_draws):
+        """Aplicar sorteos nuevos; si reemplazan o rellenan fechas antiguas se recalcula todo desde el registro"""
+        if self.add_draws(new_draws):
+            return
+        print("Sorteos anteriores al último registrado: recalculando estadísticas desde el registro")
+        draws = read_draws(self.lottery)
+        draws.update(new_draws)
+        self.__init__(self.lottery)
+        self.add_draws(draws.items())
+
+    def _add_gap(self, data, ordinal):
+        """Registrar el intervalo desde la aparición anterior de un número que sale en el sorteo total_draws"""
+        if data["lastDraw"] is not None:
+            gap = str(self.total_draws - data["lastDraw"])
+            data["gapCounts"][gap] = data["gapCounts"].get(gap, 0) + 1
+            day_gap = ordinal - to_ordinal(data["lastSeen"])
+            data["dayGapTotal"] += day_gap
+            data["dayGapMax"] = max(data["dayGapMax"], day_gap)
+        data["drawsSeen"] += 1
+        data["lastDraw"] = self.total_draws
+
+    def _move(self, num, old_date, ordinal):
+        """Recolocar un número en el ranking al cambiar su última aparición"""
+        if old_date is not None:
+            index = bisect_left(self._ranking, (to_ordinal(old_date), num))
+            del self._ranking[index]
+        insort(self._ranking, (ordinal, num))
+
+    def days_since_seen(self, num, today):
+        """Días desde la última aparición de un número (None si nunca salió)"""
+        last_seen = self.numbers[num]["lastSeen"] if num in self.numbers else None
+        if last_seen is None:
+            return None
+        return today.toordinal() - to_ordinal(last_seen)
+
+    def analysis_days(self):
+        """Días entre el primer y el último sorteo registrados (ambos incluidos)"""
+        if not self.first_date:
+            return 0
+        return to_ordinal(self.last_date) - to_ordinal(self.first_date) + 1
+
+    def _entries(self, numbers, today):
+        return [{
+            "number": num,
+            "daysSinceSeen": self.days_since_seen(num, today),
+            "lastSeen": self.numbers[num]["lastSeen"]
+        } for num in numbers]
+
+    def coldest(self, today, limit=10):
+        """Números que llevan más días sin salir, en el formato de coldestNumbers"""
+        return self._entries([num for _, num in self._ranking[:limit]], today)
+
+    def hottest(self, today, limit=10):
+        """Números que salieron más recientemente, en el formato de hottestNumbers"""
+        numbers = []
+        end = len(self._ranking)
+        # Del final hacia el principio, manteniendo el orden por número dentro de cada fecha
+        while end > 0 and len(numbers) < limit:
+            start = bisect_left(self._ranking, (self._ranking[end - 1][0], ""))
+            numbers.extend(num for _, num in self._ranking[start:end])
+            end = start
+        return self._entries(numbers[:limit], today)
+
+    def to_dict(self):
+        return {
+            "version": STATE_VERSION,
+            "lottery": self.lottery["name"],
+            "firstDate": self.first_date,
+            "lastDate": self.last_date,
+            "totalDraws": self.total_draws,
+            "numbers": self.numbers,
+        }
+
+
+def load_stats(lottery):
+    """Cargar las estadísticas guardadas, calculándolas desde el registro si no existen"""
+    lottery = get_lottery(lottery)
+    try:
+        with open(stats_file(lottery), 'r', encoding='utf-8') as f:
+            state = json.load(f)
+        if state.get("version") == STATE_VERSION:
+            return NumberStats(lottery, state)
+    except (OSError, ValueError, KeyError, TypeError, AttributeError):
+        pass
+    return NumberStats.from_draws(lottery, read_draws(lottery))
+
+
+def save_stats(stats):
+    """Guardar las estadísticas junto al registro de sorteos"""
+    path = stats_file(stats.lottery)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(stats.to_dict(), f, ensure_ascii=False)
+    os.replace(tmp_path, path)
@@ -0,0 +1,399 @@
+"""
+Actualizador común a todas las loterías.
+
+Reemplaza a los *_updater.py copiados en cada carpeta: carga el JSON existente,
+descarga solo las páginas necesarias desde el último sorteo registrado y
+añade los sorteos nuevos.
+
+Uso:
+    python -m lottery_core.updater super_kino
+"""
+
+import argparse
+import json
+import os
+import sys
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+from .dates import DATE_FORMAT, from_ordinal, to_ordinal
+from .drawdb import store_draws
+from .drawlog import append_draws, ensure_draw_log, merge_draws
+from .fetchers import FETCH_MODES, make_fetcher
+from .numbers import (FREQUENCY_WINDOWS, format_time_period, frequency_rankings_entries, overdue_numbers_entries,
+                      repeated_numbers, winning_numbers_entries)
+from .pairs import load_pair_windows, save_pair_windows
+from .parsing import page_draws
+from .registry import LOTTERIES, build_url, draw_log_file, get_lottery, json_file, position_key
+from .stats import load_stats, save_stats
+
+MAX_ITERATIONS = 10  # Número máximo de iteraciones a realizar si no se encuentran todas las fechas
+
+
+def load_existing_data(lottery):
+    """Cargar datos existentes del archivo JSON (None si no existe o está dañado)"""
+    path = json_file(lottery)
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        print(f"Error: No se encontró el archivo JSON '{path}'")
+        print("Debe existir un archivo JSON con datos previos para poder actualizarlo.")
+    except json.JSONDecodeError:
+        print(f"Error: El archivo JSON '{path}' está dañado o no es válido.")
+    return None
+
+
+def get_ordinal_from_string(date_str):
+    """Convertir string de fecha (dd-mm-YYYY, con o sin hora) a ordinal de día"""
+    try:
+        return to_ordinal(date_str.split(" ")[0])
+    except (ValueError, AttributeError):
+        print(f"Error al convertir fecha: {date_str}")
+        return None
+
+
+def calculate_days_to_update(existing_data):
+    """Calcular cuántos días necesitamos actualizar"""
+    today = datetime.now()
+
+    # Obtener la fecha del último sorteo registrado
+    latest_winning_ordinal = None
+    if existing_data.get("winningNumbers"):
+        latest_winning_ordinal = get_ordinal_from_string(existing_data["winningNumbers"][0].get("date", ""))
+
+    if not latest_winning_ordinal:
+        print("Advertencia: No se encontró una fecha válida del último sorteo en el JSON.")
+        print("Se asumirá que necesitamos 14 días de actualización.")
+        days_to_update = 14
+    else:
+        days_to_update = today.toordinal() - latest_winning_ordinal
+
+    print(f"Fecha actual: {today.strftime(DATE_FORMAT)}")
+    if latest_winning_ordinal:
+        print(f"Fecha del último sorteo registrado: {from_ordinal(latest_winning_ordinal)}")
+    print(f"Días a actualizar: {days_to_update}")
+
+    return days_to_update, today
+
+
+def build_history_index(numbers_data):
+    """Indexar las entradas del historial una sola vez al cargar los datos
+
+    Returns:
+        tuple: (número -> set de (fecha, posición), fecha -> [(número, posición)])
+    """
+    history_keys = {}
+    date_index = defaultdict(list)
+    for num, data in numbers_data.items():
+        keys = set()
+        for entry in data["history"]:
+            key = (entry.get("date"), entry.get("position"))
+            if key not in keys:
+                keys.add(key)
+                date_index[key[0]].append((num, key[1]))
+        history_keys[num] = keys
+    return history_keys, date_index
+
+
+def remove_existing_date_data(numbers_data, existing_data, target_date, date_index=None, history_keys=None):
+    """Remover datos existentes para una fecha específica antes de sobrescribir
+
+    Con el índice fecha -> [(número, posición)] solo se tocan los números de
+    ese sorteo; los índices se actualizan para reflejar la eliminación.
+    """
+    if date_index is None:
+        history_keys, date_index = build_history_index(numbers_data)
+
+    # Remover de winningNumbers
+    if "winningNumbers" in existing_data:
+        existing_data["winningNumbers"] = [
+            win_data for win_data in existing_data["winningNumbers"]
+            if win_data.get("date") != target_date
+        ]
+
+    # Remover del historial de los números de ese sorteo y recalcular contadores
+    for num in dict.fromkeys(num for num, _ in date_index.pop(target_date, [])):
+        if num not in numbers_data:
+            continue
+        data = numbers_data[num]
+        kept_history = []
+        removed_entries = []
+        for entry in data["history"]:
+            (removed_entries if entry.get("date") == target_date else kept_history).append(entry)
+        data["history"] = kept_history
+
+        if removed_entries:
+            print(f"    Removiendo {len(removed_entries)} entrada(s) existente(s) del número {num} para la fecha {target_date}")
+
+            # Restar los contadores de posiciones
+            for entry in removed_entries:
+                pos = entry.get("position", 0)
+                key = position_key(pos) if pos >= 1 else None
+                if key in data["positions"] and data["positions"][key] > 0:
+                    data["positions"][key] -= 1
+                if history_keys is not None:
+                    history_keys[num].discard((target_date, pos))
+
+
+def update_lottery_data(lottery, existing_data, days_to_update, today, fetcher, page_dates=None, stats=None):
+    """Actualizar los datos de la lotería con los sorteos publicados desde la última actualización
+
+    Si la lotería tiene overwrite_existing en el registro, un sorteo cuya fecha
+    ya está registrada con otros números se reemplaza; si no, se salta. page_dates permite
+    indicar exactamente qué páginas visitar (ver scheduler.pages_for_dates);
+    si no se indica se retrocede desde hoy según days_to_update y se para en
+    cuanto se alcanza el sorteo más reciente.
+
+    stats (stats.NumberStats) recibe los sorteos nuevos y de ahí salen
+    lastSeen, daysSinceSeen, el período de análisis y los calientes/fríos sin
+    recorrer el historial completo.
+    """
+    lottery = get_lottery(lottery)
+    days_to_go_back = lottery["days_to_go_back"]
+    overwrite = lottery["overwrite_existing"]
+
+    numbers_data = existing_data["numbers"]
+    history_keys, date_index = build_history_index(numbers_data)
+
+    # Estructura para seguimiento de repeticiones en los últimos 30 días
+    last_30_days_occurrences = defaultdict(list)
+    today_ordinal = today.toordinal()
+    thirty_days_ago = today_ordinal - 30  # Cuentan los sorteos posteriores a este día
+
+    # Inicializar desde repeticiones existentes
+    for num, data in existing_data.get("repeatedInLast30Days", {}).items():
+        for date_str in data.get("dates", []):
+            date_ordinal = get_ordinal_from_string(date_str)
+            if date_ordinal and date_ordinal > thirty_days_ago:
+                last_30_days_occurrences[num].append(date_str)
+
+    # Números ganadores más recientes
+    latest_winning_numbers = []
+    latest_winning_ordinal = None
+
+    # Con páginas explícitas se visitan todas: cada una cubre sorteos que faltan
+    stop_when_current = page_dates is None
+    if page_dates is None:
+        # Calcular número necesario de iteraciones (una iteración ~= 8 días)
+        required_iterations = min((days_to_update // days_to_go_back) + 2, MAX_ITERATIONS)
+        page_dates = [today - timedelta(days=days_to_go_back * k) for k in range(required_iterations)]
+    required_iterations = len(page_dates)
+
+    print(f"Iniciando actualización de {lottery['display_name']} con {required_iterations} iteraciones...")
+
+    total_numbers_found = 0
+    new_draws = []  # Sorteos aceptados, para añadirlos al registro de sorteos
+
+    for iteration, current_date in enumerate(page_dates, 1):
+        url_date = current_date.strftime(DATE_FORMAT)
+        print(f"\nIteración {iteration}/{required_iterations} - Cargando fecha: {url_date}")
+
+        date_texts, blocks = fetcher.fetch(build_url(lottery, url_date), lottery)
+        print(f"Encontradas {len(date_texts)} fechas sin año: {date_texts}")
+        print(f"Encontrados {len(blocks)} bloques de juego")
+
+        if len(date_texts) == 0 or len(blocks) == 0:
+            print("No se encontraron suficientes elementos en esta página.")
+            continue
+
+        draws = page_draws(date_texts, blocks, current_date, lottery["positions"])
+
+        for complete_date, drawn_numbers in draws:
+            try:
+                draw_ordinal = to_ordinal(complete_date)
+            except ValueError as e:
+                print(f"    Error procesando la fecha '{complete_date}': {str(e)}")
+                continue
+
+            # Comprobar si esta fecha ya está registrada (índice construido al cargar)
+            if complete_date in date_index:
+                same_draw = all((complete_date, pos) in history_keys.get(num, ())
+                                for pos, num in enumerate(drawn_numbers, 1))
+                if not overwrite or same_draw:
+                    print(f"    La fecha {complete_date} ya existe en los datos, saltando...")
+                    continue
+                print(f"    La fecha {complete_date} ya existe en los datos, sobrescribiendo...")
+                remove_existing_date_data(numbers_data, existing_data, complete_date, date_index, history_keys)
+
+            new_draws.append((complete_date, drawn_numbers))
+
+            # Guardar los números ganadores más recientes
+            if latest_winning_ordinal is None or draw_ordinal > latest_winning_ordinal:
+                latest_winning_numbers = drawn_numbers
+                latest_winning_ordinal = draw_ordinal
+                print(f"Números ganadores más recientes actualizados: {', '.join(drawn_numbers)} ({complete_date})")
+
+            days_diff = today_ordinal - draw_ordinal
+
+            for pos, num in enumerate(drawn_numbers, 1):
+                if num not in numbers_data:
+                    continue
+                data = numbers_data[num]
+
+                # Si no hemos visto este número antes o esta fecha es más reciente
+                if data["lastSeen"] is None or draw_ordinal > to_ordinal(data["lastSeen"]):
+                    data["lastSeen"] = complete_date
+                    data["daysSinceSeen"] = days_diff
+
+                # Añadir al historial de apariciones (y contar la posición) si no existe ya
+                key = (complete_date, pos)
+                if key not in history_keys.setdefault(num, set()):
+                    data["positions"][position_key(pos)] += 1
+                    data["history"].append({
+                        "date": complete_date,
+                        "position": pos,
+                        "daysAgo": days_diff
+                    })
+                    history_keys[num].add(key)
+                    date_index[complete_date].append((num, pos))
+                    total_numbers_found += 1
+
+                # Registrar ocurrencia para conteo de últimos 30 días
+                if draw_ordinal > thirty_days_ago and complete_date not in last_30_days_occurrences[num]:
+                    last_30_days_occurrences[num].append(complete_date)
+
+        print(f"Procesados {len(draws)} bloques en esta iteración")
+
+        # Verificar si ya hemos actualizado suficientes días
+        if stop_when_current and latest_winning_ordinal and today_ordinal - latest_winning_ordinal <= 1:
+            print("Ya estamos al día con los resultados más recientes, deteniendo actualización.")
+            break
+
+    # Aplicar los sorteos nuevos a las estadísticas acumuladas (tiempo proporcional a los sorteos nuevos)
+    if stats is None:
+        stats = load_stats(lottery)
+    stats.update(new_draws)
+
+    # Actualizar la última aparición y los días sin salir para todos los números
+    for num, data in numbers_data.items():
+        if num in stats.numbers and stats.numbers[num]["lastSeen"]:
+            data["lastSeen"] = stats.numbers[num]["lastSeen"]
+            data["daysSinceSeen"] = stats.days_since_seen(num, today)
+
+    analysis_days = stats.analysis_days()
+    analysis_period_formatted = format_time_period(analysis_days)
+
+    print(f"\n--- PERÍODO DE ANÁLISIS RECALCULADO ---")
+    print(f"Período total: {analysis_days} días ({analysis_period_formatted})")
+    if stats.first_date:
+        print(f"Desde: {stats.first_date} hasta: {stats.last_date}")
+
+    existing_data["numbers"] = numbers_data
+    existing_data["lastUpdated"] = today.strftime("%d-%m-%Y %H:%M:%S")
+    existing_data["totalProcessed"] = existing_data.get("totalProcessed", 0) + total_numbers_found
+    existing_data["repeatedInLast30Days"] = repeated_numbers(last_30_days_occurrences)
+
+    existing_data["analysisPeriod"] = analysis_days
+    existing_data["analysisPeriodFormatted"] = analysis_period_formatted
+    if stats.first_date:
+        existing_data["analysisDateRange"] = {
+            "startDate": stats.first_date,
+            "endDate": stats.last_date
+        }
+
+    coldest, hottest = stats.coldest(today), stats.hottest(today)
+    if coldest:
+        existing_data["coldestNumbers"] = coldest
+        existing_data["hottestNumbers"] = hottest
+
+    if latest_winning_numbers and latest_winning_ordinal:
+        winning_date_str = from_ordinal(latest_winning_ordinal)
+        existing_data["winningNumbers"] = winning_numbers_entries(latest_winning_numbers, winning_date_str)
+        print(f"Números ganadores actualizados en el JSON: {latest_winning_numbers} ({winning_date_str})")
+
+    return existing_data, total_numbers_found, new_draws
+
+
+def update(lottery, fetcher=None, mode="auto", page_dates=None):
+    """Actualizar el JSON de una lotería
+
+    Args:
+        lottery: Nombre de la lotería en el registro (o su configuración)
+        fetcher: Fetcher compartido; si no se pasa se crea uno propio y se cierra al final
+        mode: Modo del fetcher propio ('auto', 'http' o 'browser')
+        page_dates: Fechas de las páginas a visitar (por defecto se retrocede desde hoy)
+
+    Returns:
+        int: Cantidad de resultados de números añadidos (None si no se pudo actualizar)
+    """
+    lottery = get_lottery(lottery)
+    path = json_file(lottery)
+    print(f"=== Actualizador de datos para {lottery['display_name']} ===")
+
+    if not os.path.exists(path):
+        print(f"Error: No se encontró el archivo JSON '{path}'")
+        print("Debe existir un archivo JSON con datos previos para poder actualizarlo.")
+        return None
+
+    existing_data = load_existing_data(lottery)
+    if existing_data is None:
+        return None
+    print(f"Datos cargados del archivo: '{path}'")
+    print(f"Período de análisis actual: {existing_data.get('analysisPeriodFormatted', 'No disponible')}")
+
+    days_to_update, today = calculate_days_to_update(existing_data)
+    if days_to_update <= 0 or page_dates == []:
+        print("Los datos ya están actualizados. No se requiere actualización.")
+        return 0
+
+    own_fetcher = fetcher is None
+    if own_fetcher:
+        fetcher = make_fetcher(mode)
+
+    try:
+        # El registro de sorteos es el almacenamiento principal; se crea desde el JSON la primera vez.
+        # Solo se leen los sorteos del final que necesita frequencyRankings
+        draws = ensure_draw_log(lottery, existing_data, recent=max(FREQUENCY_WINDOWS))
+        stats = load_stats(lottery)
+        pair_windows = load_pair_windows(lottery, today)
+        updated_data, new_numbers, new_draws = update_lottery_data(lottery, existing_data, days_to_update, today,
+                                                                   fetcher, page_dates, stats)
+    except Exception as e:
+        print(f"Error durante la actualización: {e}")
+        print("La actualización no se completó correctamente.")
+        return None
+    finally:
+        if own_fetcher:
+            fetcher.close()
+
+    append_draws(lottery, new_draws)
+    print(f"Añadidos {len(new_draws)} sorteos a '{draw_log_file(lottery)}'")
+    store_draws(lottery, new_draws)
+    save_stats(stats)
+    pair_windows.update(new_draws, today)
+    save_pair_windows(pair_windows)
+    draws = merge_draws(draws, new_draws)
+    rankings = frequency_rankings_entries(lottery, draws)
+    if rankings is not None:
+        updated_data["frequencyRankings"] = rankings
+    overdue = overdue_numbers_entries(lottery, None, today, stats=stats)
+    if overdue is not None:
+        updated_data["overdueNumbers"] = overdue
+
+    # El JSON es la vista materializada que lee la web
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(updated_data, f, indent=2, ensure_ascii=False)
+
+    print(f"\nSe agregaron {new_numbers} nuevos resultados de números.")
+    print(f"Período de análisis actualizado: {updated_data.get('analysisPeriodFormatted', 'No disponible')}")
+    print(f"Datos actualizados guardados en '{path}'")
+    print(f"¡Actualización de {lottery['display_name']} completada con éxito!")
+    return new_numbers
+
+
+def run_single(name, mode="auto"):
+    """Punto de entrada de los scripts *_updater.py de cada carpeta"""
+    update(name, mode=mode)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Actualizador de datos de loterías")
+    parser.add_argument("lottery", choices=list(LOTTERIES), help="Lotería a actualizar")
+    parser.add_argument("--mode", choices=FETCH_MODES, default="auto", help="Cómo descargar las páginas")
+    args = parser.parse_args(sys.argv[1:] if argv is None else argv)
+    update(args.lottery, mode=args.mode)
+
+
+if __name__ == "__main__":
+    main()
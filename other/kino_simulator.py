@@ -1,45 +1,76 @@
+import argparse
 import json
-import random
-from collections import defaultdict
+import sys
 import os
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lottery_core.matrix import load_draw_matrix, one_hot_draws
+from lottery_core.montecarlo import simulate_random_tickets
+from lottery_core.odds import GAMES, compare_with_simulation, risk_of_ruin, ticket_odds
 
 # Configuración del simulador
 JSON_FILE_PATH = r"C:\Users\willi\OneDrive\Escritorio\New_Loteria_Resultados\Numeros_de_loterias_registro\json_Datos\lottery_data_super_kino.json"  # Ruta al archivo JSON
-COST_PER_GAME = 25  # Costo por jugada en pesos
+COST_PER_GAME = GAMES["super_kino"]["cost"]  # Costo por jugada en pesos
 NUMBERS_TO_PLAY = 10  # Números que jugamos por sorteo
 TOTAL_NUMBERS = 80  # Rango de números (1-80)
 WINNING_NUMBERS_PER_DRAW = 20  # Números que salen por sorteo
 PLAYERS = 5000  # Número de jugadores/jugadas por sorteo (cambia esto para simular múltiples jugadores)
+SEED = 42  # Semilla para resultados reproducibles (None = aleatoria en cada ejecución)
+BANKROLL = 10_000  # Saldo inicial para el riesgo de ruina (una jugada por sorteo)
 
-# Reglas de premios del Super Kino TV
-PRIZE_TABLE = {
-    10: 25_000_000,  # 10 aciertos: 25 millones
-    9: 150_000,      # 9 aciertos: 150 mil
-    8: 10_000,       # 8 aciertos: 10 mil
-    7: 1_000,        # 7 aciertos: 1 mil
-    6: 300,          # 6 aciertos: 300 pesos
-    5: 60,           # 5 aciertos: 60 pesos
-    0: 80,           # 0 aciertos: devolución de 80 pesos
-    # 1, 2, 3, 4 aciertos no ganan nada
-}
-
-def generate_random_numbers(count, max_number):
-    """Genera números aleatorios únicos"""
-    return set(random.sample(range(1, max_number + 1), count))
-
-def count_matches(played_numbers, winning_numbers):
-    """Cuenta las coincidencias entre números jugados y ganadores"""
-    return len(played_numbers.intersection(winning_numbers))
+# Reglas de premios del Super Kino TV (lottery_core.odds)
+PRIZE_TABLE = GAMES["super_kino"]["prize_table"]
 
 def calculate_prize(matches):
     """Calcula el premio basado en el número de aciertos"""
     return PRIZE_TABLE.get(matches, 0)
 
+def exact_odds():
+    """Probabilidades exactas de una jugada aleatoria con la configuración actual"""
+    return ticket_odds(PRIZE_TABLE, NUMBERS_TO_PLAY, WINNING_NUMBERS_PER_DRAW, TOTAL_NUMBERS, COST_PER_GAME)
+
+def show_exact_odds(total_draws, bankroll=BANKROLL):
+    """Mostrar la distribución exacta de aciertos, el valor esperado y el riesgo de ruina
+    
+    Args:
+        total_draws: Sorteos jugados (una jugada por sorteo) para el riesgo de ruina
+        bankroll: Saldo inicial
+    """
+    odds = exact_odds()
+    
+    print("🧮 MODO ANALÍTICO - PROBABILIDADES EXACTAS (HIPERGEOMÉTRICA)")
+    print("=" * 60)
+    print(f"🎯 Jugando {NUMBERS_TO_PLAY} de {TOTAL_NUMBERS} números, salen {WINNING_NUMBERS_PER_DRAW} por sorteo")
+    print(f"💰 Costo por jugada: {COST_PER_GAME} pesos")
+    print("-" * 60)
+    for matches, (p, prize) in enumerate(zip(odds["distribution"], odds["prizes"])):
+        odds_text = f"1 en {1 / p:,.0f}" if p else "imposible"
+        print(f"{matches:2d} aciertos: {p * 100:8.4f}% ({odds_text}) - Premio: {prize:,} pesos")
+    
+    print("\n💰 VALOR ESPERADO POR JUGADA:")
+    print("-" * 40)
+    print(f"Premio esperado:       {odds['expected_prize']:,.4f} pesos")
+    print(f"Balance esperado:      {odds['expected_net']:,.4f} pesos")
+    print(f"Desviación estándar:   {odds['std']:,.2f} pesos")
+    print(f"Retorno al jugador:    {odds['rtp'] * 100:.2f}%")
+    print(f"Probabilidad de ganar: {odds['win_probability'] * 100:.2f}%")
+    
+    if total_draws:
+        ruin = risk_of_ruin(odds, bankroll, total_draws)
+        print(f"\n📉 EN {total_draws:,} SORTEOS (UNA JUGADA POR SORTEO):")
+        print("-" * 40)
+        print(f"Balance esperado:      {odds['expected_net'] * total_draws:,.0f} pesos "
+              f"(± {odds['std'] * total_draws ** 0.5:,.0f})")
+        print(f"Riesgo de ruina con {bankroll:,} pesos: {ruin * 100:.2f}%")
+    
+    return odds
+
 def load_historical_data(file_path):
-    """Carga los datos históricos del archivo JSON"""
+    """Carga los sorteos históricos del archivo JSON como matriz (lottery_core.matrix)"""
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        return load_draw_matrix(file_path)
     except FileNotFoundError:
         print(f"Error: No se encontró el archivo {file_path}")
         return None
@@ -47,38 +78,30 @@ def load_historical_data(file_path):
         print(f"Error: El archivo {file_path} no es un JSON válido")
         return None
 
-def extract_winning_numbers_from_history(data):
+def extract_winning_numbers_from_history(matrix):
     """Extrae los números ganadores de cada sorteo del historial"""
-    winning_draws = []
-    
-    # Buscar en todos los números para encontrar sus historiales
-    for number, number_data in data.get("numbers", {}).items():
-        history = number_data.get("history", [])
-        
-        # Agrupar por fecha
-        for entry in history:
-            date = entry["date"]
-            # Buscar si ya tenemos un sorteo para esta fecha
-            existing_draw = next((draw for draw in winning_draws if draw["date"] == date), None)
-            
-            if existing_draw:
-                existing_draw["numbers"].add(int(number))
-            else:
-                winning_draws.append({
-                    "date": date,
-                    "numbers": {int(number)}
-                })
-    
-    # Filtrar solo sorteos que tengan exactamente 20 números
-    complete_draws = [draw for draw in winning_draws if len(draw["numbers"]) == WINNING_NUMBERS_PER_DRAW]
+    dates = matrix.dates
     
-    # Ordenar por fecha (más recientes primero)
-    complete_draws.sort(key=lambda x: x["date"], reverse=True)
+    # Del más reciente al más antiguo, solo sorteos con exactamente 20 números distintos
+    complete_draws = []
+    for index in range(len(matrix) - 1, -1, -1):
+        numbers = set(matrix.draws[index].tolist())
+        if len(numbers) == WINNING_NUMBERS_PER_DRAW:
+            complete_draws.append({
+                "date": dates[index],
+                "numbers": numbers
+            })
     
     return complete_draws
 
-def run_simulation(historical_data):
-    """Ejecuta la simulación completa"""
+def run_simulation(historical_data, players=PLAYERS, seed=SEED):
+    """Ejecuta la simulación completa
+    
+    Args:
+        historical_data: DrawMatrix del Super Kino
+        players: Jugadas aleatorias por sorteo
+        seed: Semilla del generador (None = aleatoria)
+    """
     print("🎲 SIMULADOR DE SUPER KINO TV - NÚMEROS ALEATORIOS")
     print("=" * 60)
     
@@ -90,64 +113,50 @@ def run_simulation(historical_data):
         return
     
     total_draws = len(winning_draws)
-    total_games = total_draws * PLAYERS  # Total de jugadas = sorteos × jugadores
+    total_games = total_draws * players  # Total de jugadas = sorteos × jugadores
     
     print(f"📊 Sorteos encontrados: {total_draws}")
-    print(f"👥 Jugadores por sorteo: {PLAYERS:,}")
+    print(f"👥 Jugadores por sorteo: {players:,}")
     print(f"🎮 Total de jugadas: {total_games:,}")
     print(f"💰 Costo por jugada: {COST_PER_GAME} pesos")
     print(f"🎯 Jugando {NUMBERS_TO_PLAY} números por sorteo")
+    print(f"🌱 Semilla: {seed}")
     print("-" * 60)
     
-    # Configurar seed para reproducibilidad (opcional)
-    # random.seed(42)  # Descomenta esta línea si quieres resultados reproducibles
+    print("🔄 Ejecutando simulación...")
     
-    # Contadores para estadísticas
-    matches_count = defaultdict(int)  # Contador de aciertos
-    total_spent = 0
-    total_won = 0
-    detailed_results = []
+    # Matriz one-hot de los ganadores: la columna j es el número j + 1
+    winning_one_hot = one_hot_draws([sorted(draw["numbers"]) for draw in winning_draws], TOTAL_NUMBERS + 1)[:, 1:]
     
-    print("🔄 Ejecutando simulación...")
+    def show_progress(draws_done):
+        # Mostrar progreso cada 100 sorteos
+        if draws_done % 100 == 0 or draws_done == total_draws:
+            print(f"   Procesados {draws_done}/{total_draws} sorteos ({draws_done * players:,} jugadas)...")
     
-    # Simular cada sorteo
+    start = time.perf_counter()
+    simulation = simulate_random_tickets(winning_one_hot, players, NUMBERS_TO_PLAY, PRIZE_TABLE,
+                                         seed=seed, progress=show_progress)
+    elapsed = time.perf_counter() - start
+    
+    matches_count = {matches: int(count) for matches, count in enumerate(simulation["matches"])}
+    total_spent = total_games * COST_PER_GAME
+    total_won = simulation["total_won"]
+    
+    # Detalles solo del primer jugador de cada sorteo para evitar memoria excesiva
+    detailed_results = []
     for i, draw in enumerate(winning_draws):
-        winning_numbers = draw["numbers"]
-        
-        # Simular múltiples jugadores por sorteo
-        for player in range(PLAYERS):
-            # Generar números aleatorios para este jugador
-            played_numbers = generate_random_numbers(NUMBERS_TO_PLAY, TOTAL_NUMBERS)
-            
-            # Contar aciertos
-            matches = count_matches(played_numbers, winning_numbers)
-            
-            # Calcular premio
-            prize = calculate_prize(matches)
-            net_gain = prize - COST_PER_GAME
-            
-            # Actualizar contadores
-            matches_count[matches] += 1
-            total_spent += COST_PER_GAME
-            total_won += prize
-            
-            # Guardar detalles solo para el primer jugador para evitar memoria excesiva
-            if player == 0:
-                detailed_results.append({
-                    "draw_number": i + 1,
-                    "date": draw["date"],
-                    "played": sorted(list(played_numbers)),
-                    "winning": sorted(list(winning_numbers)),
-                    "matches": matches,
-                    "prize": prize,
-                    "net_gain": net_gain
-                })
-        
-        # Mostrar progreso cada 100 sorteos
-        if (i + 1) % 100 == 0:
-            games_processed = (i + 1) * PLAYERS
-            print(f"   Procesados {i + 1}/{total_draws} sorteos ({games_processed:,} jugadas)...")
+        prize = int(simulation["first_prizes"][i])
+        detailed_results.append({
+            "draw_number": i + 1,
+            "date": draw["date"],
+            "played": simulation["first_tickets"][i].tolist(),
+            "winning": sorted(draw["numbers"]),
+            "matches": int(simulation["first_matches"][i]),
+            "prize": prize,
+            "net_gain": prize - COST_PER_GAME
+        })
     
+    print(f"⏱️  {total_games:,} jugadas en {elapsed:.2f} s ({total_games / max(elapsed, 1e-9):,.0f} jugadas/s)")
     print("✅ Simulación completada!")
     print("\n" + "=" * 60)
     
@@ -159,8 +168,8 @@ def run_simulation(historical_data):
     print("🎯 DISTRIBUCIÓN DE ACIERTOS:")
     print("-" * 40)
     total_games_played = sum(matches_count.values())
-    for matches in range(11):  # 0 a 10 aciertos
-        count = matches_count[matches]
+    for matches in range(NUMBERS_TO_PLAY + 1):  # 0 a 10 aciertos
+        count = matches_count.get(matches, 0)
         percentage = (count / total_games_played) * 100 if total_games_played > 0 else 0
         prize = PRIZE_TABLE.get(matches, 0)
         
@@ -186,8 +195,8 @@ def run_simulation(historical_data):
     print("\n📊 ESTADÍSTICAS ADICIONALES:")
     print("-" * 40)
     
-    winning_draws_count = sum(matches_count[i] for i in range(5, 11)) + matches_count[0]
-    losing_draws_count = sum(matches_count[i] for i in range(1, 5))
+    winning_draws_count = sum(count for matches, count in matches_count.items() if PRIZE_TABLE.get(matches, 0))
+    losing_draws_count = total_games_played - winning_draws_count
     
     winning_percentage = (winning_draws_count / total_games_played) * 100
     losing_percentage = (losing_draws_count / total_games_played) * 100
@@ -195,8 +204,8 @@ def run_simulation(historical_data):
     print(f"Jugadas ganadoras:   {winning_draws_count:,} ({winning_percentage:.1f}%)")
     print(f"Jugadas perdedoras:  {losing_draws_count:,} ({losing_percentage:.1f}%)")
     
-    if PLAYERS > 1:
-        print(f"Jugadas por sorteo:  {PLAYERS:,}")
+    if players > 1:
+        print(f"Jugadas por sorteo:  {players:,}")
         print(f"Total de sorteos:    {total_draws:,}")
     
     # Mejores y peores resultados
@@ -221,23 +230,39 @@ def run_simulation(historical_data):
     print("-" * 40)
     print("Comparación teórica vs simulación:")
     
-    # Aquí podrías añadir cálculos de probabilidades teóricas si quisieras
-    # Por simplicidad, solo mostramos los resultados obtenidos
+    check = compare_with_simulation(exact_odds(), matches_count, total_won)
+    for matches, expected, observed, z in check["rows"]:
+        print(f"{matches:2d} aciertos: esperadas {expected:,.1f}, simuladas {observed:,} (z = {z:+.2f})")
+    print(f"RTP exacto: {check['rtp'] * 100:.3f}% - RTP simulado: {check['simulated_rtp'] * 100:.3f}% "
+          f"(z = {check['rtp_z']:+.2f})")
+    if check["converged"]:
+        print("✅ La simulación converge al resultado analítico")
+    else:
+        print("⚠️  La simulación se aleja más de 4 errores estándar del resultado analítico")
     
     return {
         "total_draws": total_draws,
-        "total_players": PLAYERS,
+        "total_players": players,
         "total_games": total_games_played,
-        "matches_distribution": dict(matches_count),
+        "matches_distribution": matches_count,
         "total_spent": total_spent,
         "total_won": total_won,
         "net_result": total_net,
         "roi_percentage": roi_percentage,
+        "convergence": check,
         "detailed_results": detailed_results
     }
 
-def main():
+def main(argv=None):
     """Función principal"""
+    parser = argparse.ArgumentParser(description="Simulador de Super Kino TV con números aleatorios")
+    parser.add_argument("--players", type=int, default=PLAYERS, help="Jugadas aleatorias por sorteo")
+    parser.add_argument("--seed", type=int, default=SEED, help="Semilla del generador")
+    parser.add_argument("--bankroll", type=int, default=BANKROLL, help="Saldo inicial para el riesgo de ruina")
+    parser.add_argument("--simulate", action="store_true",
+                        help="Simular las jugadas aleatorias (y comprobar que convergen al resultado exacto)")
+    args = parser.parse_args(sys.argv[1:] if argv is None else argv)
+    
     # Verificar si existe el archivo
     if not os.path.exists(JSON_FILE_PATH):
         print(f"❌ Error: No se encontró el archivo {JSON_FILE_PATH}")
@@ -246,11 +271,17 @@ def main():
     
     # Cargar datos históricos
     historical_data = load_historical_data(JSON_FILE_PATH)
-    if not historical_data:
+    if historical_data is None:
+        return
+    
+    # Las jugadas aleatorias tienen resultado exacto; simular solo sirve para comprobarlo
+    show_exact_odds(len(extract_winning_numbers_from_history(historical_data)), args.bankroll)
+    if not args.simulate:
         return
     
     # Ejecutar simulación
-    results = run_simulation(historical_data)
+    print()
+    results = run_simulation(historical_data, args.players, args.seed)
     
     if results:
         print(f"\n✅ Simulación completada exitosamente!")
@@ -259,12 +290,12 @@ def main():
         print(f"🎮 Total de jugadas: {results['total_games']:,}")
         
         # Mostrar estadísticas de escala masiva si hay muchos jugadores
-        if PLAYERS >= 10000:
-            print(f"\n📊 ESCALA MASIVA - SIMULACIÓN DE {PLAYERS:,} JUGADORES:")
+        if args.players >= 10000:
+            print(f"\n📊 ESCALA MASIVA - SIMULACIÓN DE {args.players:,} JUGADORES:")
             print("-" * 50)
-            avg_spent_per_player = results['total_spent'] / PLAYERS
-            avg_won_per_player = results['total_won'] / PLAYERS
-            avg_net_per_player = results['net_result'] / PLAYERS
+            avg_spent_per_player = results['total_spent'] / args.players
+            avg_won_per_player = results['total_won'] / args.players
+            avg_net_per_player = results['net_result'] / args.players
             
             print(f"Gasto promedio por jugador:    {avg_spent_per_player:,.0f} pesos")
             print(f"Ganancia promedio por jugador: {avg_won_per_player:,.0f} pesos")
@@ -1,13 +1,22 @@
 import json
+import os
+import sys
 import pandas as pd
 from datetime import datetime, timedelta
-from collections import Counter, defaultdict
+from collections import Counter
 import statistics
 import numpy as np
 from scipy import stats
 import matplotlib.pyplot as plt
 import seaborn as sns
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lottery_core.dates import to_ordinal
+from lottery_core.drawdb import stored_draws
+from lottery_core.gaps import load_gap_distribution
+from lottery_core.matrix import load_draw_matrix
+
 class LotteryPatternAnalyzer:
     def __init__(self, json_file_path):
         """Inicializar el analizador con los datos del archivo JSON"""
@@ -35,37 +44,23 @@ class LotteryPatternAnalyzer:
         """Preparar datos históricos para análisis"""
         if not self.data or 'numbers' not in self.data:
             return
-        
-        # Extraer todos los sorteos del historial
-        all_draws = []
-        for number, number_data in self.data['numbers'].items():
-            if 'history' in number_data and number_data['history']:
-                for draw in number_data['history']:
-                    all_draws.append({
-                        'date': draw['date'],
-                        'number': number,
-                        'position': draw['position'],
-                        'daysAgo': draw['daysAgo']
-                    })
-        
-        # Agrupar por fecha para reconstruir sorteos completos
-        draws_by_date = defaultdict(list)
-        for draw in all_draws:
-            draws_by_date[draw['date']].append(draw)
-        
-        # Crear lista de sorteos completos
-        for date, numbers in draws_by_date.items():
-            if len(numbers) == 3:  # Pega 3 tiene 3 posiciones
-                sorted_numbers = sorted(numbers, key=lambda x: x['position'])
+
+        # Con la base de sorteos al día con este JSON (lottery_core.drawdb) los sorteos ya vienen completos; sin ella
+        # se reconstruyen desde el JSON una sola vez por sesión (lottery_core.matrix)
+        stored = stored_draws(self.json_file_path, self.data)
+        source = "de la base de datos"
+        if not stored:
+            stored = load_draw_matrix(self.json_file_path).as_dict()
+            source = "preparados"
+        today = datetime.now().toordinal()
+        for date, numbers in reversed(list(stored.items())):  # Más reciente primero
+            if len(numbers) == 3 and all(numbers):  # Pega 3 tiene 3 posiciones
                 self.historical_draws.append({
                     'date': date,
-                    'numbers': [n['number'] for n in sorted_numbers],
-                    'daysAgo': sorted_numbers[0]['daysAgo']
+                    'numbers': numbers,
+                    'daysAgo': today - to_ordinal(date)
                 })
-        
-        # Ordenar por fecha (más reciente primero)
-        self.historical_draws.sort(key=lambda x: datetime.strptime(x['date'], '%d-%m-%Y'), reverse=True)
-        print(f"📈 Sorteos históricos preparados: {len(self.historical_draws)} sorteos completos")
+        print(f"📈 Sorteos históricos {source}: {len(self.historical_draws)} sorteos completos")
 
     def analyze_frequency_patterns(self):
         """Análisis 1: Patrones de Frecuencia"""
@@ -378,6 +373,19 @@ class LotteryPatternAnalyzer:
             percentage = (count / len(gaps) * 100)
             print(f"   {i:2d}. Intervalo {gap}: {count} veces ({percentage:.2f}%)")
         
+        # Intervalos entre apariciones de cada número (sorteos sin salir frente a su propio historial)
+        overdue = load_gap_distribution(self.json_file_path).overdue_ranking(10)
+        
+        print(f"\n⏳ NÚMEROS MÁS ATRASADOS (según sus intervalos entre apariciones):")
+        for i, entry in enumerate(overdue, 1):
+            if not entry['appearances']:
+                print(f"   {i:2d}. Número {entry['number']}: nunca salió en {entry['drawsSinceSeen']} sorteos")
+                continue
+            print(f"   {i:2d}. Número {entry['number']}: {entry['drawsSinceSeen']} sorteos sin salir "
+                  f"(media {entry['meanGapDraws'] or 0:.1f}, máximo {entry['maxGapDraws'] or 0}), "
+                  f"percentil {entry['gapPercentile'] or 0:.1f}%, "
+                  f"probabilidad de tanto atraso {entry['overdueProbability'] * 100:.2f}%")
+        
         return {
             'gap_stats': {
                 'mean': mean_gap,
@@ -385,7 +393,8 @@ class LotteryPatternAnalyzer:
                 'min': min(gaps),
                 'max': max(gaps)
             },
-            'most_common_gaps': most_common_gaps
+            'most_common_gaps': most_common_gaps,
+            'overdue_numbers': overdue
         }
 
     def analyze_repetition_patterns(self):
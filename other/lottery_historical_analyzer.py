@@ -1,9 +1,16 @@
 import json
 import os
+import sys
 from datetime import datetime, timedelta
 from collections import defaultdict, Counter
 import calendar
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lottery_core.dates import to_datetime, to_ordinal
+from lottery_core.drawdb import stored_draws
+from lottery_core.matrix import load_draw_matrix
+
 class LotteryHistoricalAnalyzer:
     def __init__(self, json_file_path):
         """
@@ -44,64 +51,37 @@ class LotteryHistoricalAnalyzer:
             
         print("🔄 Construyendo base de datos histórica...")
         
-        # Diccionario para agrupar por fecha
-        draws_by_date = defaultdict(list)
         expected_positions = self.lottery_data.get('positionsCount', 2)
         
-        # Recorrer todos los números y su historial
-        for number, data in self.lottery_data.get('numbers', {}).items():
-            history = data.get('history', [])
-            
-            for entry in history:
-                date = entry['date']
-                position = entry['position']
-                days_ago = entry.get('daysAgo', 0)
-                draws_by_date[date].append({
-                    'number': number,
-                    'position': position,
-                    'daysAgo': days_ago
-                })
+        # Con la base de sorteos al día con este JSON (lottery_core.drawdb) no hace falta recorrer el historial de cada número;
+        # sin ella, los sorteos se reconstruyen desde el JSON una sola vez por sesión (lottery_core.matrix)
+        stored = stored_draws(self.json_file_path, self.lottery_data) or load_draw_matrix(self.json_file_path).as_dict()
         
         # Procesar cada fecha y crear sorteos limpios
         valid_draws = 0
         
-        for date_str, numbers in draws_by_date.items():
+        for date_str, numbers in stored.items():
             try:
-                # Parsear fecha
-                date_obj = datetime.strptime(date_str, "%d-%m-%Y")
-                self.years_with_data.add(date_obj.year)
-                
-                # Ordenar por posición y filtrar
-                numbers_sorted = sorted(numbers, key=lambda x: x['position'])
-                numbers_filtered = numbers_sorted[:expected_positions]
-                
-                # Extraer números únicos
-                drawn_numbers = []
-                seen_numbers = set()
-                
-                for item in numbers_filtered:
-                    num = item['number']
-                    if num not in seen_numbers:
-                        drawn_numbers.append(num)
-                        seen_numbers.add(num)
-                
-                # Solo agregar si tenemos exactamente el número esperado de números únicos
-                if len(drawn_numbers) == expected_positions:
-                    # Crear clave de fecha sin año para comparaciones
-                    date_key = f"{date_obj.day:02d}-{date_obj.month:02d}"
-                    
-                    self.historical_draws[date_str] = {
-                        'date_obj': date_obj,
-                        'date_key': date_key,  # DD-MM para comparaciones
-                        'numbers': drawn_numbers,
-                        'year': date_obj.year,
-                        'month': date_obj.month,
-                        'day': date_obj.day
-                    }
-                    valid_draws += 1
-                    
-            except Exception as e:
+                date_obj = to_datetime(to_ordinal(date_str))
+            except ValueError as e:
                 print(f"⚠️  Error procesando fecha {date_str}: {e}")
+                continue
+            self.years_with_data.add(date_obj.year)
+            
+            # Números en orden de posición, sin posiciones vacías ni repetidos
+            drawn_numbers = list(dict.fromkeys([number for number in numbers if number][:expected_positions]))
+            
+            # Solo agregar si tenemos exactamente el número esperado de números únicos
+            if len(drawn_numbers) == expected_positions:
+                self.historical_draws[date_str] = {
+                    'date_obj': date_obj,
+                    'date_key': f"{date_obj.day:02d}-{date_obj.month:02d}",  # DD-MM para comparaciones
+                    'numbers': drawn_numbers,
+                    'year': date_obj.year,
+                    'month': date_obj.month,
+                    'day': date_obj.day
+                }
+                valid_draws += 1
         
         years_list = sorted(list(self.years_with_data))
         print(f"✅ Base histórica construida:")
@@ -1,8 +1,19 @@
 import json
 import os
+import sys
 from datetime import datetime
 from collections import defaultdict, Counter
-from itertools import combinations
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lottery_core.dates import to_ordinal
+from lottery_core.drawdb import stored_draws
+from lottery_core.matrix import co_occurrence, load_draw_matrix, one_hot_draws
+from lottery_core.pairs import WINDOWS, PairWindows
+
+NUMBERS_RANGE = 100  # Columnas de la matriz de parejas: números del 00 al 99
 
 class LotteryPairsAnalyzer:
     def __init__(self, json_file_path):
@@ -16,7 +27,10 @@ class LotteryPairsAnalyzer:
         self.lottery_data = None
         self.combinations_history = []
         self.pairs_counter = Counter()
-        self.pairs_details = defaultdict(list)
+        self.draws_one_hot = None  # (sorteos, 100) bool, en el orden de combinations_history
+        self.pairs_matrix = None  # (100, 100): sorteos en los que salió cada pareja (X.T @ X)
+        self.pairs_indices = {}  # pareja -> índices en combinations_history, calculados al consultarla
+        self.pair_windows = None  # Parejas por ventanas de días (lottery_core.pairs)
         
     def load_data(self):
         """Cargar datos del archivo JSON"""
@@ -43,119 +57,56 @@ class LotteryPairsAnalyzer:
         """Construir historial de todas las combinaciones que han salido"""
         if not self.lottery_data:
             return
-            
-        # Diccionario para agrupar por fecha
-        draws_by_date = defaultdict(list)
-        
-        # Recorrer todos los números y su historial
-        for number, data in self.lottery_data.get('numbers', {}).items():
-            history = data.get('history', [])
-            
-            for entry in history:
-                date = entry['date']
-                position = entry['position']
-                days_ago = entry.get('daysAgo', 0)
-                draws_by_date[date].append({
-                    'number': number,
-                    'position': position,
-                    'daysAgo': days_ago
-                })
-        
-        # Configuración esperada de posiciones basada en el tipo de lotería
+
+        # Con la base de sorteos al día con este JSON (lottery_core.drawdb) los sorteos ya vienen agrupados por fecha;
+        # si no está, se reconstruyen desde el JSON una sola vez por sesión (lottery_core.matrix)
+        draws = stored_draws(self.json_file_path, self.lottery_data)
+        source = "la base de datos"
+        if not draws:
+            draws = load_draw_matrix(self.json_file_path).as_dict()
+            source = "el JSON"
+        self.load_combinations(draws, source)
+
+    def load_combinations(self, draws, source="la base de datos"):
+        """Construir el historial de combinaciones desde los sorteos {fecha: números}"""
         expected_positions = self.lottery_data.get('positionsCount', 2)
         print(f"🎯 Configuración: {expected_positions} posiciones por sorteo")
-        
-        # Procesar cada sorteo
-        total_draws = 0
-        valid_draws = 0
-        
-        for date, numbers in draws_by_date.items():
-            # Ordenar por posición
-            numbers_sorted = sorted(numbers, key=lambda x: x['position'])
-            
-            # Filtrar solo las primeras N posiciones (según la configuración)
-            numbers_filtered = numbers_sorted[:expected_positions]
-            
-            # Extraer solo los números y eliminar duplicados manteniendo el orden
-            drawn_numbers = []
-            seen_numbers = set()
-            
-            for item in numbers_filtered:
-                num = item['number']
-                if num not in seen_numbers:
-                    drawn_numbers.append(num)
-                    seen_numbers.add(num)
-            
-            days_ago = numbers_sorted[0]['daysAgo'] if numbers_sorted else 0
-            total_draws += 1
-            
-            # Solo agregar si tenemos exactamente el número esperado de números únicos
+        today = datetime.now().toordinal()
+
+        for date, numbers in reversed(list(draws.items())):  # Más reciente primero
+            drawn_numbers = list(dict.fromkeys(num for num in numbers[:expected_positions] if num))
             if len(drawn_numbers) == expected_positions:
                 self.combinations_history.append({
                     'date': date,
                     'numbers': drawn_numbers,
-                    'daysAgo': days_ago
+                    'daysAgo': today - to_ordinal(date)
                 })
-                valid_draws += 1
-            else:
-                # Debug: mostrar algunos sorteos problemáticos
-                if total_draws <= 5:
-                    all_numbers = [item['number'] for item in numbers_sorted]
-                    print(f"⚠️  Sorteo {date}: Esperado {expected_positions} números únicos, encontrado {len(drawn_numbers)} únicos de {len(all_numbers)} total: {all_numbers}")
-        
-        # Ordenar por fecha (más reciente primero)
-        self.combinations_history.sort(key=lambda x: datetime.strptime(x['date'], "%d-%m-%Y"), reverse=True)
-        
-        print(f"🎲 Sorteos procesados: {total_draws}")
-        print(f"✅ Sorteos válidos: {valid_draws} (con exactamente {expected_positions} números únicos)")
-        print(f"⚠️  Sorteos descartados: {total_draws - valid_draws}")
-        
-        if valid_draws < total_draws * 0.5:  # Si más del 50% se descartó
-            print(f"\n🔍 DIAGNÓSTICO: Se descartaron muchos sorteos. Esto puede indicar:")
-            print(f"   • Datos duplicados en el JSON")
-            print(f"   • Configuración incorrecta de posiciones")
-            print(f"   • Problema en el scraping original")
-            
-            # Mostrar una muestra de datos para diagnóstico
-            if self.combinations_history:
-                print(f"\n📋 Muestra de sorteos válidos encontrados:")
-                for i, draw in enumerate(self.combinations_history[:3]):
-                    print(f"   {i+1}. {draw['date']}: {' - '.join(draw['numbers'])}")
-        
+
+        print(f"🗄️  Sorteos leídos de {source}: {len(draws)}")
+        print(f"⚠️  Sorteos descartados: {len(draws) - len(self.combinations_history)} "
+              f"(sin {expected_positions} números únicos)")
         print(f"🎯 Historial construido con {len(self.combinations_history)} sorteos válidos")
-    
+
     def analyze_pairs(self):
         """Analizar todas las parejas que han salido y contar repeticiones"""
         print("\n🔍 Analizando parejas...")
         
-        total_pairs_found = 0
-        identical_pairs_ignored = 0
+        # Matriz de presencia de cada número por sorteo; X.T @ X cuenta los sorteos de cada pareja
+        draws = [[int(num) for num in draw['numbers']] for draw in self.combinations_history]
+        self.draws_one_hot = one_hot_draws(draws, NUMBERS_RANGE)
+        self.pairs_matrix = co_occurrence(self.draws_one_hot)
+        self.pairs_indices = {}
         
-        for draw in self.combinations_history:
-            drawn_numbers = draw['numbers']
-            date = draw['date']
-            days_ago = draw['daysAgo']
-            
-            # Generar todas las combinaciones de parejas posibles del sorteo
-            for pair in combinations(drawn_numbers, 2):
-                # Ignorar parejas idénticas (ej: 20-20)
-                if pair[0] == pair[1]:
-                    identical_pairs_ignored += 1
-                    continue
-                
-                # Ordenar la pareja para mantener consistencia (ej: (05,12) siempre será (05,12) y no (12,05))
-                sorted_pair = tuple(sorted(pair))
-                
-                # Contar la pareja
-                self.pairs_counter[sorted_pair] += 1
-                total_pairs_found += 1
-                
-                # Guardar detalles de la aparición
-                self.pairs_details[sorted_pair].append({
-                    'date': date,
-                    'complete_draw': drawn_numbers,
-                    'daysAgo': days_ago
-                })
+        # Solo el triángulo superior: parejas de números diferentes, cada una una vez (ej: (05,12) y no (12,05))
+        first, second = np.nonzero(np.triu(self.pairs_matrix, k=1))
+        counts = self.pairs_matrix[first, second]
+        self.pairs_counter = Counter({
+            (f"{a:02d}", f"{b:02d}"): int(count) for a, b, count in zip(first, second, counts)
+        })
+        
+        total_pairs_found = int(counts.sum())
+        all_pairs = sum(len(numbers) * (len(numbers) - 1) // 2 for numbers in draws)
+        identical_pairs_ignored = all_pairs - total_pairs_found
         
         print(f"✅ Análisis completado:")
         print(f"   • Parejas válidas encontradas: {total_pairs_found}")
@@ -168,6 +119,22 @@ class LotteryPairsAnalyzer:
             print(f"   • Problema en la estructura de datos")
             print(f"   • Configuración incorrecta de posiciones")
     
+    def pair_details(self, pair):
+        """Apariciones de una pareja (más reciente primero) con la fecha, el sorteo completo y daysAgo
+        
+        Los índices de los sorteos de cada pareja se calculan la primera vez que se consulta.
+        """
+        if pair not in self.pairs_indices:
+            num1, num2 = int(pair[0]), int(pair[1])
+            together = self.draws_one_hot[:, num1] & self.draws_one_hot[:, num2]
+            self.pairs_indices[pair] = np.flatnonzero(together).astype(np.int32)
+        
+        return [{
+            'date': self.combinations_history[index]['date'],
+            'complete_draw': self.combinations_history[index]['numbers'],
+            'daysAgo': self.combinations_history[index]['daysAgo']
+        } for index in self.pairs_indices[pair].tolist()]
+    
     def show_most_repeated_pairs(self, limit=20):
         """Mostrar las parejas más repetidas"""
         print(f"\n🏆 TOP {limit} PAREJAS MÁS REPETIDAS (NÚMEROS DIFERENTES)")
@@ -192,16 +159,15 @@ class LotteryPairsAnalyzer:
             print(f"#{i:2d}. Pareja {num1}-{num2}: {count} veces")
             
             # Mostrar detalles de las apariciones más recientes
-            details = self.pairs_details[pair]
-            details_sorted = sorted(details, key=lambda x: datetime.strptime(x['date'], "%d-%m-%Y"), reverse=True)
+            details_sorted = self.pair_details(pair)  # Del más reciente al más antiguo
             
             print(f"     🎯 Apariciones más recientes:")
             for j, detail in enumerate(details_sorted[:3], 1):  # Mostrar solo las 3 más recientes
                 numbers_str = " - ".join(detail['complete_draw'])
                 print(f"        {j}. {detail['date']}: [{numbers_str}] (hace {detail['daysAgo']} días)")
             
-            if len(details) > 3:
-                print(f"        ... y {len(details) - 3} apariciones más")
+            if len(details_sorted) > 3:
+                print(f"        ... y {len(details_sorted) - 3} apariciones más")
             
             print()
         
@@ -262,14 +228,12 @@ class LotteryPairsAnalyzer:
             return
         
         count = self.pairs_counter[pair]
-        details = self.pairs_details[pair]
+        # Ya viene ordenado por fecha (más reciente primero)
+        details_sorted = self.pair_details(pair)
         
         print(f"✅ La pareja {pair[0]}-{pair[1]} ha salido {count} veces")
         print()
         
-        # Ordenar por fecha (más reciente primero)
-        details_sorted = sorted(details, key=lambda x: datetime.strptime(x['date'], "%d-%m-%Y"), reverse=True)
-        
         print("📅 Historial completo de apariciones:")
         for i, detail in enumerate(details_sorted, 1):
             numbers_str = " - ".join(detail['complete_draw'])
@@ -296,38 +260,27 @@ class LotteryPairsAnalyzer:
         print(f"\n⏰ PAREJAS QUE HAN SALIDO EN LOS ÚLTIMOS {days} DÍAS")
         print("=" * 60)
         
-        recent_pairs = Counter()
-        recent_details = defaultdict(list)
+        # Ventanas de 7/30/90/365 días ya calculadas; otra cantidad de días se calcula aparte
+        if self.pair_windows is None or days not in self.pair_windows.windows:
+            draws = {draw['date']: draw['numbers'] for draw in reversed(self.combinations_history)}
+            self.pair_windows = PairWindows.from_draws(draws, windows=sorted({days, *WINDOWS}))
         
-        for draw in self.combinations_history:
-            if draw['daysAgo'] <= days:
-                drawn_numbers = draw['numbers']
-                
-                # Generar parejas del sorteo
-                for pair in combinations(drawn_numbers, 2):
-                    sorted_pair = tuple(sorted(pair))
-                    recent_pairs[sorted_pair] += 1
-                    recent_details[sorted_pair].append({
-                        'date': draw['date'],
-                        'complete_draw': drawn_numbers,
-                        'daysAgo': draw['daysAgo']
-                    })
+        recent_pairs = self.pair_windows.top_pairs(days, 15)
         
         if not recent_pairs:
             print(f"❌ No se encontraron parejas en los últimos {days} días")
             return
         
-        print(f"✅ Se encontraron {len(recent_pairs)} parejas únicas en los últimos {days} días")
+        print(f"✅ Se encontraron {len(self.pair_windows.counts[days])} parejas únicas en los últimos {days} días")
         print()
         
         # Mostrar parejas ordenadas por frecuencia
-        for i, (pair, count) in enumerate(recent_pairs.most_common(15), 1):
+        for i, (pair, count) in enumerate(recent_pairs, 1):
             num1, num2 = pair
             print(f"#{i:2d}. Pareja {num1}-{num2}: {count} veces")
             
-            # Mostrar fechas
-            details = recent_details[pair]
-            dates = [d['date'] for d in sorted(details, key=lambda x: x['daysAgo'])]
+            # Mostrar fechas (más reciente primero)
+            dates = self.pair_windows.pair_dates(days, pair)
             print(f"     📅 Fechas: {', '.join(dates)}")
             print()
     
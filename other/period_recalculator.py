@@ -1,7 +1,12 @@
 import json
 import os
+import sys
 from datetime import datetime
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lottery_core.dates import to_datetime, to_ordinal
+
 # Configuración
 LOTTERY_NAME = "Pega_3_Mas"  # Cambia este nombre según la lotería que quieras actualizar
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -50,27 +55,26 @@ def format_time_period(days):
 
 def calculate_analysis_period(numbers_data):
     """Calcular el período real de análisis basado en los datos históricos"""
-    oldest_date = None
-    newest_date = None
+    oldest_ordinal = None
+    newest_ordinal = None
     
+    # Las fechas se comparan como ordinales de día (lottery_core.dates); cada fecha distinta se parsea una vez
     for num_data in numbers_data.values():
-        if num_data.get("history") and len(num_data["history"]) > 0:
-            for entry in num_data["history"]:
-                try:
-                    entry_date = datetime.strptime(entry["date"], "%d-%m-%Y")
-                    
-                    if oldest_date is None or entry_date < oldest_date:
-                        oldest_date = entry_date
-                    
-                    if newest_date is None or entry_date > newest_date:
-                        newest_date = entry_date
-                        
-                except ValueError:
-                    continue  # Saltar fechas con formato inválido
+        for entry in num_data.get("history") or []:
+            try:
+                entry_ordinal = to_ordinal(entry["date"])
+            except ValueError:
+                continue  # Saltar fechas con formato inválido
+            
+            if oldest_ordinal is None or entry_ordinal < oldest_ordinal:
+                oldest_ordinal = entry_ordinal
+            
+            if newest_ordinal is None or entry_ordinal > newest_ordinal:
+                newest_ordinal = entry_ordinal
     
-    if oldest_date and newest_date:
-        analysis_days = (newest_date - oldest_date).days + 1  # +1 para incluir ambos días
-        return analysis_days, oldest_date, newest_date
+    if oldest_ordinal is not None and newest_ordinal is not None:
+        analysis_days = newest_ordinal - oldest_ordinal + 1  # +1 para incluir ambos días
+        return analysis_days, to_datetime(oldest_ordinal), to_datetime(newest_ordinal)
     else:
         # Si no hay datos históricos, usar un valor predeterminado
         return 0, None, None
@@ -6,158 +6,154 @@ Incluye simulación de jugadas con todas las combinaciones posibles
 Ejecutar desde la carpeta raíz del proyecto donde está la carpeta json_Datos/
 """
 
-import json
 import os
-from datetime import datetime, timedelta
-from collections import defaultdict
+import sys
+from datetime import datetime
+from bisect import bisect_left
+from collections import Counter, defaultdict, deque
 from itertools import combinations
+from math import comb
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lottery_core.dates import from_ordinal, to_ordinal
+from lottery_core.matrix import load_draw_matrix
 
 def parse_date(date_str):
-    """Convertir string de fecha a objeto datetime"""
+    """Convertir string de fecha a ordinal de día (None si no es válida)"""
     try:
-        day, month, year = date_str.split('-')
-        return datetime(int(year), int(month), int(day))
-    except:
+        return to_ordinal(date_str)
+    except ValueError:
         return None
 
 def days_difference(date1, date2):
-    """Calcular diferencia en días entre dos fechas"""
-    return abs((date2 - date1).days)
+    """Calcular diferencia en días entre dos fechas (ordinales de día)"""
+    return abs(date2 - date1)
 
-def create_number_appearances_map(lottery_data):
-    """Crear mapa de apariciones de números con fechas ordenadas"""
-    appearances_map = {}
-    
-    for number, data in lottery_data['numbers'].items():
-        if 'history' in data and data['history']:
-            date_map = {}
-            
-            for entry in data['history']:
-                date_key = entry['date']
-                if date_key not in date_map:
-                    date_obj = parse_date(entry['date'])
-                    if date_obj:
-                        date_map[date_key] = {
-                            'date': entry['date'],
-                            'dateObj': date_obj,
-                            'positions': [entry['position']],
-                            'daysAgo': entry['daysAgo']
-                        }
-                else:
-                    if entry['position'] not in date_map[date_key]['positions']:
-                        date_map[date_key]['positions'].append(entry['position'])
-            
-            unique_appearances = list(date_map.values())
-            unique_appearances.sort(key=lambda x: x['dateObj'], reverse=True)
-            
-            if unique_appearances:
-                appearances_map[number] = unique_appearances
-    
-    return appearances_map
+def create_number_appearances_map(matrix):
+    """Crear mapa de apariciones de números con fechas ordenadas (a partir de la matriz de sorteos)"""
+    appearances_map = defaultdict(list)
+    dates = matrix.dates
+    today = datetime.now().toordinal()
+    
+    # Del sorteo más reciente al más antiguo: cada lista queda ordenada por fecha descendente
+    for index in range(len(matrix) - 1, -1, -1):
+        date_ordinal = int(matrix.ordinals[index])
+        by_number = {}
+        for position, number in enumerate(matrix.numbers(index), 1):
+            if number not in by_number:
+                by_number[number] = {
+                    'date': dates[index],
+                    'ordinal': date_ordinal,
+                    'positions': [],
+                    'daysAgo': today - date_ordinal
+                }
+                appearances_map[number].append(by_number[number])
+            by_number[number]['positions'].append(position)
+    
+    return dict(appearances_map)
 
-def get_winning_numbers_for_date(date, number_appearances):
-    """Obtener números ganadores para una fecha específica"""
-    winning_numbers = []
+def group_winning_numbers_by_date(number_appearances):
+    """Números ganadores de todas las fechas en una sola pasada: {fecha: [{'number', 'positions'}]}"""
+    winners_by_date = defaultdict(list)
     
     for number, appearances in number_appearances.items():
         for appearance in appearances:
-            if appearance['date'] == date:
-                winning_numbers.append({
-                    'number': number,
-                    'positions': appearance['positions']
-                })
-                break
+            winners_by_date[appearance['date']].append({
+                'number': number,
+                'positions': appearance['positions']
+            })
     
-    return winning_numbers
+    return winners_by_date
 
-def find_valid_candidates_for_number(number, appearances, target_date):
-    """Encontrar candidatos válidos para un número específico en una fecha objetivo"""
+def candidates_for_number_at(number, seen, target_date):
+    """Candidatos de un número en una fecha a partir de sus apariciones anteriores
+    
+    Un candidato es un número que salió dos veces con 10 días o menos de
+    diferencia y aún espera la tercera (hasta 10 días después de la segunda).
+    Solo influyen las apariciones de los últimos 10 días antes de la fecha (y
+    la anterior a cada una), así que el costo no crece con el historial.
+    
+    Args:
+        number (str): Número
+        seen (list): Ordinales de las apariciones anteriores a target_date, de la más antigua a la más reciente
+        target_date (int): Ordinal de la fecha objetivo
+    """
     candidates = []
-    completed_patterns = []
+    window_start = bisect_left(seen, target_date - 10)
+    used_thirds = set()
     
-    for i in range(len(appearances) - 1):
-        first_appearance = appearances[i]
+    # De la aparición más reciente a la más antigua dentro de la ventana
+    for index in range(len(seen) - 1, window_start - 1, -1):
+        second = seen[index]
+        if index == 0 or second - seen[index - 1] > 10:
+            continue
+        first = seen[index - 1]
         
-        for j in range(i + 1, len(appearances)):
-            second_appearance = appearances[j]
-            days_between = days_difference(first_appearance['dateObj'], second_appearance['dateObj'])
-            
-            if days_between <= 10:
-                # Ordenar cronológicamente
-                if first_appearance['dateObj'] > second_appearance['dateObj']:
-                    chrono_first = second_appearance
-                    chrono_second = first_appearance
-                else:
-                    chrono_first = first_appearance
-                    chrono_second = second_appearance
-                
-                # Verificar si ya fue usado
-                is_already_used = any(
-                    pattern['firstDate'] == chrono_first['date'] and pattern['secondDate'] == chrono_second['date']
-                    for pattern in completed_patterns
-                )
-                
-                if is_already_used:
-                    continue
-                
-                # Buscar tercera aparición
-                third_appearance = None
-                for k in range(len(appearances)):
-                    potential_third = appearances[k]
-                    days_from_second = days_difference(chrono_second['dateObj'], potential_third['dateObj'])
-                    
-                    if (potential_third['dateObj'] > chrono_second['dateObj'] and 
-                        potential_third['dateObj'] < target_date and 
-                        days_from_second <= 10):
-                        
-                        is_used_in_completed = any(
-                            pattern.get('thirdDate') == potential_third['date']
-                            for pattern in completed_patterns
-                        )
-                        
-                        if not is_used_in_completed:
-                            third_appearance = potential_third
-                            break
-                
-                if third_appearance:
-                    # Patrón completado
-                    completed_pattern = {
-                        'number': number,
-                        'firstDate': chrono_first['date'],
-                        'secondDate': chrono_second['date'],
-                        'thirdDate': third_appearance['date'],
-                        'completed': True
-                    }
-                    completed_patterns.append(completed_pattern)
-                else:
-                    # Verificar si está activo
-                    days_since_second = days_difference(chrono_second['dateObj'], target_date)
-                    
-                    if target_date > chrono_second['dateObj'] and days_since_second <= 10:
-                        candidates.append({
-                            'number': number,
-                            'firstDate': chrono_first['date'],
-                            'secondDate': chrono_second['date'],
-                            'daysSinceSecond': days_since_second,
-                            'daysRemaining': max(0, 10 - days_since_second)
-                        })
-                
-                break
+        # La tercera aparición es la más reciente entre la segunda y la fecha que no completó otro patrón
+        third = next((ordinal for ordinal in reversed(seen[index + 1:]) if ordinal not in used_thirds), None)
+        if third is not None:
+            used_thirds.add(third)
+            continue
+        
+        days_since_second = target_date - second
+        candidates.append({
+            'number': number,
+            'firstDate': from_ordinal(first),
+            'secondDate': from_ordinal(second),
+            'daysSinceSecond': days_since_second,
+            'daysRemaining': max(0, 10 - days_since_second)
+        })
     
     return candidates
 
+def build_candidates_timeline(number_appearances, target_dates):
+    """Candidatos activos en cada fecha con un solo barrido cronológico
+    
+    Las apariciones se van añadiendo a medida que avanza la fecha, de modo que
+    cada fecha solo revisa los números que salieron en los últimos 10 días.
+    
+    Args:
+        number_appearances (dict): Mapa de apariciones (create_number_appearances_map)
+        target_dates (list): Ordinales de las fechas a evaluar
+    
+    Returns:
+        dict: {ordinal: [candidatos activos]} para cada fecha de target_dates
+    """
+    # Apariciones de todos los números en orden cronológico
+    events = sorted(
+        (appearance['ordinal'], number)
+        for number, appearances in number_appearances.items()
+        for appearance in appearances
+    )
+    seen = {number: [] for number in number_appearances}
+    recent = deque()  # (ordinal, número) de los últimos 10 días
+    next_event = 0
+    timeline = {}
+    
+    for target_date in sorted(set(target_dates)):
+        # Añadir las apariciones anteriores a la fecha y descartar las de hace más de 10 días
+        while next_event < len(events) and events[next_event][0] < target_date:
+            ordinal, number = events[next_event]
+            seen[number].append(ordinal)
+            recent.append((ordinal, number))
+            next_event += 1
+        while recent and recent[0][0] < target_date - 10:
+            recent.popleft()
+        
+        active_numbers = {number for _, number in recent}
+        active_candidates = []
+        # En el orden del mapa de apariciones, como la búsqueda número a número
+        for number in number_appearances:
+            if number in active_numbers:
+                active_candidates.extend(candidates_for_number_at(number, seen[number], target_date))
+        timeline[target_date] = active_candidates
+    
+    return timeline
+
 def get_candidates_at_date(target_date, number_appearances):
     """Obtener candidatos activos en una fecha específica"""
-    active_candidates = []
-    
-    for number, appearances in number_appearances.items():
-        if len(appearances) < 2:
-            continue
-        
-        candidates_for_number = find_valid_candidates_for_number(number, appearances, target_date)
-        active_candidates.extend(candidates_for_number)
-    
-    return active_candidates
+    return build_candidates_timeline(number_appearances, [target_date])[target_date]
 
 def check_coincidences_in_draw(winning_numbers, active_candidates):
     """Verificar coincidencias entre números ganadores y candidatos activos"""
@@ -187,12 +183,12 @@ def calculate_winnings(coincidences_count, bet_amount=10):
     else:
         return 0                        # Sin premio
 
-def generate_all_combinations(candidates, winning_numbers, bet_amount=10, debug=False):
-    """Generar todas las combinaciones posibles de 3 números de los candidatos"""
+def generate_all_combinations(candidates, winning_numbers, bet_amount=10, debug=False, ticket_size=3):
+    """Generar todas las combinaciones posibles de ticket_size números de los candidatos (modo detallado)"""
     candidate_numbers = [c['number'] if isinstance(c, dict) else c for c in candidates]
     winning_set = {w['number'] if isinstance(w, dict) else w for w in winning_numbers}
     
-    all_combinations = list(combinations(candidate_numbers, 3))
+    all_combinations = list(combinations(candidate_numbers, ticket_size))
     bet_results = []
     
     if debug:
@@ -201,7 +197,7 @@ def generate_all_combinations(candidates, winning_numbers, bet_amount=10, debug=
         print(f"Ganadores: {list(winning_set)}")
         print(f"Total combinaciones: {len(all_combinations)}")
     
-    coincidence_count = {0: 0, 1: 0, 2: 0, 3: 0}
+    coincidence_count = {k: 0 for k in range(ticket_size + 1)}
     
     for combo in all_combinations:
         coincidences = len(set(combo) & winning_set)
@@ -216,15 +212,84 @@ def generate_all_combinations(candidates, winning_numbers, bet_amount=10, debug=
         })
     
     if debug:
-        for i in range(4):
+        for i in range(ticket_size + 1):
             if coincidence_count[i] > 0:
                 print(f"  {i} coincidencias: {coincidence_count[i]} combinaciones")
-                if i == 3:
-                    triple_combos = [bet['combination'] for bet in bet_results if bet['coincidences'] == 3]
+                if i == ticket_size:
+                    triple_combos = [bet['combination'] for bet in bet_results if bet['coincidences'] == ticket_size]
                     print(f"    Combinaciones ganadoras: {triple_combos}")
     
     return bet_results
 
+def combination_hits_distribution(candidate_numbers, winning_set, ticket_size=3):
+    """Cantidad de combinaciones de ticket_size candidatos con k aciertos, sin enumerarlas
+    
+    Con c candidatos distintos de los que h salieron, las combinaciones con k
+    aciertos son C(h, k) * C(c - h, ticket_size - k) (reparto hipergeométrico).
+    Si un número aparece repetido entre los candidatos (varios patrones
+    activos), cada ganador con m copias aporta C(m, r) formas de elegir r de
+    ellas y cuenta como un solo acierto, igual que en el modo detallado.
+    
+    Returns:
+        dict: {k: combinaciones} para k de 0 a ticket_size
+    """
+    multiplicity = Counter(candidate_numbers)
+    misses = sum(count for number, count in multiplicity.items() if number not in winning_set)
+    
+    # ways[k][t]: formas de elegir t posiciones entre los ganadores que cubren k ganadores distintos
+    ways = [[1] + [0] * ticket_size]
+    for number, count in multiplicity.items():
+        if number not in winning_set:
+            continue
+        extended = [[0] * (ticket_size + 1) for _ in range(len(ways) + 1)]
+        for k, row in enumerate(ways):
+            for t, total in enumerate(row):
+                if not total:
+                    continue
+                extended[k][t] += total
+                for r in range(1, min(count, ticket_size - t) + 1):
+                    extended[k + 1][t + r] += total * comb(count, r)
+        ways = extended
+    
+    distribution = {k: 0 for k in range(ticket_size + 1)}
+    for k, row in enumerate(ways):
+        if k <= ticket_size:
+            distribution[k] = sum(total * comb(misses, ticket_size - t) for t, total in enumerate(row))
+    return distribution
+
+def summarize_bets(distribution, bet_amount=10):
+    """Resumen de las apuestas de un sorteo a partir de {aciertos: combinaciones}"""
+    summary = {
+        'total_combinations': sum(distribution.values()),
+        'winnings': 0,
+        'winning_bets': 0,
+        'losing_bets': 0,
+        'break_even_bets': 0,
+        'winning_bets_amount': 0,  # Premios de las apuestas con ganancia neta
+        'coincidences_breakdown': dict(distribution)
+    }
+    
+    for coincidences, count in distribution.items():
+        winnings = calculate_winnings(coincidences, bet_amount)
+        summary['winnings'] += winnings * count
+        if winnings > bet_amount:
+            summary['winning_bets'] += count
+            summary['winning_bets_amount'] += winnings * count
+        elif winnings < bet_amount:
+            summary['losing_bets'] += count
+        else:
+            summary['break_even_bets'] += count
+    
+    summary['invested'] = summary['total_combinations'] * bet_amount
+    summary['net_result'] = summary['winnings'] - summary['invested']
+    return summary
+
+def evaluate_combinations(candidates, winning_numbers, bet_amount=10, ticket_size=3):
+    """Resultado exacto de apostar todas las combinaciones de ticket_size candidatos (sin generarlas)"""
+    candidate_numbers = [c['number'] if isinstance(c, dict) else c for c in candidates]
+    winning_set = {w['number'] if isinstance(w, dict) else w for w in winning_numbers}
+    return summarize_bets(combination_hits_distribution(candidate_numbers, winning_set, ticket_size), bet_amount)
+
 def debug_combination_calculation(candidates, winning_numbers, bet_amount=10):
     """Función de debug para verificar cálculos de combinaciones"""
     print(f"\n🔍 DEBUG - Análisis detallado:")
@@ -276,8 +341,12 @@ def debug_combination_calculation(candidates, winning_numbers, bet_amount=10):
     
     return bet_results
 
-def simulate_betting_strategy(sorteos_with_six_or_less, bet_amount=10, debug=False):
-    """Simular la estrategia de apuestas para todos los sorteos con 6 candidatos o menos"""
+def simulate_betting_strategy(sorteos_with_six_or_less, bet_amount=10, debug=False, ticket_size=3, itemized=False):
+    """Simular la estrategia de apuestas para todos los sorteos con 6 candidatos o menos
+    
+    Cada sorteo se evalúa con combination_hits_distribution; con itemized=True
+    (o en los sorteos de debug) se generan todas las combinaciones una a una.
+    """
     simulation_results = {
         'bet_amount': bet_amount,
         'total_sorteos': 0,
@@ -288,7 +357,7 @@ def simulate_betting_strategy(sorteos_with_six_or_less, bet_amount=10, debug=Fal
         'winning_bets': 0,
         'losing_bets': 0,
         'break_even_bets': 0,
-        'results_by_coincidences': {0: 0, 1: 0, 2: 0, 3: 0},
+        'results_by_coincidences': {k: 0 for k in range(ticket_size + 1)},
         'detailed_results': []
     }
     
@@ -305,54 +374,45 @@ def simulate_betting_strategy(sorteos_with_six_or_less, bet_amount=10, debug=Fal
             print(f"\n📅 SORTEO DEBUG {debug_count + 1}: {sorteo['date']}")
             debug_count += 1
         
-        # Generar todas las combinaciones posibles
-        bet_results = generate_all_combinations(candidates, winning_numbers, bet_amount, show_debug)
-        
-        # Calcular estadísticas para este sorteo
-        sorteo_invested = len(bet_results) * bet_amount
-        sorteo_winnings = sum(bet['winnings'] for bet in bet_results)
-        sorteo_net = sorteo_winnings - sorteo_invested
-        
-        # Contar tipos de apuestas
-        winning_bets = sum(1 for bet in bet_results if bet['net_result'] > 0)
-        losing_bets = sum(1 for bet in bet_results if bet['net_result'] < 0)
-        break_even_bets = sum(1 for bet in bet_results if bet['net_result'] == 0)
-        
-        # Contar por coincidencias
-        coincidences_count = {0: 0, 1: 0, 2: 0, 3: 0}
-        for bet in bet_results:
-            coincidences_count[bet['coincidences']] += 1
+        if itemized or show_debug:
+            # Generar todas las combinaciones posibles
+            bet_results = generate_all_combinations(candidates, winning_numbers, bet_amount, show_debug, ticket_size)
+            distribution = Counter(bet['coincidences'] for bet in bet_results)
+            summary = summarize_bets({k: distribution[k] for k in range(ticket_size + 1)}, bet_amount)
+        else:
+            summary = evaluate_combinations(candidates, winning_numbers, bet_amount, ticket_size)
         
         if show_debug:
-            print(f"  💰 Invertido: RD${sorteo_invested:,}, Ganado: RD${sorteo_winnings:,}, Neto: RD${sorteo_net:,}")
+            print(f"  💰 Invertido: RD${summary['invested']:,}, Ganado: RD${summary['winnings']:,}, Neto: RD${summary['net_result']:,}")
         
         # Guardar resultado detallado
         sorteo_result = {
             'date': sorteo['date'],
             'candidates': sorteo['candidatesAtTime'],
             'winning_numbers': sorteo['winningNumbers'],
-            'total_combinations': len(bet_results),
-            'invested': sorteo_invested,
-            'winnings': sorteo_winnings,
-            'net_result': sorteo_net,
-            'winning_bets': winning_bets,
-            'losing_bets': losing_bets,
-            'break_even_bets': break_even_bets,
-            'coincidences_breakdown': coincidences_count
+            'total_combinations': summary['total_combinations'],
+            'invested': summary['invested'],
+            'winnings': summary['winnings'],
+            'net_result': summary['net_result'],
+            'winning_bets': summary['winning_bets'],
+            'losing_bets': summary['losing_bets'],
+            'break_even_bets': summary['break_even_bets'],
+            'winning_bets_amount': summary['winning_bets_amount'],
+            'coincidences_breakdown': summary['coincidences_breakdown']
         }
         
         simulation_results['detailed_results'].append(sorteo_result)
         
         # Acumular totales
         simulation_results['total_sorteos'] += 1
-        simulation_results['total_combinations'] += len(bet_results)
-        simulation_results['total_invested'] += sorteo_invested
-        simulation_results['total_winnings'] += sorteo_winnings
-        simulation_results['winning_bets'] += winning_bets
-        simulation_results['losing_bets'] += losing_bets
-        simulation_results['break_even_bets'] += break_even_bets
-        
-        for coincidences, count in coincidences_count.items():
+        simulation_results['total_combinations'] += summary['total_combinations']
+        simulation_results['total_invested'] += summary['invested']
+        simulation_results['total_winnings'] += summary['winnings']
+        simulation_results['winning_bets'] += summary['winning_bets']
+        simulation_results['losing_bets'] += summary['losing_bets']
+        simulation_results['break_even_bets'] += summary['break_even_bets']
+        
+        for coincidences, count in summary['coincidences_breakdown'].items():
             simulation_results['results_by_coincidences'][coincidences] += count
     
     simulation_results['net_result'] = simulation_results['total_winnings'] - simulation_results['total_invested']
@@ -386,10 +446,10 @@ def analyze_lottery_data():
     
     print(f"📁 Cargando datos desde: {json_file}")
     
-    # Cargar datos JSON
+    # Cargar los sorteos del JSON (lottery_core.matrix los memoriza por fecha de modificación)
     try:
-        with open(json_file, 'r', encoding='utf-8') as f:
-            lottery_data = json.load(f)
+        matrix = load_draw_matrix(json_file)
+        lottery_data = matrix.data
     except Exception as e:
         print(f"❌ Error al cargar el archivo JSON: {e}")
         return
@@ -402,7 +462,7 @@ def analyze_lottery_data():
     print(f"✅ Datos cargados: {lottery_data.get('lotteryName', 'Lotería desconocida')}")
     
     # Crear mapa de apariciones
-    number_appearances = create_number_appearances_map(lottery_data)
+    number_appearances = create_number_appearances_map(matrix)
     
     # Obtener todas las fechas únicas de sorteos
     all_dates = set()
@@ -413,29 +473,33 @@ def analyze_lottery_data():
     # Convertir a lista ordenada
     sorted_dates = []
     for date_str in all_dates:
-        date_obj = parse_date(date_str)
-        if date_obj:
-            sorted_dates.append({'dateStr': date_str, 'dateObj': date_obj})
+        date_ordinal = parse_date(date_str)
+        if date_ordinal:
+            sorted_dates.append({'dateStr': date_str, 'ordinal': date_ordinal})
     
-    sorted_dates.sort(key=lambda x: x['dateObj'])
+    sorted_dates.sort(key=lambda x: x['ordinal'])
     
     print(f"📊 Analizando {len(sorted_dates)} sorteos...")
     
+    # Ganadores y candidatos activos de todas las fechas, calculados en una sola pasada
+    winners_by_date = group_winning_numbers_by_date(number_appearances)
+    candidates_timeline = build_candidates_timeline(number_appearances, [d['ordinal'] for d in sorted_dates])
+    
     # Analizar cada sorteo
     all_sorteos = []
     
     for date_info in sorted_dates:
         date_str = date_info['dateStr']
-        date_obj = date_info['dateObj']
+        date_ordinal = date_info['ordinal']
         
         # Obtener números ganadores
-        winning_numbers = get_winning_numbers_for_date(date_str, number_appearances)
+        winning_numbers = winners_by_date[date_str]
         
         if not winning_numbers:
             continue
         
         # Obtener candidatos activos
-        active_candidates = get_candidates_at_date(date_obj, number_appearances)
+        active_candidates = candidates_timeline[date_ordinal]
         
         # Verificar coincidencias
         coincidences = check_coincidences_in_draw(winning_numbers, active_candidates)
@@ -612,17 +676,8 @@ def analyze_lottery_data():
     winning_pct = (simulation_results["winning_bets"] / total_bets * 100) if total_bets > 0 else 0
     
     # Calcular el monto real de ganancias (no las apuestas ganadoras)
-    total_winnings_from_winning_bets = 0
-    for res in simulation_results['detailed_results']:
-        # Para cada sorteo, sumar solo las ganancias de las apuestas ganadoras
-        candidates = [{'number': num} for num in res['candidates']]
-        winning_numbers = [{'number': num} for num in res['winning_numbers']]
-        
-        if len(candidates) >= 3:
-            bet_results = generate_all_combinations(candidates, winning_numbers, BET_AMOUNT)
-            for bet in bet_results:
-                if bet['net_result'] > 0:  # Solo apuestas ganadoras
-                    total_winnings_from_winning_bets += bet['winnings']
+    # Para cada sorteo, solo las ganancias de las apuestas ganadoras
+    total_winnings_from_winning_bets = sum(res['winning_bets_amount'] for res in simulation_results['detailed_results'])
     
     print(f'│ Ganadoras       │{simulation_results["winning_bets"]:8}  │{winning_pct:9.1f}%    │ RD${total_winnings_from_winning_bets:,}     │')
     
@@ -700,11 +755,7 @@ def analyze_lottery_data():
             # Calcular ganancia para este sorteo específico (verificar cálculo)
             candidates_for_calc = [{'number': num} for num in sorteo["candidates"]]
             winners_for_calc = [{'number': num} for num in sorteo["winners"]]
-            bet_results_for_calc = generate_all_combinations(candidates_for_calc, winners_for_calc, BET_AMOUNT)
-            
-            total_ganancia_verificada = sum(bet['winnings'] for bet in bet_results_for_calc)
-            inversion_sorteo_verificada = len(bet_results_for_calc) * BET_AMOUNT
-            ganancia_neta_verificada = total_ganancia_verificada - inversion_sorteo_verificada
+            ganancia_neta_verificada = evaluate_combinations(candidates_for_calc, winners_for_calc, BET_AMOUNT)['net_result']
             
             print(f'      Ganancia neta del sorteo: RD${ganancia_neta_verificada:,}\n')
     else:
@@ -785,18 +836,15 @@ def analyze_lottery_data():
             winners_check = [{'number': num} for num in res['winning_numbers']]
             
             if len(candidates_check) >= 3:
-                bet_results_check = generate_all_combinations(candidates_check, winners_check, BET_AMOUNT)
-                total_ganancia_real = sum(bet['winnings'] for bet in bet_results_check)
-                inversion_real = len(bet_results_check) * BET_AMOUNT
-                ganancia_neta_real = total_ganancia_real - inversion_real
+                check = evaluate_combinations(candidates_check, winners_check, BET_AMOUNT)
                 
                 sorteos_con_ganancias.append({
                     'date': res['date'],
-                    'net_result': ganancia_neta_real,
+                    'net_result': check['net_result'],
                     'candidates': len(res['candidates']),
-                    'combinations': len(bet_results_check),
-                    'invested': inversion_real,
-                    'won': total_ganancia_real
+                    'combinations': check['total_combinations'],
+                    'invested': check['invested'],
+                    'won': check['winnings']
                 })
         
         if sorteos_con_ganancias:
@@ -1,52 +1,33 @@
 import json
-import random
+import sys
 from collections import defaultdict, Counter
 from datetime import datetime
 import os
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lottery_core.dates import to_datetime
+from lottery_core.matrix import load_draw_matrix, one_hot_draws
+from lottery_core.odds import GAMES, ticket_odds
+from lottery_core.rolling import RollingFrequency
+
 # Configuración del simulador
 JSON_FILE_PATH = r"C:\Users\willi\OneDrive\Escritorio\New_Loteria_Resultados\Numeros_de_loterias_registro\json_Datos\lottery_data_super_kino.json"
-COST_PER_GAME = 25  # Costo por jugada en pesos
+COST_PER_GAME = GAMES["super_kino"]["cost"]  # Costo por jugada en pesos
 NUMBERS_TO_PLAY = 10  # Números que jugamos por sorteo
 TOTAL_NUMBERS = 80  # Rango de números (1-80)
 WINNING_NUMBERS_PER_DRAW = 20  # Números que salen por sorteo
+WALK_FORWARD = True  # Elegir los números con los sorteos anteriores a cada fecha (False = todo el historial, incluso el futuro)
+HOT_WINDOW = 0  # Sorteos anteriores que cuentan para elegir los números (0 = todos los anteriores)
+MIN_HISTORY = 100  # Sorteos de historial antes de empezar a jugar (solo con WALK_FORWARD)
 
-# Reglas de premios del Super Kino TV
-PRIZE_TABLE = {
-    10: 25_000_000,  # 10 aciertos: 25 millones
-    9: 150_000,      # 9 aciertos: 150 mil
-    8: 10_000,       # 8 aciertos: 10 mil
-    7: 1_000,        # 7 aciertos: 1 mil
-    6: 300,          # 6 aciertos: 300 pesos
-    5: 60,           # 5 aciertos: 60 pesos
-    0: 80,           # 0 aciertos: devolución de 80 pesos
-}
-
-def parse_date(date_str):
-    """Convierte string de fecha a objeto datetime"""
-    date_formats = [
-        "%Y-%m-%d",      # 2021-02-17
-        "%d/%m/%Y",      # 17/02/2021
-        "%d-%m-%Y",      # 17-02-2021
-        "%m/%d/%Y",      # 02/17/2021
-        "%m-%d-%Y",      # 02-17-2021
-        "%Y/%m/%d",      # 2021/02/17
-    ]
-    
-    for fmt in date_formats:
-        try:
-            return datetime.strptime(date_str, fmt)
-        except ValueError:
-            continue
-    
-    print(f"⚠️ Formato de fecha no reconocido: {date_str}")
-    return None
+# Reglas de premios del Super Kino TV (lottery_core.odds)
+PRIZE_TABLE = GAMES["super_kino"]["prize_table"]
 
 def load_historical_data(file_path):
-    """Carga los datos históricos del archivo JSON"""
+    """Carga los sorteos históricos del archivo JSON como matriz (lottery_core.matrix)"""
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        return load_draw_matrix(file_path)
     except FileNotFoundError:
         print(f"❌ Error: No se encontró el archivo {file_path}")
         return None
@@ -54,38 +35,21 @@ def load_historical_data(file_path):
         print(f"❌ Error: El archivo {file_path} no es un JSON válido")
         return None
 
-def extract_winning_numbers_from_history(data):
+def extract_winning_numbers_from_history(matrix):
     """Extrae los números ganadores de cada sorteo del historial"""
-    winning_draws = []
-    
-    for number, number_data in data.get("numbers", {}).items():
-        history = number_data.get("history", [])
-        
-        for entry in history:
-            date_str = entry["date"]
-            date_obj = parse_date(date_str)
-            
-            if date_obj is None:
-                continue
-            
-            # Buscar si ya tenemos un sorteo para esta fecha
-            existing_draw = next((draw for draw in winning_draws if draw["date"] == date_str), None)
-            
-            if existing_draw:
-                existing_draw["numbers"].add(int(number))
-                existing_draw["date_obj"] = date_obj
-            else:
-                winning_draws.append({
-                    "date": date_str,
-                    "date_obj": date_obj,
-                    "numbers": {int(number)}
-                })
-    
-    # Filtrar solo sorteos que tengan exactamente 20 números
-    complete_draws = [draw for draw in winning_draws if len(draw["numbers"]) == WINNING_NUMBERS_PER_DRAW]
-    
-    # Ordenar por fecha (más antiguos primero para simular cronológicamente)
-    complete_draws.sort(key=lambda x: x["date_obj"])
+    dates = matrix.dates
+    
+    # La matriz ya está ordenada del más antiguo al más reciente (para simular cronológicamente);
+    # solo sorteos con exactamente 20 números distintos
+    complete_draws = []
+    for index, row in enumerate(matrix.draws.tolist()):
+        numbers = set(row)
+        if len(numbers) == WINNING_NUMBERS_PER_DRAW:
+            complete_draws.append({
+                "date": dates[index],
+                "date_obj": to_datetime(int(matrix.ordinals[index])),
+                "numbers": numbers
+            })
     
     return complete_draws
 
@@ -105,6 +69,17 @@ def get_most_frequent_numbers(winning_draws, top_count=10):
     
     return [num for num, freq in most_frequent], dict(number_frequencies)
 
+def get_hot_numbers_by_draw(winning_draws, top_count=10, window=HOT_WINDOW):
+    """Los top_count números más frecuentes antes de cada sorteo (sin ver ese sorteo ni los siguientes)
+    
+    Returns:
+        list: Para cada sorteo, sus números calientes de más a menos frecuente
+    """
+    one_hot = one_hot_draws([sorted(draw["numbers"]) for draw in winning_draws], TOTAL_NUMBERS + 1)
+    rolling = RollingFrequency(one_hot)
+    hot_numbers = rolling.top_k(top_count, window, numbers=list(range(1, TOTAL_NUMBERS + 1)))
+    return hot_numbers[:len(winning_draws)].tolist()
+
 def count_matches(played_numbers, winning_numbers):
     """Cuenta las coincidencias entre números jugados y ganadores"""
     return len(played_numbers.intersection(winning_numbers))
@@ -124,8 +99,6 @@ def run_simulation(historical_data):
         print("❌ No se encontraron sorteos válidos en los datos históricos")
         return None
     
-    total_draws = len(winning_draws)
-    
     # Obtener los 10 números más frecuentes
     most_frequent_numbers, all_frequencies = get_most_frequent_numbers(winning_draws, NUMBERS_TO_PLAY)
     
@@ -133,21 +106,43 @@ def run_simulation(historical_data):
         print(f"❌ Error: Solo se encontraron {len(most_frequent_numbers)} números únicos")
         return None
     
+    if WALK_FORWARD:
+        # Cada sorteo se juega con los números calientes de los sorteos anteriores
+        hot_numbers_by_draw = get_hot_numbers_by_draw(winning_draws, NUMBERS_TO_PLAY, HOT_WINDOW)[MIN_HISTORY:]
+        winning_draws = winning_draws[MIN_HISTORY:]
+        if not winning_draws:
+            print(f"❌ Se necesitan más de {MIN_HISTORY} sorteos para jugar con historial previo")
+            return None
+    else:
+        hot_numbers_by_draw = [most_frequent_numbers] * len(winning_draws)
+    
+    total_draws = len(winning_draws)
+    
     print(f"📊 Sorteos encontrados: {total_draws}")
     print(f"💰 Costo por jugada: ${COST_PER_GAME}")
-    print(f"🎯 Estrategia: Siempre jugar los {NUMBERS_TO_PLAY} números más frecuentes")
+    if WALK_FORWARD:
+        window_text = f"los últimos {HOT_WINDOW} sorteos" if HOT_WINDOW else "todos los sorteos anteriores"
+        print(f"🎯 Estrategia: Jugar los {NUMBERS_TO_PLAY} números más frecuentes en {window_text} a cada fecha")
+        print(f"📚 Historial inicial: {MIN_HISTORY} sorteos (no se juegan)")
+    else:
+        print(f"🎯 Estrategia: Siempre jugar los {NUMBERS_TO_PLAY} números más frecuentes")
     print("-" * 70)
     
     # Mostrar los números más frecuentes que se van a jugar
-    print("🔥 NÚMEROS MÁS FRECUENTES SELECCIONADOS:")
+    if WALK_FORWARD:
+        print("🔥 NÚMEROS MÁS FRECUENTES DE TODO EL HISTORIAL (solo referencia):")
+    else:
+        print("🔥 NÚMEROS MÁS FRECUENTES SELECCIONADOS:")
     print("-" * 50)
     for i, num in enumerate(most_frequent_numbers, 1):
         freq = all_frequencies[num]
         percentage = (freq / sum(all_frequencies.values())) * 100
         print(f"{i:2d}. Número {num:2d}: {freq:,} apariciones ({percentage:.1f}%)")
     
-    played_numbers_set = set(most_frequent_numbers)
-    print(f"\n🎮 Números a jugar siempre: {sorted(most_frequent_numbers)}")
+    if WALK_FORWARD:
+        print(f"\n🎮 Números jugados en el último sorteo: {sorted(hot_numbers_by_draw[-1])}")
+    else:
+        print(f"\n🎮 Números a jugar siempre: {sorted(most_frequent_numbers)}")
     print("-" * 70)
     
     # Contadores para estadísticas
@@ -161,6 +156,7 @@ def run_simulation(historical_data):
     # Simular cada sorteo
     for i, draw in enumerate(winning_draws):
         winning_numbers = draw["numbers"]
+        played_numbers_set = set(hot_numbers_by_draw[i])
         
         # Contar aciertos
         matches = count_matches(played_numbers_set, winning_numbers)
@@ -178,7 +174,7 @@ def run_simulation(historical_data):
         detailed_results.append({
             "draw_number": i + 1,
             "date": draw["date"],
-            "played": sorted(most_frequent_numbers),
+            "played": sorted(played_numbers_set),
             "winning": sorted(list(winning_numbers)),
             "matches": matches,
             "prize": prize,
@@ -276,6 +272,21 @@ def run_simulation(historical_data):
     avg_matches = total_matches / total_draws if total_draws > 0 else 0
     print(f"\n📊 Promedio de aciertos por sorteo: {avg_matches:.2f}")
     
+    # La estrategia se compara con el resultado exacto de una jugada aleatoria (sin simularla)
+    odds = ticket_odds(PRIZE_TABLE, NUMBERS_TO_PLAY, WINNING_NUMBERS_PER_DRAW, TOTAL_NUMBERS, COST_PER_GAME)
+    expected_matches = sum(k * p for k, p in enumerate(odds["distribution"]))
+    expected_net = odds["expected_net"] * total_draws
+    net_std = odds["std"] * total_draws ** 0.5
+    net_z = (total_net - expected_net) / net_std if net_std else 0
+    
+    print(f"\n🧮 COMPARACIÓN CON UNA JUGADA ALEATORIA (VALOR EXACTO):")
+    print("-" * 50)
+    print(f"Aciertos esperados por sorteo: {expected_matches:.2f} (estrategia: {avg_matches:.2f})")
+    print(f"Retorno al jugador esperado:   {odds['rtp'] * 100:.2f}% "
+          f"(estrategia: {total_won / total_spent * 100 if total_spent else 0:.2f}%)")
+    print(f"Balance esperado:              ${expected_net:,.0f} (± ${net_std:,.0f})")
+    print(f"Balance de la estrategia:      ${total_net:,} ({net_z:+.2f} desviaciones estándar)")
+    
     return {
         "total_draws": total_draws,
         "most_frequent_numbers": most_frequent_numbers,
@@ -286,6 +297,8 @@ def run_simulation(historical_data):
         "net_result": total_net,
         "roi_percentage": roi_percentage,
         "average_matches": avg_matches,
+        "expected_net_random": expected_net,
+        "net_z": net_z,
         "detailed_results": detailed_results
     }
 
@@ -297,7 +310,7 @@ def main():
         return
     
     historical_data = load_historical_data(JSON_FILE_PATH)
-    if not historical_data:
+    if historical_data is None:
         return
     
     results = run_simulation(historical_data)
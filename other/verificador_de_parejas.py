@@ -1,7 +1,15 @@
 import json
 import os
+import sys
+import time
 from datetime import datetime
-from collections import defaultdict
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lottery_core.bitindex import load_all_bit_indexes, load_bit_index
+from lottery_core.dates import from_ordinal
+from lottery_core.matrix import load_draw_matrix
+from lottery_core.registry import get_lottery
 
 class LotteryChecker:
     def __init__(self, json_file_path):
@@ -14,6 +22,7 @@ class LotteryChecker:
         self.json_file_path = json_file_path
         self.lottery_data = None
         self.combinations_history = []
+        self.bit_index = None  # Bitset por número sobre combinations_history (lottery_core.bitindex)
         
     def load_data(self):
         """Cargar datos del archivo JSON"""
@@ -41,78 +50,55 @@ class LotteryChecker:
         if not self.lottery_data:
             return
             
-        # Diccionario para agrupar por fecha
-        draws_by_date = defaultdict(list)
-        
-        # Recorrer todos los números y su historial
-        for number, data in self.lottery_data.get('numbers', {}).items():
-            history = data.get('history', [])
-            
-            for entry in history:
-                date = entry['date']
-                position = entry['position']
-                draws_by_date[date].append({
-                    'number': number,
-                    'position': position
-                })
+        # Sorteos completos reconstruidos desde el JSON una sola vez por sesión (lottery_core.matrix)
+        matrix = load_draw_matrix(self.json_file_path)
+        today = datetime.now().toordinal()
         
-        # Ordenar cada sorteo por posición y crear las combinaciones
-        for date, numbers in draws_by_date.items():
-            # Ordenar por posición
-            numbers_sorted = sorted(numbers, key=lambda x: x['position'])
-            
-            # Extraer solo los números en orden
-            drawn_numbers = [item['number'] for item in numbers_sorted]
-            
-            if len(drawn_numbers) >= 2:  # Asegurar que hay al menos 2 números
-                self.combinations_history.append({
-                    'date': date,
-                    'numbers': drawn_numbers,
-                    'daysAgo': numbers_sorted[0].get('daysAgo', 0)
-                })
+        # Del más reciente al más antiguo
+        for index in range(len(matrix) - 1, -1, -1):
+            ordinal = int(matrix.ordinals[index])
+            self.combinations_history.append({
+                'date': from_ordinal(ordinal),
+                'numbers': matrix.numbers(index),
+                'daysAgo': today - ordinal
+            })
         
-        # Ordenar por fecha (más reciente primero)
-        self.combinations_history.sort(key=lambda x: datetime.strptime(x['date'], "%d-%m-%Y"), reverse=True)
+        # Mismo orden que combinations_history: el bit 0 es el sorteo más reciente
+        self.bit_index = load_bit_index(self.json_file_path)
         
         print(f"🎲 Se construyeron {len(self.combinations_history)} sorteos del historial")
     
-    def check_combination(self, num1, num2):
+    def check_combination(self, *numbers):
         """
-        Verificar si una combinación de 2 números ha salido
+        Verificar si una combinación de 2 (o más) números ha salido
         
         Args:
-            num1 (str): Primer número (formato "XX")
-            num2 (str): Segundo número (formato "XX")
+            *numbers (str): Números de la combinación (formato "XX")
         """
         if not self.lottery_data:
             print("❌ Primero debes cargar los datos")
             return
         
         # Asegurar formato de 2 dígitos
-        num1 = str(num1).zfill(2)
-        num2 = str(num2).zfill(2)
+        numbers = [str(num).zfill(2) for num in numbers]
         
-        print(f"\n🔍 Buscando combinación: {num1} y {num2}")
+        print(f"\n🔍 Buscando combinación: {' y '.join(numbers)}")
         print("=" * 50)
         
         matches = []
         
-        # Buscar en el historial de combinaciones
-        for draw in self.combinations_history:
+        # AND de los bitsets de los números: solo se recorren los sorteos donde salieron todos
+        for index in self.bit_index.indices(*numbers):
+            draw = self.combinations_history[index]
             drawn_numbers = draw['numbers']
+            positions = [f"{num} en posición {drawn_numbers.index(num) + 1}" for num in numbers]
             
-            # Verificar si ambos números están en el sorteo (sin importar orden)
-            if num1 in drawn_numbers and num2 in drawn_numbers:
-                # Encontrar las posiciones
-                pos1 = drawn_numbers.index(num1) + 1
-                pos2 = drawn_numbers.index(num2) + 1
-                
-                matches.append({
-                    'date': draw['date'],
-                    'numbers': drawn_numbers,
-                    'positions': f"{num1} en posición {pos1}, {num2} en posición {pos2}",
-                    'daysAgo': draw.get('daysAgo', 0)
-                })
+            matches.append({
+                'date': draw['date'],
+                'numbers': drawn_numbers,
+                'positions': ", ".join(positions),
+                'daysAgo': draw.get('daysAgo', 0)
+            })
         
         # Mostrar resultados
         if matches:
@@ -134,17 +120,17 @@ class LotteryChecker:
             print(f"   • Aparición más reciente: {most_recent['date']} (hace {most_recent['daysAgo']} días)")
             
         else:
-            print(f"❌ La combinación {num1} y {num2} NO ha salido juntos")
+            print(f"❌ La combinación {' y '.join(numbers)} NO ha salido juntos")
             
             # Verificar si los números han salido por separado
-            self.check_individual_numbers(num1, num2)
+            self.check_individual_numbers(*numbers)
     
-    def check_individual_numbers(self, num1, num2):
+    def check_individual_numbers(self, *numbers):
         """Verificar información individual de cada número"""
         print(f"\n📋 Información individual de los números:")
         print("-" * 40)
         
-        for num in [num1, num2]:
+        for num in numbers:
             if num in self.lottery_data.get('numbers', {}):
                 data = self.lottery_data['numbers'][num]
                 last_seen = data.get('lastSeen')
@@ -193,34 +179,20 @@ class LotteryChecker:
         while True:
             print(f"\n{'='*60}")
             print("Opciones:")
-            print("1. Verificar combinación de 2 números")
+            print("1. Verificar combinación de 2 o más números")
             print("2. Ver últimos sorteos")
-            print("3. Salir")
+            print("3. Buscar combinación en todas las loterías")
+            print("4. Salir")
             print("-" * 30)
             
             try:
-                choice = input("Selecciona una opción (1-3): ").strip()
+                choice = input("Selecciona una opción (1-4): ").strip()
                 
                 if choice == '1':
                     print("\n🔍 Verificar combinación:")
-                    num1 = input("Ingresa el primer número (00-99): ").strip()
-                    num2 = input("Ingresa el segundo número (00-99): ").strip()
-                    
-                    # Validar entrada
-                    try:
-                        n1 = int(num1)
-                        n2 = int(num2)
-                        
-                        if 0 <= n1 <= 99 and 0 <= n2 <= 99:
-                            if n1 != n2:
-                                self.check_combination(num1, num2)
-                            else:
-                                print("❌ Los números deben ser diferentes")
-                        else:
-                            print("❌ Los números deben estar entre 00 y 99")
-                            
-                    except ValueError:
-                        print("❌ Ingresa números válidos")
+                    numbers = read_numbers("Ingresa los números separados por espacios o comas (00-99): ")
+                    if numbers:
+                        self.check_combination(*numbers)
                 
                 elif choice == '2':
                     limit = input("¿Cuántos sorteos mostrar? (por defecto 10): ").strip()
@@ -231,6 +203,11 @@ class LotteryChecker:
                         self.show_recent_draws(10)
                 
                 elif choice == '3':
+                    numbers = read_numbers("Ingresa los números separados por espacios o comas (00-99): ")
+                    if numbers:
+                        check_combination_all_lotteries(*numbers)
+                
+                elif choice == '4':
                     print("👋 ¡Hasta luego!")
                     break
                 
@@ -241,6 +218,47 @@ class LotteryChecker:
                 print("\n👋 ¡Hasta luego!")
                 break
 
+def read_numbers(prompt):
+    """Pedir una combinación (números separados por espacios o comas) y validarla
+
+    Returns:
+        list: Los números, o None si la entrada no es válida (ya se informó el error)
+    """
+    numbers = input(prompt).replace(",", " ").split()
+    
+    if len(numbers) < 2:
+        print("❌ Ingresa al menos 2 números")
+    elif not all(num.isdigit() and 0 <= int(num) <= 99 for num in numbers):
+        print("❌ Los números deben estar entre 00 y 99")
+    elif len({int(num) for num in numbers}) != len(numbers):
+        print("❌ Los números deben ser diferentes")
+    else:
+        return numbers
+    return None
+
+
+def check_combination_all_lotteries(*numbers):
+    """Buscar una combinación en todas las loterías del registro a la vez (bitsets por lotería)"""
+    numbers = [str(num).zfill(2) for num in numbers]
+    
+    print(f"\n🌐 Buscando {' y '.join(numbers)} en todas las loterías")
+    print("=" * 60)
+    
+    start = time.perf_counter()
+    indexes = load_all_bit_indexes()
+    results = {name: bit_index.matching_dates(*numbers) for name, bit_index in indexes.items()}
+    elapsed = time.perf_counter() - start
+    
+    for name, dates in results.items():
+        display_name = get_lottery(name)['display_name']
+        if dates:
+            print(f"✅ {display_name:<24} {len(dates):4d} vez(es) - Última: {dates[0]}")
+        else:
+            print(f"❌ {display_name:<24}    0 veces")
+    
+    print(f"\n⏱️  {len(indexes)} loterías consultadas en {elapsed * 1000:.1f} ms")
+    return results
+
 def main():
     """Función principal"""
     print("🎰 VERIFICADOR DE COMBINACIONES DE LOTERÍA")